@@ -0,0 +1,333 @@
+"""Run offline parse and end-to-end benchmarks against the local stand-in server.
+
+Usage::
+
+    python -m benchmarks.run --output results.json --requests 500 --concurrency 50
+    python -m benchmarks.run --latency-ms 20 --error-rate 0.01 --baseline previous.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+from typing import Any
+
+from benchmarks.server import FIXTURES_DIR, StandInServer, StandInTransport
+from sdamgia import RetryPolicy, SdamGIA
+from sdamgia.parsers import _HTML_PARSER_BACKENDS, _create_html_backend
+
+_SUBJECT = "math"
+_SUBJECT_BASE_URL = "https://math-ege.sdamgia.ru"
+
+_Scenario = Callable[[SdamGIA, int], Awaitable[object]]
+
+SCENARIOS: dict[str, _Scenario] = {
+    "get_problem_by_id": lambda api, index: api.get_problem_by_id(_SUBJECT, str(100000 + index)),
+    "search": lambda api, index: api.search(_SUBJECT, f"треугольник {index}"),
+    "get_test_by_id": lambda api, index: api.get_test_by_id(_SUBJECT, str(index)),
+    "get_category_by_id": lambda api, index: api.get_category_by_id(_SUBJECT, "1", page=index + 1),
+    "get_catalog": lambda api, _index: api.get_catalog(_SUBJECT),
+    "get_random_problem": lambda api, index: api.get_random_problem(_SUBJECT, "1", seed=index),
+}
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted values; zero for empty input."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(percent / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def bench_parsers(min_seconds: float = 0.5) -> dict[str, dict[str, Any]]:
+    """Measure page parsing throughput of every installed parsing backend.
+
+    Args:
+        min_seconds: Minimal measuring time per backend and page kind.
+
+    Returns:
+        Per-backend mapping of page kind to pages/s and MB/s, or ``{"skipped": reason}``.
+    """
+    pages = {
+        "problem": (FIXTURES_DIR / "problem_1001.html").read_bytes(),
+        "search": (FIXTURES_DIR / "search.html").read_bytes(),
+        "test": (FIXTURES_DIR / "test.html").read_bytes(),
+        "category": (FIXTURES_DIR / "category.html").read_bytes(),
+        "catalog": (FIXTURES_DIR / "catalog.html").read_bytes(),
+    }
+    problem_url = f"{_SUBJECT_BASE_URL}/problem?id=1001"
+    results: dict[str, dict[str, Any]] = {}
+    for backend_name in _HTML_PARSER_BACKENDS:
+        backend = _create_html_backend(backend_name)
+        parsers: dict[str, Callable[[], object]] = {
+            "problem": lambda: backend.parse_problem_page(pages["problem"], "1001", problem_url, _SUBJECT_BASE_URL),
+            "search": lambda: backend.extract_problem_ids(pages["search"]),
+            "test": lambda: backend.extract_problem_ids(pages["test"]),
+            "category": lambda: backend.extract_problem_ids(pages["category"]),
+            "catalog": lambda: backend.parse_catalog_page(pages["catalog"]),
+        }
+        try:
+            parsers["problem"]()
+        except Exception as error:
+            results[backend_name] = {"skipped": f"{type(error).__name__}: {error}"}
+            continue
+
+        results[backend_name] = {}
+        for kind, parse in parsers.items():
+            iterations = 0
+            started_at = time.perf_counter()
+            while (elapsed := time.perf_counter() - started_at) < min_seconds:
+                parse()
+                iterations += 1
+            results[backend_name][kind] = {
+                "pages_per_second": iterations / elapsed,
+                "mb_per_second": iterations * len(pages[kind]) / elapsed / 1_000_000,
+            }
+    return results
+
+
+async def bench_method(
+    server: StandInServer,
+    scenario: _Scenario,
+    requests: int,
+    concurrency: int,
+    html_parser: str = "html.parser",
+    retries: int = 0,
+    trace_memory: bool = False,
+) -> dict[str, float]:
+    """Call one public method many times concurrently against stand-in server.
+
+    Args:
+        server: Running stand-in server.
+        scenario: Coroutine factory calling the method for call index.
+        requests: Number of method calls.
+        concurrency: Calls in flight at once.
+        html_parser: Client page parsing backend.
+        retries: Client retries after failed requests.
+        trace_memory: Report peak traced Python memory; slows the run down.
+
+    Returns:
+        Call count, error count, calls per second, p50/p99 latency in milliseconds
+        and, with trace_memory, peak memory in bytes.
+    """
+    api = SdamGIA(
+        html_parser=html_parser,
+        max_concurrency_per_host=concurrency,
+        retry_policy=RetryPolicy(retries=retries, base_delay_seconds=0.01, max_delay_seconds=0.1),
+        circuit_breaker_failure_threshold=max(5, requests),
+        catalog_ttl_seconds=0,
+        transport=StandInTransport(server.base_url),
+    )
+    latencies: list[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal errors, next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            started_at = time.perf_counter()
+            try:
+                await scenario(api, index)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started_at)
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        started_at = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+        total_seconds = time.perf_counter() - started_at
+        peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        await api.aclose()
+
+    latencies.sort()
+    result = {
+        "requests": requests,
+        "errors": errors,
+        "requests_per_second": requests / total_seconds,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+    }
+    if peak_memory is not None:
+        result["peak_memory_bytes"] = peak_memory
+    return result
+
+
+async def run_suite(
+    requests: int = 200,
+    concurrency: int = 20,
+    latency_seconds: float = 0.0,
+    latency_jitter_seconds: float = 0.0,
+    error_rate: float = 0.0,
+    html_parser: str = "html.parser",
+    retries: int = 0,
+    parse_seconds: float = 0.5,
+    methods: list[str] | None = None,
+    trace_memory: bool = True,
+) -> dict[str, Any]:
+    """Run parser and end-to-end benchmarks.
+
+    Args:
+        requests: Calls per public method.
+        concurrency: Calls in flight at once.
+        latency_seconds: Server delay before every response.
+        latency_jitter_seconds: Extra random server delay bound.
+        error_rate: Share of server responses replaced with 503.
+        html_parser: Client page parsing backend for end-to-end runs.
+        retries: Client retries after failed requests.
+        parse_seconds: Measuring time per parser backend and page kind; zero skips parsers.
+        methods: Names from SCENARIOS to run; None runs all.
+        trace_memory: Repeat every method under tracemalloc to report peak memory.
+
+    Returns:
+        JSON-serializable results with run settings and environment.
+    """
+    settings = {
+        "requests": requests,
+        "concurrency": concurrency,
+        "latency_seconds": latency_seconds,
+        "latency_jitter_seconds": latency_jitter_seconds,
+        "error_rate": error_rate,
+        "html_parser": html_parser,
+        "retries": retries,
+    }
+    results: dict[str, Any] = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "version": _package_version(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "settings": settings,
+        },
+        "parse": bench_parsers(parse_seconds) if parse_seconds > 0 else {},
+        "methods": {},
+    }
+
+    for name in methods or list(SCENARIOS):
+        server = StandInServer(
+            latency_seconds=latency_seconds,
+            latency_jitter_seconds=latency_jitter_seconds,
+            error_rate=error_rate,
+        )
+        async with server:
+            method_result = await bench_method(
+                server, SCENARIOS[name], requests, concurrency, html_parser, retries
+            )
+            if trace_memory:
+                traced = await bench_method(
+                    server, SCENARIOS[name], requests, concurrency, html_parser, retries, trace_memory=True
+                )
+                method_result["peak_memory_bytes"] = traced["peak_memory_bytes"]
+            method_result["server_requests"] = server.requests
+            method_result["injected_errors"] = server.injected_errors
+        results["methods"][name] = method_result
+    return results
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """Describe relative change of key metrics against earlier results.
+
+    Args:
+        current: Results of this run.
+        baseline: Results loaded from earlier JSON file.
+
+    Returns:
+        Report lines, one per metric present in both runs.
+    """
+    lines: list[str] = []
+    for name, method in current["methods"].items():
+        previous = baseline.get("methods", {}).get(name)
+        if previous is None:
+            continue
+        for metric in ("requests_per_second", "p50_ms", "p99_ms", "peak_memory_bytes"):
+            if metric in method and previous.get(metric):
+                change = (method[metric] - previous[metric]) / previous[metric] * 100
+                lines.append(f"{name}.{metric}: {previous[metric]:.2f} -> {method[metric]:.2f} ({change:+.1f}%)")
+    for backend, kinds in current["parse"].items():
+        for kind, values in kinds.items():
+            previous = baseline.get("parse", {}).get(backend, {}).get(kind)
+            if isinstance(values, dict) and isinstance(previous, dict) and previous.get("pages_per_second"):
+                change = (values["pages_per_second"] - previous["pages_per_second"]) / previous["pages_per_second"] * 100
+                lines.append(
+                    f"parse.{backend}.{kind}.pages_per_second: "
+                    f"{previous['pages_per_second']:.0f} -> {values['pages_per_second']:.0f} ({change:+.1f}%)"
+                )
+    return lines
+
+
+def _package_version() -> str:
+    """Installed package version, or ``unknown`` when running from a source tree."""
+    try:
+        return metadata.version("Async-SdamGia-Api")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse command line, run benchmarks and write JSON results.
+
+    Args:
+        argv: Command line arguments; None reads sys.argv.
+
+    Returns:
+        None.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="calls per public method")
+    parser.add_argument("--concurrency", type=int, default=20, help="calls in flight at once")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="server delay per response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="extra random server delay bound")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 503 responses")
+    parser.add_argument("--html-parser", default="html.parser", choices=_HTML_PARSER_BACKENDS)
+    parser.add_argument("--retries", type=int, default=0, help="client retries after failed requests")
+    parser.add_argument("--parse-seconds", type=float, default=0.5, help="time per parser measurement; 0 skips")
+    parser.add_argument("--method", action="append", choices=list(SCENARIOS), help="run only these methods")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc peak memory pass")
+    parser.add_argument("--output", type=Path, default=Path("benchmark-results.json"))
+    parser.add_argument("--baseline", type=Path, help="earlier results JSON to compare with")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(
+        run_suite(
+            requests=args.requests,
+            concurrency=args.concurrency,
+            latency_seconds=args.latency_ms / 1000,
+            latency_jitter_seconds=args.jitter_ms / 1000,
+            error_rate=args.error_rate,
+            html_parser=args.html_parser,
+            retries=args.retries,
+            parse_seconds=args.parse_seconds,
+            methods=args.method,
+            trace_memory=not args.no_memory,
+        )
+    )
+    args.output.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    for name, method in results["methods"].items():
+        print(
+            f"{name}: {method['requests_per_second']:.0f} req/s, p50 {method['p50_ms']:.1f} ms, "
+            f"p99 {method['p99_ms']:.1f} ms, errors {method['errors']}"
+        )
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        print("\n".join(compare(results, baseline)))
+    print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
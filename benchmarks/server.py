@@ -0,0 +1,227 @@
+"""Local HTTP stand-in for sdamgia subject hosts serving recorded pages."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+FIXTURES_DIR = Path(__file__).resolve().parents[1] / "tests" / "fixtures" / "html"
+
+_FIXTURE_PROBLEM_ID = "1001"
+
+
+class StandInServer:
+    """Minimal HTTP/1.1 keep-alive server answering like a subject host with fixture pages."""
+
+    def __init__(
+        self,
+        fixtures_dir: Path = FIXTURES_DIR,
+        latency_seconds: float = 0.0,
+        latency_jitter_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """Load fixture pages and fault injection settings.
+
+        Args:
+            fixtures_dir: Folder with recorded problem, search, test, category and catalog pages.
+            latency_seconds: Delay added before every response.
+            latency_jitter_seconds: Upper bound of extra uniformly random delay.
+            error_rate: Share of requests answered with 503 (0.0-1.0).
+            seed: Seed of latency jitter and error injection.
+
+        Returns:
+            None.
+        """
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+        self._pages = {
+            name: (fixtures_dir / f"{name}.html").read_bytes()
+            for name in ("problem_1001", "search", "test", "category", "catalog")
+        }
+        self._latency_seconds = latency_seconds
+        self._latency_jitter_seconds = latency_jitter_seconds
+        self._error_rate = error_rate
+        self._random = random.Random(seed)
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+        self.requests = 0
+        self.injected_errors = 0
+
+    @property
+    def base_url(self) -> str:
+        """Root URL of running server.
+
+        Args:
+            None.
+
+        Returns:
+            URL like ``http://127.0.0.1:PORT``.
+        """
+        if self._server is None:
+            raise RuntimeError("Server is not started")
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self) -> None:
+        """Listen on a free localhost port.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        self._server = await asyncio.start_server(self._serve_connection, "127.0.0.1", 0)
+
+    async def close(self) -> None:
+        """Stop listening and drop open connections.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> StandInServer:
+        """Start server for context manager use.
+
+        Args:
+            None.
+
+        Returns:
+            Running server.
+        """
+        await self.start()
+        return self
+
+    async def __aexit__(self, _exc_type: Any, _exc: Any, _tb: Any) -> None:
+        """Stop server on context manager exit.
+
+        Args:
+            _exc_type: Exception type from context manager.
+            _exc: Exception instance from context manager.
+            _tb: Traceback object from context manager.
+
+        Returns:
+            None.
+        """
+        await self.close()
+
+    def respond(self, target: str) -> tuple[int, bytes]:
+        """Choose response for request target.
+
+        Args:
+            target: Request path with query string.
+
+        Returns:
+            Status code and body.
+        """
+        url = urlsplit(target)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        if url.path == "/problem" and "id" in query:
+            problem_id = query["id"].encode()
+            return 200, self._pages["problem_1001"].replace(_FIXTURE_PROBLEM_ID.encode(), problem_id)
+        if url.path == "/search":
+            return 200, self._pages["search"]
+        if url.path == "/test" and "theme" in query:
+            return 200, self._pages["category"]
+        if url.path == "/test":
+            return 200, self._pages["test"]
+        if url.path == "/prob_catalog":
+            return 200, self._pages["catalog"]
+        return 404, b"Not Found"
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive = True
+                while (header := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = header.decode("latin-1").partition(":")
+                    if name.strip().lower() == "connection" and value.strip().lower() == "close":
+                        keep_alive = False
+
+                self.requests += 1
+                delay = self._latency_seconds + self._random.uniform(0.0, self._latency_jitter_seconds)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if self._random.random() < self._error_rate:
+                    self.injected_errors += 1
+                    status, body = 503, b"Service Unavailable"
+                else:
+                    status, body = self.respond(request_line.split()[1].decode("latin-1"))
+
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    "Content-Type: text/html; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+class StandInTransport(httpx.AsyncBaseTransport):
+    """Transport sending requests for any subject host to a running stand-in server."""
+
+    def __init__(self, base_url: str) -> None:
+        """Initialize transport pointing at stand-in server.
+
+        Args:
+            base_url: Root URL of stand-in server, for example StandInServer.base_url.
+
+        Returns:
+            None.
+        """
+        self._target = httpx.URL(base_url)
+        self._transport = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send request to stand-in server keeping its path and query.
+
+        Args:
+            request: Outgoing request for a subject host.
+
+        Returns:
+            Stand-in server response.
+        """
+        request.url = request.url.copy_with(
+            scheme=self._target.scheme,
+            host=self._target.host,
+            port=self._target.port,
+        )
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Close connections to stand-in server.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        await self._transport.aclose()
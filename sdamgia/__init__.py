@@ -1,5 +1,21 @@
 """Public package API for sdamgia client."""
 
 from sdamgia.client import SdamGIA
+from sdamgia.images import OcrEngine
+from sdamgia.metrics import MetricsHooks, PrometheusMetrics
+from sdamgia.parsers import ProblemParseError
+from sdamgia.replay import CassetteMissError, RecordingTransport, ReplayTransport
+from sdamgia.transport import CircuitOpenError, RetryPolicy
 
-__all__ = ["SdamGIA"]
+__all__ = [
+    "CassetteMissError",
+    "CircuitOpenError",
+    "MetricsHooks",
+    "OcrEngine",
+    "PrometheusMetrics",
+    "ProblemParseError",
+    "RecordingTransport",
+    "ReplayTransport",
+    "RetryPolicy",
+    "SdamGIA",
+]
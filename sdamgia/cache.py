@@ -0,0 +1,499 @@
+"""In-memory and persistent caches shared by client methods."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import urlparse
+
+from sdamgia.transport import _SingleFlight
+
+_DEFAULT_RESPONSE_TTL_SECONDS = {
+    "/problem": 30 * 24 * 3600.0,
+    "/prob_catalog": 24 * 3600.0,
+    "/test": 3600.0,
+    "/search": 600.0,
+}
+
+
+class _CatalogCache:
+    """Per-subject catalog cache with TTL and single-flight refresh."""
+
+    def __init__(self, ttl_seconds: float) -> None:
+        """Initialize empty cache.
+
+        Args:
+            ttl_seconds: Lifetime of cached catalog; zero or less disables storage.
+
+        Returns:
+            None.
+        """
+        self._ttl_seconds = ttl_seconds
+        self._entries: dict[str, tuple[float, list[dict[str, object]]]] = {}
+        self._single_flight = _SingleFlight()
+        self._generation = 0
+
+    async def get(
+        self,
+        subject: str,
+        load: Callable[[], Awaitable[list[dict[str, object]]]],
+    ) -> list[dict[str, object]]:
+        """Return cached catalog or load it once for all concurrent callers.
+
+        Args:
+            subject: Subject short code.
+            load: Zero-argument async function downloading and parsing catalog.
+
+        Returns:
+            Independent copy of subject catalog.
+        """
+        entry = self._entries.get(subject)
+        if entry is not None and time.monotonic() < entry[0]:
+            return copy.deepcopy(entry[1])
+
+        catalog = await self._single_flight.run(subject, lambda: self._refresh(subject, load))
+        return copy.deepcopy(catalog)
+
+    def invalidate(self, subject: str | None = None) -> None:
+        """Drop cached catalog for one subject or for all subjects.
+
+        Args:
+            subject: Subject short code, or None to clear every subject.
+
+        Returns:
+            None.
+        """
+        self._generation += 1
+        if subject is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(subject, None)
+
+    async def _refresh(
+        self,
+        subject: str,
+        load: Callable[[], Awaitable[list[dict[str, object]]]],
+    ) -> list[dict[str, object]]:
+        generation = self._generation
+        catalog = await load()
+        if self._ttl_seconds > 0 and generation == self._generation:
+            self._entries[subject] = (time.monotonic() + self._ttl_seconds, catalog)
+        return catalog
+
+
+class _CachedResponse(NamedTuple):
+    """Response body with validators restored from persistent cache."""
+
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    is_fresh: bool
+
+
+class _ResponseCache:
+    """SQLite-backed HTTP response cache with TTL policy and LRU size bound."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int,
+        ttl_seconds: dict[str, float] | None = None,
+    ) -> None:
+        """Open or create cache database.
+
+        Args:
+            path: SQLite database file path.
+            max_bytes: Upper bound for total compressed body size.
+            ttl_seconds: Freshness lifetime per URL path; unknown paths are not cached.
+
+        Returns:
+            None.
+        """
+        self._max_bytes = max_bytes
+        self._ttl_seconds = dict(_DEFAULT_RESPONSE_TTL_SECONDS if ttl_seconds is None else ttl_seconds)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+            )
+
+    def ttl_for(self, url: str) -> float:
+        """Resolve freshness lifetime for URL by its path.
+
+        Args:
+            url: Absolute URL.
+
+        Returns:
+            Lifetime in seconds; zero means the URL is not cached.
+        """
+        return self._ttl_seconds.get(urlparse(url).path, 0.0)
+
+    def lookup(self, url: str) -> _CachedResponse | None:
+        """Load cached response and mark it as recently used.
+
+        Args:
+            url: Absolute URL.
+
+        Returns:
+            Cached response or None when URL is not cached.
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT body, etag, last_modified, expires_at FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE url = ?",
+                (now, url),
+            )
+        body, etag, last_modified, expires_at = row
+        return _CachedResponse(zlib.decompress(body), etag, last_modified, now < expires_at)
+
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        etag: str | None,
+        last_modified: str | None,
+    ) -> None:
+        """Save response body and evict least recently used entries over size bound.
+
+        Args:
+            url: Absolute URL.
+            body: Raw response body.
+            etag: ETag validator from response headers.
+            last_modified: Last-Modified validator from response headers.
+
+        Returns:
+            None.
+        """
+        now = time.time()
+        compressed = zlib.compress(body)
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (url, body, size, etag, last_modified, expires_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (url, compressed, len(compressed), etag, last_modified, now + self.ttl_for(url), now),
+            )
+            self._evict()
+
+    def refresh(self, url: str) -> None:
+        """Extend freshness of entry confirmed by conditional revalidation.
+
+        Args:
+            url: Absolute URL.
+
+        Returns:
+            None.
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE responses SET expires_at = ?, accessed_at = ? WHERE url = ?",
+                (now + self.ttl_for(url), now, url),
+            )
+
+    def close(self) -> None:
+        """Close database connection.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def _evict(self) -> None:
+        (total_size,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total_size <= self._max_bytes:
+            return
+
+        evicted_urls: list[str] = []
+        for url, size in self._connection.execute(
+            "SELECT url, size FROM responses ORDER BY accessed_at"
+        ).fetchall():
+            if total_size <= self._max_bytes:
+                break
+            evicted_urls.append(url)
+            total_size -= size
+        self._connection.executemany(
+            "DELETE FROM responses WHERE url = ?",
+            [(url,) for url in evicted_urls],
+        )
+
+
+class _RenderCache:
+    """Content-addressed image cache with LRU memory tier and optional disk tier."""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        directory: str | None = None,
+        directory_max_bytes: int = 1024 * 1024 * 1024,
+    ) -> None:
+        """Initialize cache tiers.
+
+        Args:
+            max_bytes: Size bound of in-memory tier; zero disables it.
+            directory: Folder for disk tier; None disables it.
+            directory_max_bytes: Size bound of disk tier.
+
+        Returns:
+            None.
+        """
+        self._max_bytes = max_bytes
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._directory = None if directory is None else Path(directory)
+        self._directory_max_bytes = directory_max_bytes
+        self._directory_bytes = 0
+        if self._directory is not None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            self._directory_bytes = sum(
+                entry.stat().st_size for entry in self._directory.glob("*.png")
+            )
+
+    def get(self, key: str) -> bytes | None:
+        """Load image from memory, then from disk, and mark it as recently used.
+
+        Args:
+            key: Content hash of rendered markup and options.
+
+        Returns:
+            Cached image bytes or None.
+        """
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+                return image
+            if self._directory is None:
+                return None
+            image_path = self._directory / f"{key}.png"
+            try:
+                image = image_path.read_bytes()
+                os.utime(image_path)
+            except FileNotFoundError:
+                return None
+            self._remember(key, image)
+            return image
+
+    def put(self, key: str, image: bytes) -> None:
+        """Save image to both tiers and evict least recently used entries over size bounds.
+
+        Args:
+            key: Content hash of rendered markup and options.
+            image: Encoded image.
+
+        Returns:
+            None.
+        """
+        with self._lock:
+            self._remember(key, image)
+            if self._directory is None:
+                return
+            image_path = self._directory / f"{key}.png"
+            if image_path.exists():
+                return
+            tmp_path = image_path.with_suffix(".tmp")
+            tmp_path.write_bytes(image)
+            os.replace(tmp_path, image_path)
+            self._directory_bytes += len(image)
+            self._evict_directory()
+
+    def _remember(self, key: str, image: bytes) -> None:
+        if len(image) > self._max_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = image
+        self._memory_bytes += len(image)
+        while self._memory_bytes > self._max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _evict_directory(self) -> None:
+        if self._directory_bytes <= self._directory_max_bytes:
+            return
+        entries = sorted(
+            ((entry.stat(), entry) for entry in self._directory.glob("*.png")),
+            key=lambda item: item[0].st_mtime,
+        )
+        for stat, entry in entries:
+            if self._directory_bytes <= self._directory_max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            self._directory_bytes -= stat.st_size
+
+
+class _CandidatePool:
+    """Per-(subject, topic, page window) problem ID pool with background TTL refresh."""
+
+    def __init__(self, ttl_seconds: float, path: str | None = None) -> None:
+        """Initialize pool storage.
+
+        Args:
+            ttl_seconds: Age after which a pool is refreshed in background; zero or less
+                disables pooling.
+            path: SQLite file persisting pools between runs; None keeps them in memory only.
+
+        Returns:
+            None.
+        """
+        self._ttl_seconds = ttl_seconds
+        self._entries: dict[tuple[str, str, int], tuple[float, list[str]]] = {}
+        self._single_flight = _SingleFlight()
+        self._refresh_tasks: dict[tuple[str, str, int], asyncio.Task[list[str]]] = {}
+        self._lock = threading.Lock()
+        self._connection = None if path is None else sqlite3.connect(path, check_same_thread=False)
+        if self._connection is not None:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS candidate_pools (
+                        subject TEXT NOT NULL,
+                        topic_id TEXT NOT NULL,
+                        pages INTEGER NOT NULL,
+                        problem_ids TEXT NOT NULL,
+                        refreshed_at REAL NOT NULL,
+                        PRIMARY KEY (subject, topic_id, pages)
+                    )
+                    """
+                )
+
+    async def get(
+        self,
+        key: tuple[str, str, int],
+        load: Callable[[int], Awaitable[list[str]]],
+    ) -> list[str]:
+        """Return pooled IDs, loading them on first use and refreshing stale pools in background.
+
+        Args:
+            key: Subject, topic ID and number of pages scanned per category.
+            load: Async function collecting topic IDs from the given number of pages.
+
+        Returns:
+            Candidate problem IDs in collection order.
+        """
+        if self._ttl_seconds <= 0:
+            return await load(key[2])
+
+        entry = self._entries.get(key)
+        if entry is None and self._connection is not None:
+            entry = await asyncio.to_thread(self._read, key)
+            if entry is not None:
+                self._entries[key] = entry
+        if entry is None:
+            return list(await self._single_flight.run(key, lambda: self._refresh(key, load, None)))
+
+        refreshed_at, problem_ids = entry
+        if time.time() - refreshed_at >= self._ttl_seconds and key not in self._refresh_tasks:
+            task = asyncio.ensure_future(
+                self._single_flight.run(key, lambda: self._refresh(key, load, problem_ids))
+            )
+            self._refresh_tasks[key] = task
+            task.add_done_callback(lambda done: self._finish_refresh(key, done))
+        return list(problem_ids)
+
+    def close(self) -> None:
+        """Cancel background refreshes and close database connection.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        for task in self._refresh_tasks.values():
+            task.cancel()
+        self._refresh_tasks.clear()
+        if self._connection is not None:
+            with self._lock:
+                self._connection.close()
+
+    async def _refresh(
+        self,
+        key: tuple[str, str, int],
+        load: Callable[[int], Awaitable[list[str]]],
+        current_ids: list[str] | None,
+    ) -> list[str]:
+        pages = key[2]
+        problem_ids = None
+        if current_ids is not None and pages > 1:
+            newest_ids = await load(1)
+            if set(newest_ids) <= set(current_ids):
+                problem_ids = current_ids
+        if problem_ids is None:
+            problem_ids = await load(pages)
+
+        entry = (time.time(), problem_ids)
+        self._entries[key] = entry
+        if self._connection is not None:
+            await asyncio.to_thread(self._write, key, entry)
+        return problem_ids
+
+    def _finish_refresh(self, key: tuple[str, str, int], task: asyncio.Task[list[str]]) -> None:
+        if self._refresh_tasks.get(key) is task:
+            del self._refresh_tasks[key]
+        if not task.cancelled():
+            task.exception()
+
+    def _read(self, key: tuple[str, str, int]) -> tuple[float, list[str]] | None:
+        with self._lock:
+            row = self._connection.execute(
+                """
+                SELECT refreshed_at, problem_ids FROM candidate_pools
+                WHERE subject = ? AND topic_id = ? AND pages = ?
+                """,
+                key,
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _write(self, key: tuple[str, str, int], entry: tuple[float, list[str]]) -> None:
+        refreshed_at, problem_ids = entry
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO candidate_pools (subject, topic_id, pages, problem_ids, refreshed_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (*key, json.dumps(problem_ids), refreshed_at),
+            )
@@ -3,17 +3,38 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import copy
 import random
-from collections.abc import Awaitable, Callable
-from typing import Any
+import time
+from collections import Counter, deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from pathlib import Path
+from typing import Any, BinaryIO, TypeVar
 from urllib.parse import parse_qs, urljoin, urlparse
 
-from bs4 import BeautifulSoup
 import httpx
+from bs4 import Tag
 
 from sdamgia import images
-from sdamgia.parsers import _CatalogParser, _extract_problem_ids, _ProblemParser
-from sdamgia.rendering import _ProblemImageRenderer
+from sdamgia.cache import _CandidatePool, _CatalogCache, _RenderCache, _ResponseCache
+from sdamgia.crawler import _CrawlStore, _SubjectCrawler
+from sdamgia.metrics import _metrics_endpoint, MetricsHooks
+from sdamgia.parsers import ProblemParseError, _create_html_backend, _ProblemParser
+from sdamgia.replay import _CASSETTE_MODES, RecordingTransport, ReplayTransport
+from sdamgia.rendering import _RENDERERS, _BrowserPool, _ProblemImageRenderer, _stitch_sheet
+from sdamgia.search import _LOCAL_SEARCH_PAGE_SIZE, _LocalSearchIndex, _SearchQueryPlanner
+from sdamgia.transport import (
+    _CircuitBreaker,
+    _parse_retry_after,
+    _RequestScheduler,
+    _SingleFlight,
+    _THROTTLE_STATUS_CODES,
+    _UNAVAILABLE_STATUS_CODES,
+    RetryPolicy,
+)
+
+_T = TypeVar("_T")
 
 
 class SdamGIA:
@@ -25,18 +46,111 @@ class SdamGIA:
         retries: int = 2,
         retry_base_delay_seconds: float = 1.0,
         user_agent: str = "sdamgia-api/async",
+        catalog_ttl_seconds: float = 3600.0,
+        response_cache_path: str | None = None,
+        response_cache_max_bytes: int = 256 * 1024 * 1024,
+        response_cache_ttl_seconds: dict[str, float] | None = None,
+        html_parser: str = "html.parser",
+        max_concurrency_per_host: int = 10,
+        max_requests_per_second_per_host: float | None = None,
+        adaptive_concurrency: bool = False,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker_failure_threshold: int = 5,
+        circuit_breaker_recovery_seconds: float = 30.0,
+        ocr_engine: images.OcrEngine | None = None,
+        browser_pages: int = 2,
+        browser_launch_options: dict[str, Any] | None = None,
+        render_cache_max_bytes: int = 64 * 1024 * 1024,
+        render_cache_dir: str | None = None,
+        render_cache_dir_max_bytes: int = 1024 * 1024 * 1024,
+        search_index_path: str | None = None,
+        candidate_pool_ttl_seconds: float = 3600.0,
+        candidate_pool_path: str | None = None,
+        metrics: MetricsHooks | None = None,
+        cassette_path: str | None = None,
+        cassette_mode: str = "replay",
+        replay_latency_seconds: float = 0.0,
+        replay_latency_jitter_seconds: float = 0.0,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry_seconds: float | None = 5.0,
+        http2: bool = False,
+        connect_timeout_seconds: float | None = None,
+        read_timeout_seconds: float | None = None,
+        write_timeout_seconds: float | None = None,
+        pool_timeout_seconds: float | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        warmup_on_enter: bool = False,
+        warmup_subjects: Iterable[str] | None = None,
+        keepalive_probe_interval_seconds: float | None = None,
     ) -> None:
         """Initialize API client with default subjects and tool settings.
 
         Args:
             timeout_seconds: Request timeout for all HTTP calls.
             retries: Number of retry attempts after the first request.
-            retry_base_delay_seconds: Linear backoff base for retries.
+            retry_base_delay_seconds: Exponential backoff base for retries.
             user_agent: User-Agent header for outgoing requests.
+            catalog_ttl_seconds: Lifetime of cached subject catalogs; zero disables caching.
+            response_cache_path: SQLite file for persistent page cache; None disables it.
+            response_cache_max_bytes: Size bound of persistent page cache.
+            response_cache_ttl_seconds: Page freshness lifetime per URL path.
+            html_parser: Page parsing backend: html.parser, lxml, or selectolax.
+            max_concurrency_per_host: In-flight request limit for each subject host.
+            max_requests_per_second_per_host: Request rate limit for each subject host.
+            adaptive_concurrency: Grow per-host limit up to max_concurrency_per_host while
+                latency is flat and halve it on 429/503/504 or timeouts.
+            retry_policy: Full retry policy; overrides retries and retry_base_delay_seconds.
+            circuit_breaker_failure_threshold: Consecutive host failures that open its circuit.
+            circuit_breaker_recovery_seconds: Open circuit time before a half-open probe.
+            ocr_engine: OCR runner for search_by_img; closed together with the client.
+            browser_pages: Pages of the shared pyppeteer browser rendering concurrently.
+            browser_launch_options: Keyword options for pyppeteer launch.
+            render_cache_max_bytes: Size bound of in-memory rendered image cache; zero disables it.
+            render_cache_dir: Folder for persistent rendered image cache; None disables it.
+            render_cache_dir_max_bytes: Size bound of persistent rendered image cache.
+            search_index_path: SQLite file for local search index; None keeps it in memory.
+            candidate_pool_ttl_seconds: Age after which get_random_problem candidate pools are
+                refreshed in background; zero disables pooling.
+            candidate_pool_path: SQLite file persisting candidate pools; None keeps them in memory.
+            metrics: Receiver of request, retry, parse, render and cache events, for example
+                PrometheusMetrics; None discards them.
+            cassette_path: Cassette archive for record/replay mode; None sends requests normally.
+            cassette_mode: ``record`` saves real responses to cassette on aclose, ``replay``
+                serves responses from cassette without network.
+            replay_latency_seconds: Synthetic delay of every replayed response.
+            replay_latency_jitter_seconds: Upper bound of extra random replay delay.
+            max_connections: Connection pool size over all hosts; None removes the limit.
+            max_keepalive_connections: Idle connections kept open; None removes the limit.
+            keepalive_expiry_seconds: Idle time after which kept-alive connection is closed.
+            http2: Negotiate HTTP/2; requires ``httpx[http2]`` (``http2`` extra).
+            connect_timeout_seconds: Connection setup timeout; None uses timeout_seconds.
+            read_timeout_seconds: Timeout between received chunks; None uses timeout_seconds.
+            write_timeout_seconds: Timeout of sending request; None uses timeout_seconds.
+            pool_timeout_seconds: Wait for free pool connection; None uses timeout_seconds.
+            transport: httpx transport of the client's own HTTP client; pool limits and http2
+                then belong to this transport. Record mode wraps it.
+            http_client: Shared AsyncClient used instead of creating one; its pool, timeouts and
+                HTTP/2 settings apply, and aclose leaves it open.
+            warmup_on_enter: Run warmup when entering ``async with``.
+            warmup_subjects: Subjects warmed on enter; None warms all subject hosts.
+            keepalive_probe_interval_seconds: Period of probes keeping warmed connections open;
+                None disables probes. Keep it below keepalive_expiry_seconds.
 
         Returns:
             None.
         """
+        if cassette_mode not in _CASSETTE_MODES:
+            raise ValueError(
+                f"Unsupported cassette_mode {cassette_mode!r}; expected one of {', '.join(_CASSETTE_MODES)}"
+            )
+        if keepalive_probe_interval_seconds is not None and keepalive_probe_interval_seconds <= 0:
+            raise ValueError("keepalive_probe_interval_seconds must be > 0")
+        if http_client is not None and (transport is not None or cassette_path is not None):
+            raise ValueError("http_client cannot be combined with transport or cassette_path")
+        if transport is not None and cassette_path is not None and cassette_mode == "replay":
+            raise ValueError("transport cannot be combined with cassette replay")
         base_domain = "sdamgia.ru"
         self._subject_base_url = {
             "math": f"https://math-ege.{base_domain}",
@@ -56,23 +170,87 @@ class SdamGIA:
             "hist": f"https://hist-ege.{base_domain}",
         }
         self.tesseract_src = "tesseract"
+        self._ocr_engine = ocr_engine or images.OcrEngine()
         self.html2img_chrome_path = "chrome"
         self.grabzit_auth = {"AppKey": "grabzit", "AppSecret": "grabzit"}
+        self._metrics = metrics or MetricsHooks()
         self._problem_parser = _ProblemParser()
-        self._catalog_parser = _CatalogParser()
-        self._renderer = _ProblemImageRenderer()
-        self._timeout_seconds = timeout_seconds
-        self._retries = retries
-        self._retry_base_delay_seconds = retry_base_delay_seconds
+        self._html_backend = _create_html_backend(html_parser)
+        self._catalog_cache = _CatalogCache(catalog_ttl_seconds)
+        self._candidate_pool = _CandidatePool(candidate_pool_ttl_seconds, candidate_pool_path)
+        self._response_cache = (
+            None
+            if response_cache_path is None
+            else _ResponseCache(
+                response_cache_path,
+                response_cache_max_bytes,
+                response_cache_ttl_seconds,
+            )
+        )
+        self._renderer = _ProblemImageRenderer(
+            _BrowserPool(browser_pages, browser_launch_options),
+            _RenderCache(render_cache_max_bytes, render_cache_dir, render_cache_dir_max_bytes),
+            self._metrics,
+        )
+        self._search_index_path = search_index_path or ":memory:"
+        self._search_index: _LocalSearchIndex | None = None
+        self._retry_policy = retry_policy or RetryPolicy(
+            retries=retries,
+            base_delay_seconds=retry_base_delay_seconds,
+        )
+        self._single_flight = _SingleFlight()
+        self._circuit_breaker = _CircuitBreaker(
+            circuit_breaker_failure_threshold,
+            circuit_breaker_recovery_seconds,
+        )
         self._headers = {"User-Agent": user_agent}
-        self._http_client = httpx.AsyncClient(
-            timeout=self._timeout_seconds,
-            headers=self._headers,
-            follow_redirects=True,
+        self._scheduler = _RequestScheduler(
+            max_concurrency_per_host,
+            max_requests_per_second_per_host,
+            adaptive_concurrency,
         )
+        self._warmup_on_enter = warmup_on_enter
+        self._warmup_subjects = None if warmup_subjects is None else list(warmup_subjects)
+        self._keepalive_probe_interval_seconds = keepalive_probe_interval_seconds
+        self._warm_subjects: set[str] = set()
+        self._keepalive_task: asyncio.Task[None] | None = None
+        self._owns_http_client = http_client is None
+        if http_client is not None:
+            self._http_client = http_client
+        else:
+            limits = httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry_seconds,
+            )
+            if cassette_path is not None and cassette_mode == "record":
+                transport = RecordingTransport(
+                    cassette_path,
+                    transport or httpx.AsyncHTTPTransport(limits=limits, http2=http2),
+                )
+            elif cassette_path is not None:
+                transport = ReplayTransport(
+                    cassette_path,
+                    replay_latency_seconds,
+                    replay_latency_jitter_seconds,
+                )
+            self._http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(
+                    timeout_seconds,
+                    connect=_phase_timeout(connect_timeout_seconds, timeout_seconds),
+                    read=_phase_timeout(read_timeout_seconds, timeout_seconds),
+                    write=_phase_timeout(write_timeout_seconds, timeout_seconds),
+                    pool=_phase_timeout(pool_timeout_seconds, timeout_seconds),
+                ),
+                headers=self._headers,
+                follow_redirects=True,
+                limits=limits,
+                http2=http2,
+                transport=transport,
+            )
 
     async def __aenter__(self) -> SdamGIA:
-        """Enter async context manager for client reuse.
+        """Enter async context manager for client reuse, warming connections if configured.
 
         Args:
             None.
@@ -80,6 +258,8 @@ class SdamGIA:
         Returns:
             Initialized client instance.
         """
+        if self._warmup_on_enter:
+            await self.warmup(self._warmup_subjects)
         return self
 
     async def __aexit__(self, _exc_type: Any, _exc: Any, _tb: Any) -> None:
@@ -96,7 +276,7 @@ class SdamGIA:
         await self.aclose()
 
     async def aclose(self) -> None:
-        """Close underlying asynchronous HTTP client.
+        """Close own HTTP client, shared browser, OCR workers, caches and search index.
 
         Args:
             None.
@@ -104,14 +284,69 @@ class SdamGIA:
         Returns:
             None.
         """
-        await self._http_client.aclose()
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._keepalive_task
+            self._keepalive_task = None
+        if self._owns_http_client:
+            await self._http_client.aclose()
+        await self._renderer.aclose()
+        self._ocr_engine.close()
+        self._candidate_pool.close()
+        if self._response_cache is not None:
+            self._response_cache.close()
+        if self._search_index is not None:
+            self._search_index.close()
+
+    async def warmup(
+        self,
+        subjects: Iterable[str] | None = None,
+        connections_per_host: int = 1,
+    ) -> dict[str, dict[str, object]]:
+        """Open keep-alive connections to subject hosts concurrently.
+
+        Sends lightweight HEAD probes, so DNS, TCP and TLS setup is paid before real
+        requests. With keepalive_probe_interval_seconds set, warmed hosts keep being probed
+        in background until aclose.
+
+        Args:
+            subjects: Subject short codes; None warms all subject hosts.
+            connections_per_host: Concurrent probes per host, opening up to that many
+                connections within max_concurrency_per_host.
+
+        Returns:
+            Mapping of subject to ``seconds`` (slowest probe) and ``error`` (failure or None).
+        """
+        if connections_per_host < 1:
+            raise ValueError("connections_per_host must be >= 1")
+        subject_codes = list(self._subject_base_url if subjects is None else subjects)
+        unknown_subjects = [subject for subject in subject_codes if subject not in self._subject_base_url]
+        if unknown_subjects:
+            raise ValueError(f"Unknown subjects: {', '.join(unknown_subjects)}")
+
+        async def warm(subject: str) -> dict[str, object]:
+            outcomes = await asyncio.gather(*(self._probe_host(subject) for _ in range(connections_per_host)))
+            errors = [error for _, error in outcomes if error is not None]
+            return {
+                "seconds": max(seconds for seconds, _ in outcomes),
+                "error": errors[0] if errors else None,
+            }
+
+        results = await asyncio.gather(*(warm(subject) for subject in subject_codes))
+        self._warm_subjects.update(subject_codes)
+        if self._keepalive_probe_interval_seconds is not None and self._keepalive_task is None:
+            self._keepalive_task = asyncio.create_task(
+                self._keep_connections_alive(self._keepalive_probe_interval_seconds)
+            )
+        return dict(zip(subject_codes, results))
 
     async def get_problem_by_id(
         self,
         subject: str,
         id: str,
         img: str | None = None,
-        path_to_img: str | None = None,
+        path_to_img: str | BinaryIO | None = None,
         path_to_tmp_html: str = "",
     ) -> dict[str, object] | None:
         """Get problem details by ID.
@@ -120,54 +355,238 @@ class SdamGIA:
             subject: Subject short code.
             id: Problem identifier.
             img: Image backend: pyppeteer, grabzit, html2img, or None.
-            path_to_img: Output image path when img is provided.
-            path_to_tmp_html: Temp html folder for pyppeteer rendering.
+            path_to_img: Output image path or writable binary file object when img is provided.
+            path_to_tmp_html: Unused; pyppeteer renders from memory.
 
         Returns:
             Parsed problem payload or None if problem block is missing.
         """
         subject_base_url = self._subject_base_url[subject]
-        soup = await self._fetch_soup(f"{subject_base_url}/problem?id={id}")
-        prob_block = soup.find("div", {"class": "prob_maindiv"})
-        if prob_block is None:
+        problem_url = f"{subject_base_url}/problem?id={id}"
+        if img is None:
+
+            async def load_problem() -> dict[str, object] | None:
+                html = await self._fetch_html(problem_url)
+                started_at = time.monotonic()
+                problem = self._html_backend.parse_problem_page(html, id, problem_url, subject_base_url)
+                self._metrics.observe_parse("problem", time.monotonic() - started_at)
+                return problem
+
+            return await self._coalesce(("problem", problem_url), load_problem)
+
+        rendered = await self._render_problem(subject, id, img)
+        if rendered is None:
             return None
 
-        self._problem_parser.normalize_images(prob_block, subject_base_url)
-        problem_url = f"{subject_base_url}/problem?id={id}"
+        problem, image = rendered
+        if isinstance(path_to_img, str):
+            await asyncio.to_thread(Path(path_to_img).write_bytes, image)
+        elif path_to_img is not None:
+            path_to_img.write(image)
+        return problem
 
-        if img is not None:
-            for info_block in prob_block.find_all("div", {"class": "minor"}):
-                info_block.decompose()
-            tail_blocks = prob_block.find_all("div")
-            if tail_blocks:
-                tail_blocks[-1].decompose()
-
-            await self._renderer.render(
-                prob_block=prob_block,
-                renderer=img,
-                problem_id=id,
-                path_to_img=path_to_img,
-                path_to_tmp_html=path_to_tmp_html,
-                html2img_chrome_path=self.html2img_chrome_path,
-                grabzit_auth=self.grabzit_auth,
-            )
+    async def render_problem_image(
+        self,
+        subject: str,
+        id: str,
+        img: str = "pyppeteer",
+    ) -> bytes | None:
+        """Render problem to PNG in memory.
 
-        return self._problem_parser.parse_problem(prob_block, id, problem_url)
+        Args:
+            subject: Subject short code.
+            id: Problem identifier.
+            img: Image backend: pyppeteer, grabzit, or html2img.
 
-    async def search(self, subject: str, request: str, page: int = 1) -> list[str]:
+        Returns:
+            Encoded PNG image or None if problem block is missing.
+        """
+        rendered = await self._render_problem(subject, id, img)
+        return None if rendered is None else rendered[1]
+
+    async def render_problems(
+        self,
+        subject: str,
+        ids: Iterable[str],
+        img: str = "pyppeteer",
+        concurrency: int = 10,
+        sheet: bool = False,
+        sheet_columns: int = 1,
+    ) -> dict[str, object]:
+        """Fetch and render many problems concurrently on the shared browser.
+
+        Args:
+            subject: Subject short code.
+            ids: Problem identifiers.
+            img: Image backend: pyppeteer, grabzit, or html2img.
+            concurrency: Maximum number of problems fetched and rendered at the same time.
+            sheet: Stitch rendered images into one PNG sheet.
+            sheet_columns: Number of images per sheet row.
+
+        Returns:
+            Dict with ``items`` (per-id dicts with ``id``, ``problem``, ``image``, ``error``,
+            ``fetch_seconds``, ``render_seconds`` in input order), ``sheet`` (PNG or None)
+            and ``total_seconds``.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        if sheet_columns < 1:
+            raise ValueError("sheet_columns must be >= 1")
+        if img not in _RENDERERS:
+            raise ValueError(f"Unsupported img backend: {img}")
+        if subject not in self._subject_base_url:
+            raise KeyError(subject)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        started = time.perf_counter()
+
+        async def render(problem_id: str) -> dict[str, object]:
+            item: dict[str, object] = {
+                "id": problem_id,
+                "problem": None,
+                "image": None,
+                "error": None,
+                "fetch_seconds": 0.0,
+                "render_seconds": 0.0,
+            }
+            async with semaphore:
+                item_started = time.perf_counter()
+                try:
+                    prepared = await self._fetch_render_block(subject, problem_id)
+                    fetched = time.perf_counter()
+                    item["fetch_seconds"] = fetched - item_started
+                    if prepared is not None:
+                        prob_block, item["problem"] = prepared
+                        item["image"] = await self._render_block(prob_block, img)
+                        item["render_seconds"] = time.perf_counter() - fetched
+                except Exception as error:
+                    item["error"] = error
+            return item
+
+        items = await asyncio.gather(*(render(problem_id) for problem_id in ids))
+        sheet_image = None
+        if sheet:
+            rendered_images = [item["image"] for item in items if item["image"] is not None]
+            if rendered_images:
+                sheet_image = await asyncio.to_thread(_stitch_sheet, rendered_images, sheet_columns)
+        return {
+            "items": items,
+            "sheet": sheet_image,
+            "total_seconds": time.perf_counter() - started,
+        }
+
+    async def get_problems_by_ids(
+        self,
+        subject: str,
+        ids: Iterable[str],
+        concurrency: int = 10,
+        ordered: bool = False,
+    ) -> AsyncIterator[dict[str, object]]:
+        """Fetch many problems with bounded concurrency and stream the results.
+
+        Args:
+            subject: Subject short code.
+            ids: Problem identifiers, consumed lazily.
+            concurrency: Maximum number of problems fetched at the same time.
+            ordered: Yield results in input order instead of completion order.
+
+        Returns:
+            Async iterator of dicts with ``id``, ``problem`` (payload or None) and
+            ``error`` (exception that failed this id, or None).
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        if subject not in self._subject_base_url:
+            raise KeyError(subject)
+
+        async def fetch(problem_id: str) -> dict[str, object]:
+            try:
+                problem = await self.get_problem_by_id(subject, problem_id)
+            except (httpx.HTTPError, ProblemParseError) as error:
+                return {"id": problem_id, "problem": None, "error": error}
+            return {"id": problem_id, "problem": problem, "error": None}
+
+        id_iterator = iter(ids)
+        in_flight: deque[asyncio.Task[dict[str, object]]] = deque()
+
+        def schedule_next() -> None:
+            problem_id = next(id_iterator, None)
+            if problem_id is not None:
+                in_flight.append(asyncio.ensure_future(fetch(problem_id)))
+
+        try:
+            for _ in range(concurrency):
+                schedule_next()
+
+            while in_flight:
+                if ordered:
+                    result = await in_flight[0]
+                    in_flight.popleft()
+                    schedule_next()
+                    yield result
+                    continue
+
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    in_flight.remove(task)
+                    schedule_next()
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def search(
+        self,
+        subject: str,
+        request: str,
+        page: int = 1,
+        backend: str = "remote",
+    ) -> list[str]:
         """Search problem IDs by text query.
 
         Args:
             subject: Subject short code.
             request: Search phrase.
             page: Search page number.
+            backend: ``remote`` queries sdamgia.ru, ``local`` queries problems added
+                with index_problems.
 
         Returns:
             List of problem identifiers.
         """
         subject_base_url = self._subject_base_url[subject]
-        soup = await self._fetch_soup(f"{subject_base_url}/search?search={request}&page={page}")
-        return _extract_problem_ids(soup)
+        if backend == "local":
+            return await asyncio.to_thread(
+                self._local_search_index().search,
+                subject,
+                request,
+                _LOCAL_SEARCH_PAGE_SIZE,
+                (page - 1) * _LOCAL_SEARCH_PAGE_SIZE,
+            )
+        if backend != "remote":
+            raise ValueError(f"Unsupported search backend: {backend}")
+        return await self._fetch_problem_ids(f"{subject_base_url}/search?search={request}&page={page}")
+
+    async def index_problems(self, subject: str, ids: Iterable[str], concurrency: int = 10) -> int:
+        """Fetch problems and add their text to local search index.
+
+        Args:
+            subject: Subject short code.
+            ids: Problem identifiers.
+            concurrency: Maximum number of problems fetched at the same time.
+
+        Returns:
+            Number of indexed problems; failed and missing problems are skipped.
+        """
+        index = self._local_search_index()
+        problems = [
+            result["problem"]
+            async for result in self.get_problems_by_ids(subject, ids, concurrency)
+            if result["problem"] is not None
+        ]
+        await asyncio.to_thread(index.add, subject, problems)
+        return len(problems)
 
     async def get_test_by_id(self, subject: str, testid: str) -> list[str]:
         """Get problem IDs from a generated test.
@@ -180,8 +599,7 @@ class SdamGIA:
             List of problem identifiers from test.
         """
         subject_base_url = self._subject_base_url[subject]
-        soup = await self._fetch_soup(f"{subject_base_url}/test?id={testid}")
-        return _extract_problem_ids(soup)
+        return await self._fetch_problem_ids(f"{subject_base_url}/test?id={testid}")
 
     async def get_category_by_id(self, subject: str, categoryid: str, page: int = 1) -> list[str]:
         """Get problem IDs from category page.
@@ -195,10 +613,59 @@ class SdamGIA:
             List of problem identifiers for category.
         """
         subject_base_url = self._subject_base_url[subject]
-        soup = await self._fetch_soup(
+        return await self._fetch_problem_ids(
             f"{subject_base_url}/test?&filter=all&theme={categoryid}&page={page}"
         )
-        return _extract_problem_ids(soup)
+
+    async def iter_category(
+        self,
+        subject: str,
+        categoryid: str,
+        prefetch: int = 3,
+        max_pages: int | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream problem IDs of a whole category page by page.
+
+        Args:
+            subject: Subject short code.
+            categoryid: Category identifier.
+            prefetch: Number of pages fetched concurrently ahead of the consumer.
+            max_pages: Optional upper bound of pages to walk.
+
+        Returns:
+            Async iterator of unique problem identifiers in page order.
+        """
+        async for problem_id in self._iter_pages(
+            lambda page: self.get_category_by_id(subject, categoryid, page=page),
+            prefetch,
+            max_pages,
+        ):
+            yield problem_id
+
+    async def iter_search(
+        self,
+        subject: str,
+        request: str,
+        prefetch: int = 3,
+        max_pages: int | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream problem IDs of all search result pages.
+
+        Args:
+            subject: Subject short code.
+            request: Search phrase.
+            prefetch: Number of pages fetched concurrently ahead of the consumer.
+            max_pages: Optional upper bound of pages to walk.
+
+        Returns:
+            Async iterator of unique problem identifiers in page order.
+        """
+        async for problem_id in self._iter_pages(
+            lambda page: self.search(subject, request, page=page),
+            prefetch,
+            max_pages,
+        ):
+            yield problem_id
 
     async def get_catalog(self, subject: str) -> list[dict[str, object]]:
         """Get subject catalog with topics and categories.
@@ -210,8 +677,102 @@ class SdamGIA:
             Catalog structure with topics and nested categories.
         """
         subject_base_url = self._subject_base_url[subject]
-        soup = await self._fetch_soup(f"{subject_base_url}/prob_catalog")
-        return self._catalog_parser.parse(soup)
+
+        loaded = False
+
+        async def load_catalog() -> list[dict[str, object]]:
+            nonlocal loaded
+            loaded = True
+            html = await self._fetch_html(f"{subject_base_url}/prob_catalog")
+            started_at = time.monotonic()
+            catalog = self._html_backend.parse_catalog_page(html)
+            self._metrics.observe_parse("catalog", time.monotonic() - started_at)
+            return catalog
+
+        catalog = await self._catalog_cache.get(subject, load_catalog)
+        self._metrics.observe_cache("catalog", "miss" if loaded else "hit")
+        return catalog
+
+    async def crawl_subject(
+        self,
+        subject: str,
+        store_path: str,
+        concurrency: int = 10,
+        category_concurrency: int = 2,
+        on_progress: Callable[[dict[str, float]], None] | None = None,
+    ) -> dict[str, float]:
+        """Mirror all catalog categories and problems of subject into SQLite store.
+
+        Args:
+            subject: Subject short code.
+            store_path: SQLite file keeping problems and checkpoints; reused to resume.
+            concurrency: Maximum number of problems fetched at the same time per category.
+            category_concurrency: Number of categories walked at the same time.
+            on_progress: Called with stats snapshot after each saved page.
+
+        Returns:
+            Stats of this run: categories, pages, problems, missing, failed,
+            elapsed_seconds, pages_per_second, problems_per_second.
+        """
+        if subject not in self._subject_base_url:
+            raise KeyError(subject)
+        store = _CrawlStore(store_path)
+        try:
+            crawler = _SubjectCrawler(self, store, concurrency, category_concurrency, on_progress)
+            return await crawler.run(subject)
+        finally:
+            store.close()
+
+    async def sync_subject(
+        self,
+        subject: str,
+        store_path: str,
+        concurrency: int = 10,
+        category_concurrency: int = 2,
+        on_progress: Callable[[dict[str, float]], None] | None = None,
+    ) -> dict[str, float]:
+        """Add problems published since the last crawl or sync to SQLite store.
+
+        Args:
+            subject: Subject short code.
+            store_path: SQLite file created by crawl_subject.
+            concurrency: Maximum number of problems fetched at the same time per category.
+            category_concurrency: Number of categories walked at the same time.
+            on_progress: Called with stats snapshot after each page with new problems.
+
+        Returns:
+            Stats of this run, same keys as crawl_subject.
+        """
+        if subject not in self._subject_base_url:
+            raise KeyError(subject)
+        store = _CrawlStore(store_path)
+        try:
+            crawler = _SubjectCrawler(self, store, concurrency, category_concurrency, on_progress)
+            return await crawler.sync(subject)
+        finally:
+            store.close()
+
+    def invalidate_catalog(self, subject: str | None = None) -> None:
+        """Drop cached catalog so the next call downloads it again.
+
+        Args:
+            subject: Subject short code, or None to drop catalogs of all subjects.
+
+        Returns:
+            None.
+        """
+        self._catalog_cache.invalidate(subject)
+
+    def get_scheduler_stats(self) -> dict[str, dict[str, float]]:
+        """Get request scheduler queue depth and wait-time statistics.
+
+        Args:
+            None.
+
+        Returns:
+            Mapping of host to counters: limit, in_flight, queued, requests and wait times.
+        """
+        return self._scheduler.stats()
 
     async def get_random_problem(
         self,
@@ -219,6 +780,7 @@ class SdamGIA:
         topic_id: str,
         period_days: int = 30,
         seed: int | None = None,
+        hedge: int = 3,
     ) -> dict[str, object] | None:
         """Get random problem for subject topic with a best-effort period filter.
 
@@ -227,12 +789,15 @@ class SdamGIA:
             topic_id: Topic identifier (for example, "1" for task 1).
             period_days: Relative period window in days.
             seed: Optional random seed for deterministic selection.
+            hedge: Number of shuffled candidates fetched concurrently ahead.
 
         Returns:
             Parsed problem payload or None if no valid candidate is found.
         """
         if period_days < 1:
             raise ValueError("period_days must be >= 1")
+        if hedge < 1:
+            raise ValueError("hedge must be >= 1")
 
         catalog = await self.get_catalog(subject)
         topic_exists = any(str(topic.get("topic_id")) == topic_id for topic in catalog)
@@ -240,11 +805,11 @@ class SdamGIA:
             return None
 
         pages_per_category = self._resolve_pages_per_category(period_days)
-        candidate_ids = await self._collect_topic_candidate_ids(subject, topic_id, pages_per_category)
+        candidate_ids = await self._topic_candidate_ids(subject, topic_id, pages_per_category)
 
         if not candidate_ids:
             fallback_pages = self._resolve_pages_per_category(365)
-            candidate_ids = await self._collect_topic_candidate_ids(subject, topic_id, fallback_pages)
+            candidate_ids = await self._topic_candidate_ids(subject, topic_id, fallback_pages)
 
         if not candidate_ids:
             return None
@@ -257,10 +822,14 @@ class SdamGIA:
         remaining_ids = [problem_id for problem_id in candidate_ids if problem_id != first_candidate]
         randomizer.shuffle(remaining_ids)
 
-        for problem_id in [first_candidate, *remaining_ids]:
-            problem = await self.get_problem_by_id(subject, problem_id)
-            if problem is not None:
-                return problem
+        async with contextlib.aclosing(
+            self.get_problems_by_ids(subject, [first_candidate, *remaining_ids], hedge, ordered=True)
+        ) as results:
+            async for result in results:
+                if result["error"] is not None:
+                    raise result["error"]
+                if result["problem"] is not None:
+                    return result["problem"]
 
         return None
 
@@ -285,11 +854,9 @@ class SdamGIA:
             levels = {f"prob{i}": problems[i] for i in problems}
 
         response = await self._request_with_retry(
-            lambda: self._http_client.get(
-                f"{subject_base_url}/test",
-                params={"a": "generate", **levels},
-                follow_redirects=False,
-            ),
+            f"{subject_base_url}/test",
+            params={"a": "generate", **levels},
+            follow_redirects=False,
             allow_redirect_response=True,
         )
         location = self._extract_redirect_location(response)
@@ -336,67 +903,163 @@ class SdamGIA:
             return flag
 
         response = await self._request_with_retry(
-            lambda: self._http_client.get(
-                f"{subject_base_url}/test",
-                params={
-                    "id": testid,
-                    "print": "true",
-                    "pdf": pdf,
-                    "sol": normalize_flag(solution),
-                    "num": normalize_flag(nums),
-                    "ans": normalize_flag(answers),
-                    "key": normalize_flag(key),
-                    "crit": normalize_flag(crit),
-                    "pre": normalize_flag(instruction),
-                    "dcol": normalize_flag(col),
-                },
-                follow_redirects=False,
-            ),
+            f"{subject_base_url}/test",
+            params={
+                "id": testid,
+                "print": "true",
+                "pdf": pdf,
+                "sol": normalize_flag(solution),
+                "num": normalize_flag(nums),
+                "ans": normalize_flag(answers),
+                "key": normalize_flag(key),
+                "crit": normalize_flag(crit),
+                "pre": normalize_flag(instruction),
+                "dcol": normalize_flag(col),
+            },
+            follow_redirects=False,
             allow_redirect_response=True,
         )
         location = self._extract_redirect_location(response)
         return urljoin(f"{subject_base_url}/", location)
 
-    async def search_by_img(self, subject: str, path: str) -> list[str]:
+    async def search_by_img(
+        self,
+        subject: str,
+        path: str,
+        window_size: int = 10,
+        stride: int = 5,
+        min_confirmations: int | None = 3,
+    ) -> list[str]:
         """Search problems by text recognized from image.
 
         Args:
             subject: Subject short code.
             path: Path to source image.
+            window_size: Number of OCR words in one search phrase.
+            stride: Step in words between neighbouring search phrases.
+            min_confirmations: Stop searching once one problem is found by this many
+                phrases; None searches every phrase.
 
         Returns:
-            List of unique problem identifiers.
+            Unique problem identifiers ranked by number of matching phrases.
         """
         subject_base_url = self._subject_base_url[subject]
-        words_from_img = (
-            await asyncio.to_thread(images.img_to_str, path, self.tesseract_src)
-        ).split()
-        result: list[str] = []
-        result_lock = asyncio.Lock()
-        semaphore = asyncio.Semaphore(20)
-
-        async def parse_chunk(start_index: int) -> None:
-            try:
-                request_phrase = " ".join([words_from_img[index] for index in range(start_index, start_index + 10)])
-            except IndexError:
-                return
+        if min_confirmations is not None and min_confirmations < 1:
+            raise ValueError("min_confirmations must be >= 1")
+        planner = _SearchQueryPlanner(window_size=window_size, stride=stride)
+        text_from_img = await self._ocr_engine.recognize(path, self.tesseract_src)
+        phrases = planner.plan(text_from_img)
 
+        async def search_phrase(phrase_index: int) -> tuple[int, list[str]]:
             try:
-                async with semaphore:
-                    soup = await self._fetch_soup(
-                        f"{subject_base_url}/search?search={request_phrase}&page=1"
-                    )
+                problem_ids = await self._fetch_problem_ids(
+                    f"{subject_base_url}/search?search={phrases[phrase_index]}&page=1"
+                )
             except httpx.HTTPError:
-                return
+                return phrase_index, []
+            return phrase_index, problem_ids
+
+        hits: Counter[str] = Counter()
+        first_positions: dict[str, tuple[int, int]] = {}
+        tasks = [asyncio.ensure_future(search_phrase(index)) for index in range(len(phrases))]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                phrase_index, problem_ids = await next_result
+                confirmed = False
+                for position, problem_id in enumerate(dict.fromkeys(problem_ids)):
+                    hits[problem_id] += 1
+                    first_positions[problem_id] = min(
+                        first_positions.get(problem_id, (phrase_index, position)),
+                        (phrase_index, position),
+                    )
+                    if min_confirmations is not None and hits[problem_id] >= min_confirmations:
+                        confirmed = True
+                if confirmed:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
 
-            async with result_lock:
-                for problem_id in _extract_problem_ids(soup):
-                    if problem_id not in result:
-                        result.append(problem_id)
+        return sorted(hits, key=lambda problem_id: (-hits[problem_id], first_positions[problem_id]))
 
-        await asyncio.gather(*(parse_chunk(index) for index in range(len(words_from_img))))
+    async def _probe_host(self, subject: str) -> tuple[float, httpx.HTTPError | None]:
+        """Send HEAD request to subject host root in a scheduler slot.
 
-        return result
+        Args:
+            subject: Subject short code.
+
+        Returns:
+            Probe duration and request failure, or None when host answered with any status.
+        """
+        url = f"{self._subject_base_url[subject]}/"
+        started_at = time.monotonic()
+        try:
+            async with self._scheduler.slot(url):
+                await self._http_client.head(url, headers=self._headers, follow_redirects=False)
+        except httpx.HTTPError as error:
+            return time.monotonic() - started_at, error
+        return time.monotonic() - started_at, None
+
+    async def _keep_connections_alive(self, interval_seconds: float) -> None:
+        """Probe warmed subject hosts periodically until cancelled.
+
+        Args:
+            interval_seconds: Pause between probe rounds.
+
+        Returns:
+            None.
+        """
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await asyncio.gather(*(self._probe_host(subject) for subject in sorted(self._warm_subjects)))
+
+    async def _iter_pages(
+        self,
+        fetch_page: Callable[[int], Awaitable[list[str]]],
+        prefetch: int,
+        max_pages: int | None,
+    ) -> AsyncIterator[str]:
+        """Walk numbered pages with prefetch until an empty or repeated page.
+
+        Args:
+            fetch_page: Async function returning problem IDs for a 1-based page number.
+            prefetch: Number of pages fetched concurrently ahead of the consumer.
+            max_pages: Optional upper bound of pages to walk.
+
+        Returns:
+            Async iterator of unique problem identifiers in page order.
+        """
+        if prefetch < 1:
+            raise ValueError("prefetch must be >= 1")
+
+        seen_ids: set[str] = set()
+        pending: deque[asyncio.Task[list[str]]] = deque()
+        next_page = 1
+
+        def schedule_pages() -> None:
+            nonlocal next_page
+            while len(pending) < prefetch and (max_pages is None or next_page <= max_pages):
+                pending.append(asyncio.ensure_future(fetch_page(next_page)))
+                next_page += 1
+
+        try:
+            schedule_pages()
+            while pending:
+                page_ids = await pending.popleft()
+                new_ids: list[str] = []
+                for problem_id in page_ids:
+                    if problem_id not in seen_ids:
+                        seen_ids.add(problem_id)
+                        new_ids.append(problem_id)
+                if not new_ids:
+                    return
+
+                schedule_pages()
+                for problem_id in new_ids:
+                    yield problem_id
+        finally:
+            for task in pending:
+                task.cancel()
 
     def _resolve_pages_per_category(self, period_days: int) -> int:
         """Resolve how many category pages to scan for the requested period.
@@ -451,30 +1114,35 @@ class SdamGIA:
         if not category_ids:
             return []
 
-        semaphore = asyncio.Semaphore(10)
-        lock = asyncio.Lock()
-        seen_ids: set[str] = set()
-        candidate_ids: list[str] = []
-
-        async def collect_for_page(category_id: str, page: int) -> None:
-            async with semaphore:
-                page_ids = await self.get_category_by_id(subject, category_id, page=page)
-
-            async with lock:
-                for problem_id in page_ids:
-                    if problem_id in seen_ids:
-                        continue
-                    seen_ids.add(problem_id)
-                    candidate_ids.append(problem_id)
-
-        await asyncio.gather(
+        pages = await asyncio.gather(
             *(
-                collect_for_page(category_id, page)
+                self.get_category_by_id(subject, category_id, page=page)
                 for category_id in category_ids
                 for page in range(1, pages_per_category + 1)
             )
         )
-        return candidate_ids
+        return list(dict.fromkeys(problem_id for page_ids in pages for problem_id in page_ids))
+
+    async def _topic_candidate_ids(
+        self,
+        subject: str,
+        topic_id: str,
+        pages_per_category: int,
+    ) -> list[str]:
+        """Get topic candidate IDs from pool, collecting them on first use.
+
+        Args:
+            subject: Subject short code.
+            topic_id: Topic identifier.
+            pages_per_category: Number of pages to scan for each category.
+
+        Returns:
+            Unique candidate problem identifiers.
+        """
+        return await self._candidate_pool.get(
+            (subject, topic_id, pages_per_category),
+            lambda pages: self._collect_topic_candidate_ids(subject, topic_id, pages),
+        )
 
     def _pick_problem_with_seed(self, candidate_ids: list[str], seed: int | None) -> str | None:
         """Pick one problem identifier from candidates.
@@ -490,49 +1158,286 @@ class SdamGIA:
             return None
         return random.Random(seed).choice(candidate_ids)
 
-    async def _fetch_soup(self, url: str) -> BeautifulSoup:
-        """Fetch URL and parse response as HTML.
+    async def _render_problem(
+        self,
+        subject: str,
+        id: str,
+        img: str,
+    ) -> tuple[dict[str, object], bytes] | None:
+        """Fetch problem and render its block.
+
+        Args:
+            subject: Subject short code.
+            id: Problem identifier.
+            img: Image backend: pyppeteer, grabzit, or html2img.
+
+        Returns:
+            Parsed problem payload with PNG image, or None if problem block is missing.
+        """
+        prepared = await self._fetch_render_block(subject, id)
+        if prepared is None:
+            return None
+
+        prob_block, problem = prepared
+        return problem, await self._render_block(prob_block, img)
+
+    async def _fetch_render_block(
+        self,
+        subject: str,
+        id: str,
+    ) -> tuple[Tag, dict[str, object]] | None:
+        """Fetch problem and strip page chrome from its block.
+
+        Args:
+            subject: Subject short code.
+            id: Problem identifier.
+
+        Returns:
+            Problem block ready for rendering with parsed payload, or None if block is missing.
+        """
+        subject_base_url = self._subject_base_url[subject]
+        problem_url = f"{subject_base_url}/problem?id={id}"
+        html = await self._fetch_html(problem_url)
+
+        prob_block = self._html_backend.problem_block(html)
+        if prob_block is None:
+            return None
+
+        self._problem_parser.normalize_images(prob_block, subject_base_url)
+        for info_block in prob_block.find_all("div", {"class": "minor"}):
+            info_block.decompose()
+        tail_blocks = prob_block.find_all("div")
+        if tail_blocks:
+            tail_blocks[-1].decompose()
+        return prob_block, self._problem_parser.parse_problem(prob_block, id, problem_url)
+
+    async def _render_block(self, prob_block: Tag, img: str) -> bytes:
+        """Render prepared problem block with configured tool settings.
+
+        Args:
+            prob_block: Problem block returned by _fetch_render_block.
+            img: Image backend: pyppeteer, grabzit, or html2img.
+
+        Returns:
+            Encoded PNG image.
+        """
+        return await self._renderer.render(
+            prob_block=prob_block,
+            renderer=img,
+            html2img_chrome_path=self.html2img_chrome_path,
+            grabzit_auth=self.grabzit_auth,
+        )
+
+    def _local_search_index(self) -> _LocalSearchIndex:
+        """Open local search index on first use.
+
+        Args:
+            None.
+
+        Returns:
+            Local search index of this client.
+        """
+        if self._search_index is None:
+            self._search_index = _LocalSearchIndex(self._search_index_path)
+        return self._search_index
+
+    async def _coalesce(self, key: tuple[str, ...], load: Callable[[], Awaitable[_T]]) -> _T:
+        """Share one parsed result between concurrent identical calls.
+
+        Args:
+            key: Identity of parsed result.
+            load: Zero-argument async function fetching and parsing the result.
+
+        Returns:
+            Independent copy of parsed result.
+        """
+        return copy.deepcopy(await self._single_flight.run(key, load))
+
+    async def _fetch_problem_ids(self, url: str) -> list[str]:
+        """Fetch search-like page and extract problem IDs once for concurrent callers.
 
         Args:
             url: Absolute URL.
 
         Returns:
-            Parsed BeautifulSoup document.
+            List of problem identifiers.
+        """
+
+        async def load_problem_ids() -> list[str]:
+            html = await self._fetch_html(url)
+            started_at = time.monotonic()
+            problem_ids = self._html_backend.extract_problem_ids(html)
+            self._metrics.observe_parse("problem_ids", time.monotonic() - started_at)
+            return problem_ids
+
+        return await self._coalesce(("problem_ids", url), load_problem_ids)
+
+    async def _fetch_html(self, url: str) -> bytes:
+        """Fetch page body once for all concurrent callers of the same URL.
+
+        Args:
+            url: Absolute URL.
+
+        Returns:
+            Raw response body.
         """
-        response = await self._request_with_retry(lambda: self._http_client.get(url))
-        return BeautifulSoup(response.content, "html.parser")
+        return await self._single_flight.run(("html", url), lambda: self._download_html(url))
+
+    async def _download_html(self, url: str) -> bytes:
+        """Download page body through persistent cache with conditional revalidation.
+
+        Args:
+            url: Absolute URL.
+
+        Returns:
+            Raw response body.
+        """
+        cache = self._response_cache
+        if cache is None or cache.ttl_for(url) <= 0:
+            response = await self._request_with_retry(url)
+            return response.content
+
+        cached = await asyncio.to_thread(cache.lookup, url)
+        if cached is not None and cached.is_fresh:
+            self._metrics.observe_cache("response", "hit")
+            return cached.body
+
+        headers: dict[str, str] = {}
+        if cached is not None and cached.etag is not None:
+            headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified is not None:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        response = await self._request_with_retry(
+            url,
+            headers=headers,
+            allow_not_modified=bool(headers),
+        )
+        if cached is not None and response.status_code == 304:
+            self._metrics.observe_cache("response", "revalidated")
+            await asyncio.to_thread(cache.refresh, url)
+            return cached.body
+
+        self._metrics.observe_cache("response", "miss")
+
+        await asyncio.to_thread(
+            cache.store,
+            url,
+            response.content,
+            response.headers.get("etag"),
+            response.headers.get("last-modified"),
+        )
+        return response.content
 
     async def _request_with_retry(
         self,
-        request: Callable[[], Awaitable[httpx.Response]],
+        url: str,
+        *,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        follow_redirects: bool = True,
         allow_redirect_response: bool = False,
+        allow_not_modified: bool = False,
     ) -> httpx.Response:
-        """Execute HTTP request with retry and explicit status checks.
+        """Execute GET request through circuit breaker and host scheduler with retry policy.
 
         Args:
-            request: Zero-argument async function returning HTTP response.
+            url: Absolute request URL.
+            params: Query parameters.
+            headers: Extra request headers.
+            follow_redirects: Follow redirect responses.
             allow_redirect_response: Return redirect responses without raising.
+            allow_not_modified: Return 304 responses to conditional requests without raising.
 
         Returns:
             Successful HTTP response object.
         """
-        last_error: Exception | None = None
-        for attempt in range(self._retries + 1):
+        endpoint = _metrics_endpoint(url)
+        attempt = 0
+        while True:
             try:
-                response = await request()
-                if allow_redirect_response and response.is_redirect:
-                    return response
-                response.raise_for_status()
-                return response
-            except httpx.HTTPError as error:
-                last_error = error
-                if attempt == self._retries:
+                is_probe = self._circuit_breaker.before_request(url)
+                try:
+                    response = await self._send_scheduled(url, params, headers, follow_redirects)
+                except httpx.TransportError as error:
+                    self._circuit_breaker.record_failure(url)
+                    failure: Exception = error
+                    delay = self._retry_policy.retry_delay(attempt, error)
+                    if delay is None:
+                        raise
+                except BaseException:
+                    if is_probe:
+                        self._circuit_breaker.release_probe(url)
                     raise
-                await asyncio.sleep(self._retry_base_delay_seconds * (attempt + 1))
+                else:
+                    if response.status_code in _UNAVAILABLE_STATUS_CODES:
+                        self._circuit_breaker.record_failure(url)
+                    else:
+                        self._circuit_breaker.record_success(url)
+
+                    if allow_redirect_response and response.is_redirect:
+                        return response
+                    if allow_not_modified and response.status_code == 304:
+                        return response
+                    try:
+                        response.raise_for_status()
+                    except httpx.HTTPStatusError as error:
+                        failure = error
+                        delay = self._retry_policy.retry_delay(attempt, error)
+                        if delay is None:
+                            raise
+                    else:
+                        return response
+            except Exception as error:
+                self._metrics.observe_error(endpoint, type(error).__name__)
+                raise
+
+            self._metrics.observe_retry(endpoint, type(failure).__name__)
+            self._metrics.observe_wait(endpoint, "retry_backoff", delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send_scheduled(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        headers: dict[str, str] | None,
+        follow_redirects: bool,
+    ) -> httpx.Response:
+        """Send one GET request in a scheduler slot and report its outcome.
 
-        if last_error is not None:
-            raise last_error
-        raise RuntimeError("Unexpected request wrapper state")
+        Args:
+            url: Absolute request URL.
+            params: Query parameters.
+            headers: Extra request headers.
+            follow_redirects: Follow redirect responses.
+
+        Returns:
+            HTTP response without status checks.
+        """
+        endpoint = _metrics_endpoint(url)
+        queued_at = time.monotonic()
+        async with self._scheduler.slot(url) as host_limiter:
+            started_at = time.monotonic()
+            self._metrics.observe_wait(endpoint, "scheduler", started_at - queued_at)
+            try:
+                response = await self._http_client.get(
+                    url,
+                    params=params,
+                    headers=self._headers if headers is None else {**self._headers, **headers},
+                    follow_redirects=follow_redirects,
+                )
+            except httpx.TimeoutException:
+                await host_limiter.observe(time.monotonic() - started_at, throttled=True)
+                raise
+            elapsed_seconds = time.monotonic() - started_at
+            await host_limiter.observe(
+                elapsed_seconds,
+                throttled=response.status_code in _THROTTLE_STATUS_CODES,
+                retry_after_seconds=_parse_retry_after(response.headers.get("retry-after")),
+            )
+        self._metrics.observe_request(endpoint, response.status_code, elapsed_seconds, len(response.content))
+        return response
 
     @staticmethod
     def _extract_redirect_location(response: httpx.Response) -> str:
@@ -540,3 +1445,8 @@ class SdamGIA:
         if location is None:
             raise ValueError("Redirect response does not include a location header.")
         return location
+
+
+def _phase_timeout(seconds: float | None, default_seconds: float) -> float:
+    """Resolve optional per-phase timeout to overall timeout."""
+    return default_seconds if seconds is None else seconds
@@ -0,0 +1,503 @@
+"""Resumable subject crawler with SQLite checkpoint store."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sdamgia.client import SdamGIA
+
+
+class _CrawlStore:
+    """SQLite store of crawled problems and per-category page checkpoints."""
+
+    def __init__(self, path: str) -> None:
+        """Open or create store database.
+
+        Args:
+            path: SQLite database file path.
+
+        Returns:
+            None.
+        """
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS categories (
+                    subject TEXT NOT NULL,
+                    category_id TEXT NOT NULL,
+                    topic_id TEXT NOT NULL,
+                    next_page INTEGER NOT NULL DEFAULT 1,
+                    done INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (subject, category_id)
+                );
+                CREATE TABLE IF NOT EXISTS category_problems (
+                    subject TEXT NOT NULL,
+                    category_id TEXT NOT NULL,
+                    problem_id TEXT NOT NULL,
+                    PRIMARY KEY (subject, category_id, problem_id)
+                );
+                CREATE TABLE IF NOT EXISTS problems (
+                    subject TEXT NOT NULL,
+                    problem_id TEXT NOT NULL,
+                    payload TEXT,
+                    error TEXT,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (subject, problem_id)
+                );
+                """
+            )
+
+    def add_categories(self, subject: str, catalog: list[dict[str, object]]) -> None:
+        """Register catalog categories that are not in the store yet.
+
+        Args:
+            subject: Subject short code.
+            catalog: Catalog returned by get_catalog.
+
+        Returns:
+            None.
+        """
+        rows = [
+            (subject, category["category_id"], topic["topic_id"])
+            for topic in catalog
+            for category in topic["categories"]
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO categories (subject, category_id, topic_id) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def pending_categories(self, subject: str) -> list[tuple[str, int]]:
+        """List unfinished categories with the page to continue from.
+
+        Args:
+            subject: Subject short code.
+
+        Returns:
+            Pairs of category ID and next page number.
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT category_id, next_page FROM categories WHERE subject = ? AND done = 0",
+                (subject,),
+            ).fetchall()
+
+    def finished_categories(self, subject: str) -> list[str]:
+        """List categories walked to the end at least once.
+
+        Args:
+            subject: Subject short code.
+
+        Returns:
+            Category identifiers.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT category_id FROM categories WHERE subject = ? AND done = 1",
+                (subject,),
+            ).fetchall()
+        return [category_id for (category_id,) in rows]
+
+    def category_problem_ids(self, subject: str, category_id: str) -> set[str]:
+        """Load IDs already listed on saved pages of category.
+
+        Args:
+            subject: Subject short code.
+            category_id: Category identifier.
+
+        Returns:
+            Set of problem identifiers.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT problem_id FROM category_problems WHERE subject = ? AND category_id = ?",
+                (subject, category_id),
+            ).fetchall()
+        return {problem_id for (problem_id,) in rows}
+
+    def stored_problem_ids(self, subject: str, problem_ids: list[str]) -> set[str]:
+        """Select IDs whose problems were fetched without error.
+
+        Args:
+            subject: Subject short code.
+            problem_ids: Candidate problem identifiers.
+
+        Returns:
+            Subset of problem_ids already stored.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                f"""
+                SELECT problem_id FROM problems
+                WHERE subject = ? AND error IS NULL
+                    AND problem_id IN ({", ".join("?" * len(problem_ids))})
+                """,
+                (subject, *problem_ids),
+            ).fetchall()
+        return {problem_id for (problem_id,) in rows}
+
+    def save_page(
+        self,
+        subject: str,
+        category_id: str,
+        page: int,
+        problem_ids: list[str],
+        results: list[dict[str, object]],
+    ) -> None:
+        """Store page problems and move category checkpoint past the page atomically.
+
+        Args:
+            subject: Subject short code.
+            category_id: Category identifier.
+            page: Saved page number.
+            problem_ids: New problem IDs listed on page.
+            results: Items yielded by get_problems_by_ids for problems not stored yet.
+
+        Returns:
+            None.
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                """
+                INSERT OR IGNORE INTO category_problems (subject, category_id, problem_id)
+                VALUES (?, ?, ?)
+                """,
+                [(subject, category_id, problem_id) for problem_id in problem_ids],
+            )
+            self._insert_problems(subject, results)
+            self._connection.execute(
+                "UPDATE categories SET next_page = ? WHERE subject = ? AND category_id = ?",
+                (page + 1, subject, category_id),
+            )
+
+    def add_category_problems(self, subject: str, category_id: str, problem_ids: list[str]) -> None:
+        """Remember problem IDs listed in category.
+
+        Args:
+            subject: Subject short code.
+            category_id: Category identifier.
+            problem_ids: Problem identifiers found in category.
+
+        Returns:
+            None.
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                """
+                INSERT OR IGNORE INTO category_problems (subject, category_id, problem_id)
+                VALUES (?, ?, ?)
+                """,
+                [(subject, category_id, problem_id) for problem_id in problem_ids],
+            )
+
+    def save_problems(self, subject: str, results: list[dict[str, object]]) -> None:
+        """Store refetched problems outside of page checkpoints.
+
+        Args:
+            subject: Subject short code.
+            results: Items yielded by get_problems_by_ids.
+
+        Returns:
+            None.
+        """
+        with self._lock, self._connection:
+            self._insert_problems(subject, results)
+
+    def failed_problem_ids(self, subject: str) -> list[str]:
+        """List problems whose last fetch failed.
+
+        Args:
+            subject: Subject short code.
+
+        Returns:
+            Problem identifiers.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT problem_id FROM problems WHERE subject = ? AND error IS NOT NULL",
+                (subject,),
+            ).fetchall()
+        return [problem_id for (problem_id,) in rows]
+
+    def finish_category(self, subject: str, category_id: str) -> None:
+        """Mark category as fully walked.
+
+        Args:
+            subject: Subject short code.
+            category_id: Category identifier.
+
+        Returns:
+            None.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE categories SET done = 1 WHERE subject = ? AND category_id = ?",
+                (subject, category_id),
+            )
+
+    def problems(self, subject: str) -> dict[str, dict[str, object]]:
+        """Load stored problem payloads.
+
+        Args:
+            subject: Subject short code.
+
+        Returns:
+            Mapping of problem ID to payload.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT problem_id, payload FROM problems WHERE subject = ? AND payload IS NOT NULL",
+                (subject,),
+            ).fetchall()
+        return {problem_id: json.loads(payload) for problem_id, payload in rows}
+
+    def close(self) -> None:
+        """Close database connection.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def _insert_problems(self, subject: str, results: list[dict[str, object]]) -> None:
+        now = time.time()
+        self._connection.executemany(
+            """
+            INSERT OR REPLACE INTO problems (subject, problem_id, payload, error, fetched_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    subject,
+                    result["id"],
+                    None if result["problem"] is None else json.dumps(result["problem"], ensure_ascii=False),
+                    None if result["error"] is None else repr(result["error"]),
+                    now,
+                )
+                for result in results
+            ],
+        )
+
+
+class _CrawlStats:
+    """Counters and throughput of one crawl run."""
+
+    def __init__(self) -> None:
+        """Start run clock.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        self.categories = 0
+        self.pages = 0
+        self.problems = 0
+        self.missing = 0
+        self.failed = 0
+        self._started = time.monotonic()
+
+    def snapshot(self) -> dict[str, float]:
+        """Build progress report.
+
+        Args:
+            None.
+
+        Returns:
+            Counters with elapsed time and pages/problems per second.
+        """
+        elapsed = time.monotonic() - self._started
+        return {
+            "categories": self.categories,
+            "pages": self.pages,
+            "problems": self.problems,
+            "missing": self.missing,
+            "failed": self.failed,
+            "elapsed_seconds": elapsed,
+            "pages_per_second": self.pages / elapsed if elapsed > 0 else 0.0,
+            "problems_per_second": self.problems / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+class _SubjectCrawler:
+    """Walk catalog, category pages and problems of one subject into crawl store."""
+
+    def __init__(
+        self,
+        client: SdamGIA,
+        store: _CrawlStore,
+        concurrency: int,
+        category_concurrency: int,
+        on_progress: Callable[[dict[str, float]], None] | None = None,
+    ) -> None:
+        """Initialize crawler.
+
+        Args:
+            client: API client used for all requests.
+            store: Checkpoint and result store.
+            concurrency: Maximum number of problems fetched at the same time per category.
+            category_concurrency: Number of categories walked at the same time.
+            on_progress: Called with stats snapshot after each saved page.
+
+        Returns:
+            None.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        if category_concurrency < 1:
+            raise ValueError("category_concurrency must be >= 1")
+        self._client = client
+        self._store = store
+        self._concurrency = concurrency
+        self._category_concurrency = category_concurrency
+        self._on_progress = on_progress
+        self._stats = _CrawlStats()
+
+    async def run(self, subject: str) -> dict[str, float]:
+        """Crawl subject, continuing from stored checkpoints and refetching failed problems.
+
+        Args:
+            subject: Subject short code.
+
+        Returns:
+            Stats snapshot of this run.
+        """
+        await self._prepare(subject)
+        pending = await asyncio.to_thread(self._store.pending_categories, subject)
+        await self._gather_bounded(
+            functools.partial(self._walk_category, subject, category_id, next_page)
+            for category_id, next_page in pending
+        )
+        return self._stats.snapshot()
+
+    async def sync(self, subject: str) -> dict[str, float]:
+        """Fetch only problems listed before already known IDs in finished categories.
+
+        Unfinished categories are crawled from their checkpoints as in run.
+
+        Args:
+            subject: Subject short code.
+
+        Returns:
+            Stats snapshot of this run.
+        """
+        await self._prepare(subject)
+        pending = await asyncio.to_thread(self._store.pending_categories, subject)
+        finished = await asyncio.to_thread(self._store.finished_categories, subject)
+        await self._gather_bounded(
+            [
+                *(
+                    functools.partial(self._walk_category, subject, category_id, next_page)
+                    for category_id, next_page in pending
+                ),
+                *(functools.partial(self._sync_category, subject, category_id) for category_id in finished),
+            ]
+        )
+        return self._stats.snapshot()
+
+    async def _prepare(self, subject: str) -> None:
+        failed_ids = await asyncio.to_thread(self._store.failed_problem_ids, subject)
+        if failed_ids:
+            results = await self._fetch_problems(subject, failed_ids)
+            await asyncio.to_thread(self._store.save_problems, subject, results)
+
+        catalog = await self._client.get_catalog(subject)
+        await asyncio.to_thread(self._store.add_categories, subject, catalog)
+
+    async def _gather_bounded(self, walks: Iterable[Callable[[], Awaitable[None]]]) -> None:
+        semaphore = asyncio.Semaphore(self._category_concurrency)
+
+        async def bounded(walk: Callable[[], Awaitable[None]]) -> None:
+            async with semaphore:
+                await walk()
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                for walk in walks:
+                    group.create_task(bounded(walk))
+        except ExceptionGroup as errors:
+            raise errors.exceptions[0]
+
+    async def _walk_category(self, subject: str, category_id: str, page: int) -> None:
+        known_ids = await asyncio.to_thread(self._store.category_problem_ids, subject, category_id)
+        while True:
+            page_ids = await self._client.get_category_by_id(subject, category_id, page=page)
+            new_ids = [problem_id for problem_id in dict.fromkeys(page_ids) if problem_id not in known_ids]
+            if not new_ids:
+                await asyncio.to_thread(self._store.finish_category, subject, category_id)
+                self._stats.categories += 1
+                return
+
+            known_ids.update(new_ids)
+            stored_ids = await asyncio.to_thread(self._store.stored_problem_ids, subject, new_ids)
+            results = await self._fetch_problems(
+                subject,
+                [problem_id for problem_id in new_ids if problem_id not in stored_ids],
+            )
+            await asyncio.to_thread(self._store.save_page, subject, category_id, page, new_ids, results)
+
+            self._stats.pages += 1
+            if self._on_progress is not None:
+                self._on_progress(self._stats.snapshot())
+            page += 1
+
+    async def _sync_category(self, subject: str, category_id: str) -> None:
+        known_ids = await asyncio.to_thread(self._store.category_problem_ids, subject, category_id)
+        highest_id = max((int(problem_id) for problem_id in known_ids if problem_id.isdigit()), default=0)
+        unseen_ids: dict[str, None] = {}
+        page = 1
+        while True:
+            page_ids = await self._client.get_category_by_id(subject, category_id, page=page)
+            fresh_ids: list[str] = []
+            reached_known = False
+            for problem_id in dict.fromkeys(page_ids):
+                if problem_id in known_ids or (problem_id.isdigit() and int(problem_id) <= highest_id):
+                    reached_known = True
+                    break
+                if problem_id not in unseen_ids:
+                    fresh_ids.append(problem_id)
+
+            if fresh_ids:
+                stored_ids = await asyncio.to_thread(self._store.stored_problem_ids, subject, fresh_ids)
+                results = await self._fetch_problems(
+                    subject,
+                    [problem_id for problem_id in fresh_ids if problem_id not in stored_ids],
+                )
+                await asyncio.to_thread(self._store.save_problems, subject, results)
+                unseen_ids.update(dict.fromkeys(fresh_ids))
+                self._stats.pages += 1
+                if self._on_progress is not None:
+                    self._on_progress(self._stats.snapshot())
+            if reached_known or not fresh_ids:
+                break
+            page += 1
+
+        if unseen_ids:
+            await asyncio.to_thread(self._store.add_category_problems, subject, category_id, list(unseen_ids))
+        self._stats.categories += 1
+
+    async def _fetch_problems(self, subject: str, problem_ids: list[str]) -> list[dict[str, object]]:
+        results = [
+            result
+            async for result in self._client.get_problems_by_ids(subject, problem_ids, self._concurrency)
+        ]
+        self._stats.problems += sum(result["problem"] is not None for result in results)
+        self._stats.missing += sum(result["error"] is None and result["problem"] is None for result in results)
+        self._stats.failed += sum(result["error"] is not None for result in results)
+        return results
@@ -1,9 +1,26 @@
+"""Tesseract OCR integration."""
+
+import asyncio
+import functools
+import hashlib
+import io
+import multiprocessing
+import os
+import pickle
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
 try:
-    from PIL import Image
+    from PIL import Image, UnidentifiedImageError
 except ImportError:
     import Image
+    UnidentifiedImageError = OSError
 import pytesseract
 
+from sdamgia.transport import _SingleFlight
+
 
 def img_to_str(src: str, path_to_tesseract: str) -> str:
     """Extract text from image via Tesseract OCR.
@@ -17,3 +34,226 @@ def img_to_str(src: str, path_to_tesseract: str) -> str:
     """
     pytesseract.pytesseract.tesseract_cmd = path_to_tesseract
     return pytesseract.image_to_string(Image.open(src), lang='rus+eng')
+
+
+def _preprocess_image(
+    image: "Image.Image",
+    grayscale: bool,
+    binarize_threshold: int | None,
+    max_side: int | None,
+) -> "Image.Image":
+    """Downscale and convert image before OCR.
+
+    Args:
+        image: Source image.
+        grayscale: Convert image to grayscale.
+        binarize_threshold: Gray level (0-255) splitting black and white, or None.
+        max_side: Longest allowed image side in pixels, or None.
+
+    Returns:
+        Prepared image.
+    """
+    if max_side is not None and max(image.size) > max_side:
+        image.thumbnail((max_side, max_side))
+    if grayscale or binarize_threshold is not None:
+        image = image.convert("L")
+    if binarize_threshold is not None:
+        image = image.point(lambda level: 255 if level >= binarize_threshold else 0)
+    return image
+
+
+def _recognize_image_bytes(
+    image_bytes: bytes,
+    path_to_tesseract: str,
+    grayscale: bool,
+    binarize_threshold: int | None,
+    max_side: int | None,
+) -> str:
+    """Extract text from encoded image; runs in OCR worker.
+
+    Args:
+        image_bytes: Encoded image file content.
+        path_to_tesseract: Path to Tesseract executable.
+        grayscale: Convert image to grayscale.
+        binarize_threshold: Gray level (0-255) splitting black and white, or None.
+        max_side: Longest allowed image side in pixels, or None.
+
+    Returns:
+        Recognized text in Russian and English modes.
+    """
+    if pytesseract.pytesseract.tesseract_cmd != path_to_tesseract:
+        pytesseract.pytesseract.tesseract_cmd = path_to_tesseract
+    image = _preprocess_image(
+        Image.open(io.BytesIO(image_bytes)),
+        grayscale,
+        binarize_threshold,
+        max_side,
+    )
+    return pytesseract.image_to_string(image, lang='rus+eng')
+
+
+class _UnpicklableOcrError(Exception):
+    """Picklable stand-in for worker exception that cannot cross process boundary."""
+
+    def __init__(self, error_type: str, message: str) -> None:
+        """Remember original exception type and message.
+
+        Args:
+            error_type: Qualified class name of original exception.
+            message: Text of original exception.
+
+        Returns:
+            None.
+        """
+        super().__init__(error_type, message)
+        self.error_type = error_type
+        self.message = message
+
+    def restore(self) -> Exception:
+        """Rebuild original exception where possible.
+
+        Args:
+            None.
+
+        Returns:
+            TesseractNotFoundError for missing Tesseract, otherwise RuntimeError with original text.
+        """
+        if self.error_type == "pytesseract.pytesseract.TesseractNotFoundError":
+            return pytesseract.TesseractNotFoundError()
+        return RuntimeError(f"{self.error_type}: {self.message}")
+
+
+def _recognize_in_worker(
+    image_bytes: bytes,
+    path_to_tesseract: str,
+    grayscale: bool,
+    binarize_threshold: int | None,
+    max_side: int | None,
+) -> str:
+    """Run _recognize_image_bytes in worker process, keeping its exception picklable.
+
+    Args:
+        image_bytes: Encoded image file content.
+        path_to_tesseract: Path to Tesseract executable.
+        grayscale: Convert image to grayscale.
+        binarize_threshold: Gray level (0-255) splitting black and white, or None.
+        max_side: Longest allowed image side in pixels, or None.
+
+    Returns:
+        Recognized text in Russian and English modes.
+    """
+    try:
+        return _recognize_image_bytes(image_bytes, path_to_tesseract, grayscale, binarize_threshold, max_side)
+    except (
+        pytesseract.TesseractError,
+        pytesseract.TesseractNotFoundError,
+        UnidentifiedImageError,
+        OSError,
+    ) as error:
+        try:
+            pickle.loads(pickle.dumps(error))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            error_type = f"{type(error).__module__}.{type(error).__qualname__}"
+            raise _UnpicklableOcrError(error_type, str(error)) from None
+        raise
+
+
+class OcrEngine:
+    """Tesseract OCR runner with image-content cache and optional worker process pool."""
+
+    def __init__(
+        self,
+        workers: int | None = 0,
+        grayscale: bool = False,
+        binarize_threshold: int | None = None,
+        max_side: int | None = None,
+        cache_size: int = 256,
+    ) -> None:
+        """Initialize OCR settings; worker pool, if enabled, starts on first recognition.
+
+        Args:
+            workers: Worker processes; 0 runs OCR in a thread, None uses CPU count. Workers
+                re-import the main module, so the calling script needs an
+                ``if __name__ == "__main__":`` guard.
+            grayscale: Convert images to grayscale before OCR.
+            binarize_threshold: Gray level (0-255) for black and white conversion, or None.
+            max_side: Downscale images whose longest side exceeds this many pixels.
+            cache_size: Number of recognized images kept by content hash; 0 disables cache.
+
+        Returns:
+            None.
+        """
+        if workers is not None and workers < 0:
+            raise ValueError("workers must be >= 0")
+        self._workers = (os.cpu_count() or 1) if workers is None else workers
+        self._grayscale = grayscale
+        self._binarize_threshold = binarize_threshold
+        self._max_side = max_side
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._single_flight = _SingleFlight()
+        self._executor: ProcessPoolExecutor | None = None
+
+    async def recognize(self, path: str, path_to_tesseract: str) -> str:
+        """Extract text from image file, reusing result for identical image content.
+
+        Args:
+            path: Path to image file.
+            path_to_tesseract: Path to Tesseract executable.
+
+        Returns:
+            Recognized text in Russian and English modes.
+        """
+        image_bytes = await asyncio.to_thread(Path(path).read_bytes)
+        image_hash = hashlib.sha256(image_bytes).hexdigest()
+
+        text = self._cache.get(image_hash)
+        if text is not None:
+            self._cache.move_to_end(image_hash)
+            return text
+
+        text = await self._single_flight.run(
+            image_hash,
+            lambda: self._run_ocr(image_bytes, path_to_tesseract),
+        )
+        if self._cache_size > 0:
+            self._cache[image_hash] = text
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return text
+
+    def close(self) -> None:
+        """Stop worker processes.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run_ocr(self, image_bytes: bytes, path_to_tesseract: str) -> str:
+        arguments = (image_bytes, path_to_tesseract, self._grayscale, self._binarize_threshold, self._max_side)
+        if self._workers == 0:
+            return await asyncio.to_thread(_recognize_image_bytes, *arguments)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        executor = self._executor
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor,
+                functools.partial(_recognize_in_worker, *arguments),
+            )
+        except _UnpicklableOcrError as error:
+            raise error.restore() from None
+        except BrokenProcessPool:
+            if self._executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            raise
@@ -0,0 +1,338 @@
+"""Metrics hooks and in-process Prometheus collector."""
+
+from __future__ import annotations
+
+import threading
+from urllib.parse import urlparse
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class MetricsHooks:
+    """No-op metrics interface; subclass and override methods to receive client events."""
+
+    def observe_request(self, endpoint: str, status: int, seconds: float, response_bytes: int) -> None:
+        """Record one HTTP exchange, including retried attempts.
+
+        Args:
+            endpoint: URL path, for example ``/problem``.
+            status: HTTP status code.
+            seconds: Time from sending request to reading full body.
+            response_bytes: Response body size.
+
+        Returns:
+            None.
+        """
+
+    def observe_wait(self, endpoint: str, reason: str, seconds: float) -> None:
+        """Record time a request spent waiting before being sent.
+
+        Args:
+            endpoint: URL path.
+            reason: ``scheduler`` for host slot/rate limit wait, ``retry_backoff`` for retry delay.
+            seconds: Wait duration.
+
+        Returns:
+            None.
+        """
+
+    def observe_retry(self, endpoint: str, error: str) -> None:
+        """Record retry scheduled after failed attempt.
+
+        Args:
+            endpoint: URL path.
+            error: Error class name of failed attempt.
+
+        Returns:
+            None.
+        """
+
+    def observe_error(self, endpoint: str, error: str) -> None:
+        """Record request that failed after all retries.
+
+        Args:
+            endpoint: URL path.
+            error: Error class name.
+
+        Returns:
+            None.
+        """
+
+    def observe_parse(self, kind: str, seconds: float) -> None:
+        """Record page parsing time.
+
+        Args:
+            kind: ``problem``, ``problem_ids`` or ``catalog``.
+            seconds: Parsing duration.
+
+        Returns:
+            None.
+        """
+
+    def observe_render(self, backend: str, seconds: float) -> None:
+        """Record problem rendering time, excluding render cache hits.
+
+        Args:
+            backend: Image backend name.
+            seconds: Rendering duration.
+
+        Returns:
+            None.
+        """
+
+    def observe_cache(self, cache: str, result: str) -> None:
+        """Record cache lookup outcome.
+
+        Args:
+            cache: ``response``, ``catalog`` or ``render``.
+            result: ``hit``, ``miss`` or ``revalidated``.
+
+        Returns:
+            None.
+        """
+
+
+class _Histogram:
+    """Cumulative bucket counts with sum per label set."""
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        """Initialize empty histogram.
+
+        Args:
+            buckets: Sorted upper bounds.
+
+        Returns:
+            None.
+        """
+        self.buckets = buckets
+        self.series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        """Add one observation.
+
+        Args:
+            labels: Label values.
+            value: Observed value.
+
+        Returns:
+            None.
+        """
+        counts = self.series.setdefault(labels, [0.0] * (len(self.buckets) + 2))
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+        counts[-2] += 1
+        counts[-1] += value
+
+
+class PrometheusMetrics(MetricsHooks):
+    """In-process metrics collector rendering Prometheus text exposition format."""
+
+    def __init__(self, namespace: str = "sdamgia") -> None:
+        """Initialize empty metrics.
+
+        Args:
+            namespace: Prefix of metric names.
+
+        Returns:
+            None.
+        """
+        self._namespace = namespace
+        self._lock = threading.Lock()
+        self._histograms: dict[str, tuple[str, tuple[str, ...], _Histogram]] = {
+            "request_duration_seconds": (
+                "HTTP request latency.",
+                ("endpoint",),
+                _Histogram(_LATENCY_BUCKETS),
+            ),
+            "response_size_bytes": ("HTTP response body size.", ("endpoint",), _Histogram(_SIZE_BUCKETS)),
+            "wait_seconds": (
+                "Time requests waited before sending.",
+                ("endpoint", "reason"),
+                _Histogram(_LATENCY_BUCKETS),
+            ),
+            "parse_duration_seconds": ("Page parsing time.", ("kind",), _Histogram(_LATENCY_BUCKETS)),
+            "render_duration_seconds": (
+                "Problem rendering time.",
+                ("backend",),
+                _Histogram(_LATENCY_BUCKETS),
+            ),
+        }
+        self._counters: dict[str, tuple[str, tuple[str, ...], dict[tuple[str, ...], float]]] = {
+            "requests_total": ("HTTP responses by status.", ("endpoint", "status"), {}),
+            "retries_total": ("Retried request attempts.", ("endpoint", "error"), {}),
+            "errors_total": ("Requests failed after retries.", ("endpoint", "error"), {}),
+            "cache_lookups_total": ("Cache lookups by result.", ("cache", "result"), {}),
+        }
+
+    def observe_request(self, endpoint: str, status: int, seconds: float, response_bytes: int) -> None:
+        """Record one HTTP exchange, including retried attempts.
+
+        Args:
+            endpoint: URL path, for example ``/problem``.
+            status: HTTP status code.
+            seconds: Time from sending request to reading full body.
+            response_bytes: Response body size.
+
+        Returns:
+            None.
+        """
+        self._observe("request_duration_seconds", (endpoint,), seconds)
+        self._observe("response_size_bytes", (endpoint,), response_bytes)
+        self._increment("requests_total", (endpoint, str(status)))
+
+    def observe_wait(self, endpoint: str, reason: str, seconds: float) -> None:
+        """Record time a request spent waiting before being sent.
+
+        Args:
+            endpoint: URL path.
+            reason: ``scheduler`` or ``retry_backoff``.
+            seconds: Wait duration.
+
+        Returns:
+            None.
+        """
+        self._observe("wait_seconds", (endpoint, reason), seconds)
+
+    def observe_retry(self, endpoint: str, error: str) -> None:
+        """Record retry scheduled after failed attempt.
+
+        Args:
+            endpoint: URL path.
+            error: Error class name of failed attempt.
+
+        Returns:
+            None.
+        """
+        self._increment("retries_total", (endpoint, error))
+
+    def observe_error(self, endpoint: str, error: str) -> None:
+        """Record request that failed after all retries.
+
+        Args:
+            endpoint: URL path.
+            error: Error class name.
+
+        Returns:
+            None.
+        """
+        self._increment("errors_total", (endpoint, error))
+
+    def observe_parse(self, kind: str, seconds: float) -> None:
+        """Record page parsing time.
+
+        Args:
+            kind: ``problem``, ``problem_ids`` or ``catalog``.
+            seconds: Parsing duration.
+
+        Returns:
+            None.
+        """
+        self._observe("parse_duration_seconds", (kind,), seconds)
+
+    def observe_render(self, backend: str, seconds: float) -> None:
+        """Record problem rendering time, excluding render cache hits.
+
+        Args:
+            backend: Image backend name.
+            seconds: Rendering duration.
+
+        Returns:
+            None.
+        """
+        self._observe("render_duration_seconds", (backend,), seconds)
+
+    def observe_cache(self, cache: str, result: str) -> None:
+        """Record cache lookup outcome.
+
+        Args:
+            cache: ``response``, ``catalog`` or ``render``.
+            result: ``hit``, ``miss`` or ``revalidated``.
+
+        Returns:
+            None.
+        """
+        self._increment("cache_lookups_total", (cache, result))
+
+    def cache_hit_ratio(self, cache: str) -> float:
+        """Compute share of lookups served without a full download or render.
+
+        Args:
+            cache: ``response``, ``catalog`` or ``render``.
+
+        Returns:
+            Ratio of hit and revalidated lookups to all lookups; zero without lookups.
+        """
+        with self._lock:
+            lookups = {
+                result: count
+                for (cache_name, result), count in self._counters["cache_lookups_total"][2].items()
+                if cache_name == cache
+            }
+        total = sum(lookups.values())
+        if total == 0:
+            return 0.0
+        return (lookups.get("hit", 0.0) + lookups.get("revalidated", 0.0)) / total
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format.
+
+        Args:
+            None.
+
+        Returns:
+            Metrics text ending with newline.
+        """
+        lines: list[str] = []
+        with self._lock:
+            for name, (help_text, label_names, values) in self._counters.items():
+                full_name = f"{self._namespace}_{name}"
+                lines.append(f"# HELP {full_name} {help_text}")
+                lines.append(f"# TYPE {full_name} counter")
+                for labels, value in sorted(values.items()):
+                    lines.append(f"{full_name}{_format_labels(label_names, labels)} {_format_value(value)}")
+
+            for name, (help_text, label_names, histogram) in self._histograms.items():
+                full_name = f"{self._namespace}_{name}"
+                lines.append(f"# HELP {full_name} {help_text}")
+                lines.append(f"# TYPE {full_name} histogram")
+                for labels, counts in sorted(histogram.series.items()):
+                    for bound, count in zip((*histogram.buckets, float("inf")), counts[:-1]):
+                        bucket_labels = _format_labels((*label_names, "le"), (*labels, _format_value(bound)))
+                        lines.append(f"{full_name}_bucket{bucket_labels} {_format_value(count)}")
+                    series_labels = _format_labels(label_names, labels)
+                    lines.append(f"{full_name}_sum{series_labels} {_format_value(counts[-1])}")
+                    lines.append(f"{full_name}_count{series_labels} {_format_value(counts[-2])}")
+        return "\n".join(lines) + "\n"
+
+    def _observe(self, name: str, labels: tuple[str, ...], value: float) -> None:
+        with self._lock:
+            self._histograms[name][2].observe(labels, value)
+
+    def _increment(self, name: str, labels: tuple[str, ...]) -> None:
+        with self._lock:
+            values = self._counters[name][2]
+            values[labels] = values.get(labels, 0.0) + 1
+
+
+def _metrics_endpoint(url: str) -> str:
+    """Reduce request URL to low-cardinality endpoint label."""
+    return urlparse(url).path or "/"
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    """Format label set as Prometheus selector."""
+    escaped = (
+        value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for value in values
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Format sample value, using integer notation when exact."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
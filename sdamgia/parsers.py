@@ -2,7 +2,20 @@
 
 from __future__ import annotations
 
-from bs4 import BeautifulSoup, Tag
+from typing import Any
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+_HTML_PARSER_BACKENDS = ("html.parser", "lxml", "selectolax")
+_TEXTLESS_TAGS = ["script", "style", "template", "rt", "rp"]
+_PROBLEM_BLOCK_STRAINER = SoupStrainer("div", {"class": "prob_maindiv"})
+_PROBLEM_IDS_STRAINER = SoupStrainer("span", {"class": "prob_nums"})
+_CATALOG_STRAINER = SoupStrainer("div", {"class": "cat_category"})
+_MALFORMED_MARKUP_ERRORS = (AttributeError, IndexError, KeyError, TypeError, ValueError)
+
+
+class ProblemParseError(ValueError):
+    """Problem page has a problem block that does not have the expected structure."""
 
 
 class _ProblemParser:
@@ -19,6 +32,13 @@ class _ProblemParser:
     @staticmethod
     def parse_problem(prob_block: Tag, problem_id: str, problem_url: str) -> dict[str, object]:
         """Parse a problem page block into API payload format."""
+        try:
+            return _ProblemParser._problem_payload(prob_block, problem_id, problem_url)
+        except _MALFORMED_MARKUP_ERRORS as error:
+            raise ProblemParseError(f"Malformed problem {problem_id} at {problem_url}") from error
+
+    @staticmethod
+    def _problem_payload(prob_block: Tag, problem_id: str, problem_url: str) -> dict[str, object]:
         topic_id = " ".join(
             prob_block.find("span", {"class": "prob_nums"}).text.split()[1:][:-2]
         )
@@ -105,3 +125,175 @@ class _CatalogParser:
 def _extract_problem_ids(soup: BeautifulSoup) -> list[str]:
     """Extract problem IDs from search-like pages."""
     return [item.text.split()[-1] for item in soup.find_all("span", {"class": "prob_nums"})]
+
+
+class _Bs4HtmlBackend:
+    """Parse sdamgia pages with a BeautifulSoup tree builder."""
+
+    def __init__(self, features: str = "html.parser") -> None:
+        """Initialize backend and check that tree builder is installed."""
+        BeautifulSoup("", features)
+        self._features = features
+
+    def soup(self, markup: bytes, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+        """Build document tree, optionally keeping only elements matched by strainer."""
+        return BeautifulSoup(markup, self._features, parse_only=parse_only)
+
+    def problem_block(self, markup: bytes) -> Tag | None:
+        """Find problem block on problem page."""
+        return self.soup(markup, _PROBLEM_BLOCK_STRAINER).find("div", {"class": "prob_maindiv"})
+
+    def parse_problem_page(
+        self,
+        markup: bytes,
+        problem_id: str,
+        problem_url: str,
+        subject_base_url: str,
+    ) -> dict[str, object] | None:
+        """Parse problem page into API payload format."""
+        prob_block = self.problem_block(markup)
+        if prob_block is None:
+            return None
+        _ProblemParser.normalize_images(prob_block, subject_base_url)
+        return _ProblemParser.parse_problem(prob_block, problem_id, problem_url)
+
+    def parse_catalog_page(self, markup: bytes) -> list[dict[str, object]]:
+        """Parse catalog page into API payload format."""
+        return _CatalogParser.parse(self.soup(markup, _CATALOG_STRAINER))
+
+    def extract_problem_ids(self, markup: bytes) -> list[str]:
+        """Extract problem IDs from search-like page."""
+        return _extract_problem_ids(self.soup(markup, _PROBLEM_IDS_STRAINER))
+
+
+class _SelectolaxHtmlBackend:
+    """Parse sdamgia pages with selectolax (lexbor) producing bs4-identical payloads."""
+
+    def __init__(self) -> None:
+        """Initialize backend; requires the selectolax package."""
+        from selectolax.lexbor import LexborHTMLParser
+
+        self._parser_class = LexborHTMLParser
+        self._block_backend = _Bs4HtmlBackend()
+
+    def problem_block(self, markup: bytes) -> Tag | None:
+        """Find problem block as bs4 tag for image rendering."""
+        return self._block_backend.problem_block(markup)
+
+    def parse_problem_page(
+        self,
+        markup: bytes,
+        problem_id: str,
+        problem_url: str,
+        subject_base_url: str,
+    ) -> dict[str, object] | None:
+        """Parse problem page into API payload format."""
+        prob_block = self._tree(markup).css_first("div.prob_maindiv")
+        if prob_block is None:
+            return None
+        try:
+            return self._problem_payload(prob_block, problem_id, problem_url, subject_base_url)
+        except _MALFORMED_MARKUP_ERRORS as error:
+            raise ProblemParseError(f"Malformed problem {problem_id} at {problem_url}") from error
+
+    def _problem_payload(
+        self,
+        prob_block: Any,
+        problem_id: str,
+        problem_url: str,
+        subject_base_url: str,
+    ) -> dict[str, object]:
+        def image_sources(block: Any) -> list[str]:
+            sources = []
+            for image in block.css("img"):
+                src = image.attributes.get("src") or ""
+                sources.append(src if "sdamgia.ru" in src else f"{subject_base_url}{src}")
+            return sources
+
+        topic_id = " ".join(prob_block.css_first("span.prob_nums").text().split()[1:][:-2])
+        condition: dict[str, object] = {}
+        solution: dict[str, object] = {}
+        answer = ""
+        analogs: list[str] = []
+
+        pbody_blocks = prob_block.css("div.pbody")
+        if len(pbody_blocks) > 0:
+            condition = {"text": pbody_blocks[0].text(), "images": image_sources(pbody_blocks[0])}
+        if len(pbody_blocks) > 1:
+            solution = {"text": pbody_blocks[1].text(), "images": image_sources(pbody_blocks[1])}
+
+        answer_block = prob_block.css_first("div.answer")
+        if answer_block is not None:
+            answer = answer_block.text().replace("Ответ: ", "")
+
+        analogs_block = prob_block.css_first("div.minor")
+        if analogs_block is not None:
+            analogs = [link.text() for link in analogs_block.css("a")]
+            if "Все" in analogs:
+                analogs.remove("Все")
+
+        return {
+            "id": problem_id,
+            "topic": topic_id,
+            "condition": condition,
+            "solution": solution,
+            "answer": answer,
+            "analogs": analogs,
+            "url": problem_url,
+        }
+
+    def parse_catalog_page(self, markup: bytes) -> list[dict[str, object]]:
+        """Parse catalog page into API payload format."""
+        topic_blocks = [
+            block
+            for block in self._tree(markup).css("div.cat_category")
+            if "data-id" not in block.attributes
+        ]
+
+        catalog: list[dict[str, object]] = []
+        for topic_block in topic_blocks[1:]:
+            topic_name_raw = topic_block.css_first("b.cat_name").text()
+            topic_id, topic_name = topic_name_raw.split(". ", maxsplit=1)
+
+            if topic_id.startswith(" "):
+                topic_id = topic_id[2:]
+            if topic_id.startswith("Задания "):
+                topic_id = topic_id.replace("Задания ", "")
+
+            children = topic_block.css_first("div.cat_children")
+            categories = [
+                {
+                    "category_id": category.attributes["data-id"],
+                    "category_name": category.css_first("a.cat_name").text(),
+                }
+                for category in children.css("div.cat_category")
+            ]
+            catalog.append(
+                {
+                    "topic_id": topic_id,
+                    "topic_name": topic_name,
+                    "categories": categories,
+                }
+            )
+
+        return catalog
+
+    def extract_problem_ids(self, markup: bytes) -> list[str]:
+        """Extract problem IDs from search-like page."""
+        return [item.text().split()[-1] for item in self._tree(markup).css("span.prob_nums")]
+
+    def _tree(self, markup: bytes) -> Any:
+        tree = self._parser_class(markup)
+        tree.strip_tags(_TEXTLESS_TAGS)
+        return tree
+
+
+def _create_html_backend(html_parser: str) -> _Bs4HtmlBackend | _SelectolaxHtmlBackend:
+    """Create page parsing backend by name."""
+    if html_parser not in _HTML_PARSER_BACKENDS:
+        raise ValueError(
+            f"Unsupported html_parser {html_parser!r}; expected one of {', '.join(_HTML_PARSER_BACKENDS)}"
+        )
+    if html_parser == "selectolax":
+        return _SelectolaxHtmlBackend()
+    return _Bs4HtmlBackend(html_parser)
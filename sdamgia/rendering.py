@@ -3,109 +3,306 @@
 from __future__ import annotations
 
 import asyncio
-import os
-from os import remove
+import contextlib
+import hashlib
+import io
+import tempfile
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+from typing import Any
 
 from bs4 import Tag
 
+from sdamgia.cache import _RenderCache
+from sdamgia.metrics import MetricsHooks
+from sdamgia.transport import _SingleFlight
+
+_RENDERERS = ("pyppeteer", "grabzit", "html2img")
+
+_WAIT_FOR_IMAGES_SCRIPT = """
+Promise.all(Array.from(document.images, image => image.complete ? null : new Promise(resolve => {
+  image.onload = image.onerror = resolve;
+})))
+"""
+
+
+class _BrowserPool:
+    """Long-lived headless browser with fixed number of reusable pages."""
+
+    def __init__(
+        self,
+        pages: int = 2,
+        launch_options: dict[str, Any] | None = None,
+        launcher: Callable[..., Awaitable[Any]] | None = None,
+        health_check_timeout_seconds: float = 5.0,
+    ) -> None:
+        """Initialize pool settings; browser starts on first page request.
+
+        Args:
+            pages: Number of pages rendering concurrently.
+            launch_options: Keyword options passed to pyppeteer launch.
+            launcher: Async browser factory, pyppeteer launch by default.
+            health_check_timeout_seconds: Time limit for page liveness probe.
+
+        Returns:
+            None.
+        """
+        if pages < 1:
+            raise ValueError("browser_pages must be >= 1")
+        self._size = pages
+        self._launch_options = dict(launch_options or {})
+        self._launcher = launcher
+        self._health_check_timeout_seconds = health_check_timeout_seconds
+        self._browser: Any = None
+        self._idle: asyncio.Queue[tuple[int, Any]] | None = None
+        self._lock = asyncio.Lock()
+        self._generation = 0
+
+    @contextlib.asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """Borrow healthy page, waiting while all pages are busy.
+
+        Args:
+            None.
+
+        Returns:
+            Async context manager yielding pyppeteer page.
+        """
+        idle = await self._ensure_started()
+        generation, page = await idle.get()
+        try:
+            generation, page = await self._checked_page(generation, page)
+            yield page
+        except Exception:
+            await self._close_quietly(page)
+            generation, page = -1, None
+            raise
+        finally:
+            idle.put_nowait((generation, page))
+
+    async def close(self) -> None:
+        """Close browser and forget its pages.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        async with self._lock:
+            browser, self._browser, self._idle = self._browser, None, None
+            self._generation += 1
+            if browser is not None:
+                await self._close_quietly(browser)
+
+    async def _ensure_started(self) -> asyncio.Queue[tuple[int, Any]]:
+        async with self._lock:
+            if self._idle is None:
+                await self._launch()
+                self._idle = asyncio.Queue()
+                for _ in range(self._size):
+                    self._idle.put_nowait((-1, None))
+            return self._idle
+
+    async def _checked_page(self, generation: int, page: Any) -> tuple[int, Any]:
+        if page is not None and generation == self._generation and not page.isClosed():
+            try:
+                await asyncio.wait_for(page.evaluate("1"), self._health_check_timeout_seconds)
+                return generation, page
+            except Exception:
+                pass
+        if page is not None:
+            await self._close_quietly(page)
+
+        current_generation = self._generation
+        try:
+            return current_generation, await self._browser.newPage()
+        except Exception:
+            await self._restart(current_generation)
+            return self._generation, await self._browser.newPage()
+
+    async def _restart(self, failed_generation: int) -> None:
+        async with self._lock:
+            if failed_generation != self._generation or self._idle is None:
+                return
+            if self._browser is not None:
+                await self._close_quietly(self._browser)
+            await self._launch()
+
+    async def _launch(self) -> None:
+        launcher = self._launcher
+        if launcher is None:
+            from pyppeteer import launch as launcher
+
+        self._browser = await launcher(**self._launch_options)
+        self._generation += 1
+
+    @staticmethod
+    async def _close_quietly(target: Any) -> None:
+        if target is None:
+            return
+        with contextlib.suppress(Exception):
+            await target.close()
+
 
 class _ProblemImageRenderer:
-    """Render problem HTML block to image with selected backend."""
+    """Render problem HTML block to PNG with selected backend and cache the result."""
+
+    def __init__(
+        self,
+        browser_pool: _BrowserPool,
+        cache: _RenderCache | None = None,
+        metrics: MetricsHooks | None = None,
+    ) -> None:
+        """Initialize renderer.
+
+        Args:
+            browser_pool: Shared browser used by pyppeteer backend.
+            cache: Rendered image cache; None disables caching.
+            metrics: Receiver of render timing and render cache events.
+
+        Returns:
+            None.
+        """
+        self._browser_pool = browser_pool
+        self._cache = cache
+        self._metrics = metrics or MetricsHooks()
+        self._single_flight = _SingleFlight()
 
     async def render(
         self,
         *,
         prob_block: Tag,
         renderer: str,
-        problem_id: str,
-        path_to_img: str | None,
-        path_to_tmp_html: str,
         html2img_chrome_path: str,
         grabzit_auth: dict[str, str],
-    ) -> None:
-        """Render HTML block to image with given backend.
+    ) -> bytes:
+        """Render HTML block to PNG, reusing image rendered from identical markup.
 
         Args:
             prob_block: Parsed task block from sdamgia page.
             renderer: Backend name: pyppeteer, grabzit, or html2img.
-            problem_id: Task identifier used for temp file naming.
-            path_to_img: Result image path.
-            path_to_tmp_html: Temp html directory for pyppeteer backend.
             html2img_chrome_path: Browser path for html2img backend.
             grabzit_auth: GrabzIT credentials.
 
         Returns:
-            None.
+            Encoded PNG image.
         """
-        if renderer == "pyppeteer":
-            await self._render_with_pyppeteer(prob_block, problem_id, path_to_img, path_to_tmp_html)
-            return
-        if renderer == "grabzit":
-            await asyncio.to_thread(
-                self._render_with_grabzit,
-                prob_block,
-                path_to_img,
-                grabzit_auth,
-            )
-            return
-        if renderer == "html2img":
-            await asyncio.to_thread(
-                self._render_with_html2img,
-                prob_block,
-                path_to_img,
-                html2img_chrome_path,
-            )
+        if renderer not in _RENDERERS:
+            raise ValueError(f"Unsupported img backend: {renderer}")
 
-    @staticmethod
-    async def _render_with_pyppeteer(
-        prob_block: Tag,
-        problem_id: str,
-        path_to_img: str | None,
-        path_to_tmp_html: str,
-    ) -> None:
-        from pyppeteer import launch
+        markup = str(prob_block)
+        key = hashlib.sha256(f"{renderer}\0{markup}".encode()).hexdigest()
+        if self._cache is not None:
+            image = await asyncio.to_thread(self._cache.get, key)
+            self._metrics.observe_cache("render", "miss" if image is None else "hit")
+            if image is not None:
+                return image
 
-        tmp_html_path = os.path.abspath(f"{path_to_tmp_html}{problem_id}.html")
-        with open(tmp_html_path, "w", encoding="utf-8") as html_file:
-            html_file.write(str(prob_block))
+        return await self._single_flight.run(
+            key,
+            lambda: self._render_and_store(key, markup, renderer, html2img_chrome_path, grabzit_auth),
+        )
 
-        try:
-            browser = await launch()
-            page = await browser.newPage()
-            await page.goto("file:" + tmp_html_path)
-            await page.screenshot({"path": path_to_img, "fullPage": "true"})
-            await browser.close()
-        finally:
-            remove(tmp_html_path)
+    async def aclose(self) -> None:
+        """Close shared browser.
 
-    @staticmethod
-    def _render_with_grabzit(
-        prob_block: Tag,
-        path_to_img: str | None,
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        await self._browser_pool.close()
+
+    async def _render_and_store(
+        self,
+        key: str,
+        markup: str,
+        renderer: str,
+        html2img_chrome_path: str,
         grabzit_auth: dict[str, str],
-    ) -> None:
+    ) -> bytes:
+        started_at = time.monotonic()
+        if renderer == "pyppeteer":
+            image = await self._render_with_pyppeteer(markup)
+        elif renderer == "grabzit":
+            image = await asyncio.to_thread(self._render_with_grabzit, markup, grabzit_auth)
+        else:
+            image = await asyncio.to_thread(self._render_with_html2img, markup, html2img_chrome_path)
+        self._metrics.observe_render(renderer, time.monotonic() - started_at)
+        if self._cache is not None:
+            await asyncio.to_thread(self._cache.put, key, image)
+        return image
+
+    async def _render_with_pyppeteer(self, markup: str) -> bytes:
+        async with self._browser_pool.page() as page:
+            await page.setContent(markup)
+            await page.evaluate(_WAIT_FOR_IMAGES_SCRIPT)
+            return await page.screenshot({"fullPage": True})
+
+    @staticmethod
+    def _render_with_grabzit(markup: str, grabzit_auth: dict[str, str]) -> bytes:
         from GrabzIt import GrabzItClient, GrabzItImageOptions
 
         grabzit = GrabzItClient.GrabzItClient(grabzit_auth["AppKey"], grabzit_auth["AppSecret"])
         options = GrabzItImageOptions.GrabzItImageOptions()
         options.browserWidth = 800
         options.browserHeight = -1
-        grabzit.HTMLToImage(str(prob_block), options=options)
-        grabzit.SaveTo(path_to_img)
+        options.format = "png"
+        grabzit.HTMLToImage(markup, options=options)
+        return grabzit.SaveTo()
 
     @staticmethod
-    def _render_with_html2img(
-        prob_block: Tag,
-        path_to_img: str | None,
-        html2img_chrome_path: str,
-    ) -> None:
+    def _render_with_html2img(markup: str, html2img_chrome_path: str) -> bytes:
         from html2image import Html2Image
 
-        if html2img_chrome_path == "chrome":
-            html2image = Html2Image()
-        else:
-            html2image = Html2Image(
-                chrome_path=html2img_chrome_path,
-                custom_flags=["--no-sandbox"],
-            )
-        html2image.screenshot(html_str=str(prob_block), save_as=path_to_img)
+        with tempfile.TemporaryDirectory() as output_path:
+            if html2img_chrome_path == "chrome":
+                html2image = Html2Image(output_path=output_path)
+            else:
+                html2image = Html2Image(
+                    chrome_path=html2img_chrome_path,
+                    custom_flags=["--no-sandbox"],
+                    output_path=output_path,
+                )
+            html2image.screenshot(html_str=markup, save_as="problem.png")
+            return (Path(output_path) / "problem.png").read_bytes()
+
+
+def _stitch_sheet(images: list[bytes], columns: int, padding: int = 16) -> bytes:
+    """Arrange encoded images into grid on white PNG sheet.
+
+    Args:
+        images: Encoded images in sheet order.
+        columns: Number of images per row.
+        padding: Gap between images and around sheet in pixels.
+
+    Returns:
+        Encoded PNG sheet.
+    """
+    from PIL import Image
+
+    tiles = [Image.open(io.BytesIO(image)).convert("RGB") for image in images]
+    rows = [tiles[start : start + columns] for start in range(0, len(tiles), columns)]
+    column_widths = [
+        max(row[column].width for row in rows if column < len(row))
+        for column in range(min(columns, len(tiles)))
+    ]
+    row_heights = [max(tile.height for tile in row) for row in rows]
+
+    sheet_width = sum(column_widths) + padding * (len(column_widths) + 1)
+    sheet_height = sum(row_heights) + padding * (len(rows) + 1)
+    sheet = Image.new("RGB", (sheet_width, sheet_height), "white")
+    top = padding
+    for row, row_height in zip(rows, row_heights):
+        left = padding
+        for tile, column_width in zip(row, column_widths):
+            sheet.paste(tile, (left, top))
+            left += column_width + padding
+        top += row_height + padding
+
+    output = io.BytesIO()
+    sheet.save(output, format="PNG")
+    return output.getvalue()
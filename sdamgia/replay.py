@@ -0,0 +1,176 @@
+"""Record and replay HTTP exchanges through httpx transports."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import random
+import zipfile
+from collections import defaultdict, deque
+from pathlib import Path
+
+import httpx
+
+_CASSETTE_VERSION = 1
+_CASSETTE_INDEX = "cassette.json"
+_CASSETTE_MODES = ("record", "replay")
+
+
+class CassetteMissError(httpx.RequestError):
+    """Raised in replay mode for a request that has no recorded response."""
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Transport forwarding requests to network and saving every exchange to a cassette."""
+
+    def __init__(self, path: str, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        """Initialize recorder; cassette is written on close.
+
+        Args:
+            path: Cassette archive path; existing file is overwritten.
+            transport: Transport performing real requests; None uses httpx default.
+
+        Returns:
+            None.
+        """
+        self._path = Path(path)
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self._interactions: list[dict[str, object]] = []
+        self._bodies: dict[str, bytes] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send request and record response with its raw (still encoded) body.
+
+        Args:
+            request: Outgoing request.
+
+        Returns:
+            Response with fully read body.
+        """
+        response = await self._transport.handle_async_request(request)
+        try:
+            body = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+
+        body_hash = hashlib.sha256(body).hexdigest()
+        self._bodies[body_hash] = body
+        self._interactions.append(
+            {
+                "method": request.method,
+                "url": str(request.url),
+                "status": response.status_code,
+                "headers": [[name, value] for name, value in response.headers.multi_items()],
+                "body": body_hash,
+            }
+        )
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            content=body,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    def save(self) -> None:
+        """Write recorded exchanges to cassette archive.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(self._path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(
+                _CASSETTE_INDEX,
+                json.dumps(
+                    {"version": _CASSETTE_VERSION, "interactions": self._interactions},
+                    ensure_ascii=False,
+                ),
+            )
+            for body_hash, body in self._bodies.items():
+                archive.writestr(f"bodies/{body_hash}", body)
+
+    async def aclose(self) -> None:
+        """Save cassette and close wrapped transport.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        await asyncio.to_thread(self.save)
+        await self._transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Transport answering requests from a cassette held in memory, without network."""
+
+    def __init__(
+        self,
+        path: str,
+        latency_seconds: float = 0.0,
+        latency_jitter_seconds: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """Load cassette archive.
+
+        Args:
+            path: Cassette archive written by RecordingTransport.
+            latency_seconds: Synthetic delay before every response.
+            latency_jitter_seconds: Upper bound of extra uniformly random delay.
+            seed: Seed of latency jitter.
+
+        Returns:
+            None.
+        """
+        if latency_seconds < 0 or latency_jitter_seconds < 0:
+            raise ValueError("latency must be >= 0")
+        self._latency_seconds = latency_seconds
+        self._latency_jitter_seconds = latency_jitter_seconds
+        self._random = random.Random(seed)
+        self._responses: dict[tuple[str, str], deque[tuple[int, list[tuple[str, str]], bytes]]] = (
+            defaultdict(deque)
+        )
+        with zipfile.ZipFile(path) as archive:
+            index = json.loads(archive.read(_CASSETTE_INDEX))
+            if index.get("version") != _CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version: {index.get('version')!r}")
+            bodies: dict[str, bytes] = {}
+            for interaction in index["interactions"]:
+                body_hash = interaction["body"]
+                if body_hash not in bodies:
+                    bodies[body_hash] = archive.read(f"bodies/{body_hash}")
+                self._responses[(interaction["method"], interaction["url"])].append(
+                    (
+                        interaction["status"],
+                        [(name, value) for name, value in interaction["headers"]],
+                        bodies[body_hash],
+                    )
+                )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Serve recorded response for request method and URL.
+
+        Repeated requests for the same URL get its recordings in order; the last one
+        keeps being served once all of them were used.
+
+        Args:
+            request: Outgoing request.
+
+        Returns:
+            Recorded response.
+        """
+        recordings = self._responses.get((request.method, str(request.url)))
+        if not recordings:
+            raise CassetteMissError(f"No recorded response for {request.method} {request.url}", request=request)
+        status, headers, body = recordings.popleft() if len(recordings) > 1 else recordings[0]
+
+        delay = self._latency_seconds + self._random.uniform(0.0, self._latency_jitter_seconds)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return httpx.Response(status, headers=headers, content=body, request=request)
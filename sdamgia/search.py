@@ -0,0 +1,185 @@
+"""Search query planning for OCR text and local full-text problem index."""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+
+_LOCAL_SEARCH_PAGE_SIZE = 50
+_WORD_PATTERN = re.compile(r"\w+")
+_TOKEN_EDGE_CHARACTERS = "\"'«»„“”()[]{}<>.,;:!?…*_|/\\~`^—–-"
+
+
+class _SearchQueryPlanner:
+    """Split OCR text into deduplicated search phrases over strided word windows."""
+
+    def __init__(self, window_size: int = 10, stride: int = 5, min_token_length: int = 2) -> None:
+        """Initialize planner settings.
+
+        Args:
+            window_size: Number of words in one search phrase.
+            stride: Step in words between neighbouring windows.
+            min_token_length: Shortest non-numeric word kept in phrases.
+
+        Returns:
+            None.
+        """
+        if window_size < 1:
+            raise ValueError("window_size must be >= 1")
+        if stride < 1:
+            raise ValueError("stride must be >= 1")
+        self._window_size = window_size
+        self._stride = stride
+        self._min_token_length = min_token_length
+
+    def plan(self, text: str) -> list[str]:
+        """Build search phrases from OCR text.
+
+        Args:
+            text: Raw recognized text.
+
+        Returns:
+            Unique search phrases in text order.
+        """
+        tokens = [token for token in map(self._clean_token, text.split()) if token]
+        if not tokens:
+            return []
+
+        last_start = max(0, len(tokens) - self._window_size)
+        starts = list(range(0, last_start + 1, self._stride))
+        if starts[-1] != last_start:
+            starts.append(last_start)
+
+        phrases: list[str] = []
+        seen_phrases: set[str] = set()
+        for start in starts:
+            phrase = " ".join(tokens[start : start + self._window_size])
+            phrase_key = phrase.casefold()
+            if phrase_key not in seen_phrases:
+                seen_phrases.add(phrase_key)
+                phrases.append(phrase)
+        return phrases
+
+    def _clean_token(self, raw_token: str) -> str:
+        token = raw_token.strip(_TOKEN_EDGE_CHARACTERS)
+        if token.isdigit():
+            return token
+        if len(token) < self._min_token_length:
+            return ""
+        alphanumeric_count = sum(character.isalnum() for character in token)
+        if alphanumeric_count * 2 < len(token):
+            return ""
+        return token
+
+
+class _LocalSearchIndex:
+    """SQLite FTS5 index over stemmed problem condition and solution text."""
+
+    def __init__(self, path: str = ":memory:") -> None:
+        """Open or create index database.
+
+        Args:
+            path: SQLite database file path; ``:memory:`` keeps index in memory.
+
+        Returns:
+            None.
+        """
+        import snowballstemmer
+
+        self._stemmer = snowballstemmer.stemmer("russian")
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS problem_index USING fts5(
+                    subject UNINDEXED,
+                    problem_id UNINDEXED,
+                    terms,
+                    tokenize = "unicode61 remove_diacritics 0"
+                )
+                """
+            )
+
+    def add(self, subject: str, problems: list[dict[str, object]]) -> None:
+        """Index parsed problems, replacing earlier versions with the same ID.
+
+        Args:
+            subject: Subject short code.
+            problems: Problem payloads returned by get_problem_by_id.
+
+        Returns:
+            None.
+        """
+        rows = [
+            (
+                subject,
+                str(problem["id"]),
+                " ".join(self._terms(self._problem_text(problem))),
+            )
+            for problem in problems
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM problem_index WHERE subject = ? AND problem_id = ?",
+                [(subject, problem_id) for subject, problem_id, _ in rows],
+            )
+            self._connection.executemany(
+                "INSERT INTO problem_index (subject, problem_id, terms) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def search(self, subject: str, query: str, limit: int, offset: int = 0) -> list[str]:
+        """Find problems containing every query word form, best matches first.
+
+        Args:
+            subject: Subject short code.
+            query: Search phrase.
+            limit: Maximum number of identifiers returned.
+            offset: Number of best matches skipped.
+
+        Returns:
+            List of problem identifiers ranked by BM25.
+        """
+        terms = self._terms(query)
+        if not terms:
+            return []
+
+        match = " ".join(f'"{term}"' for term in dict.fromkeys(terms))
+        with self._lock:
+            rows = self._connection.execute(
+                """
+                SELECT problem_id FROM problem_index
+                WHERE problem_index MATCH ? AND subject = ?
+                ORDER BY rank
+                LIMIT ? OFFSET ?
+                """,
+                (f"terms: ({match})", subject, limit, offset),
+            ).fetchall()
+        return [problem_id for (problem_id,) in rows]
+
+    def close(self) -> None:
+        """Close database connection.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def _terms(self, text: str) -> list[str]:
+        words = _WORD_PATTERN.findall(text.casefold().replace("ё", "е"))
+        return self._stemmer.stemWords(words)
+
+    @staticmethod
+    def _problem_text(problem: dict[str, object]) -> str:
+        parts = [str(problem.get("topic") or "")]
+        for section in ("condition", "solution"):
+            content = problem.get(section)
+            if isinstance(content, dict):
+                parts.append(str(content.get("text") or ""))
+        return "\n".join(parts)
@@ -0,0 +1,500 @@
+"""HTTP transport primitives shared by client requests."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, TypeVar
+
+import httpx
+
+_T = TypeVar("_T")
+
+_THROTTLE_STATUS_CODES = frozenset({429, 503, 504})
+_RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+_UNAVAILABLE_STATUS_CODES = frozenset({502, 503, 504})
+_LATENCY_TOLERANCE = 2.0
+_LATENCY_SMOOTHING = 0.2
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse Retry-After header given as seconds or HTTP date.
+
+    Args:
+        value: Raw header value.
+
+    Returns:
+        Non-negative delay in seconds, or None if header is missing or malformed.
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class _SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key."""
+
+    def __init__(self) -> None:
+        """Initialize empty registry of in-flight calls.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        self._calls: dict[Hashable, asyncio.Task[Any]] = {}
+        self._waiters: dict[Hashable, int] = {}
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[_T]]) -> _T:
+        """Await in-flight call for key or start a new one.
+
+        Args:
+            key: Identity of the call, for example request URL.
+            call: Zero-argument async function started when no call is in flight.
+
+        Returns:
+            Result shared by all concurrent callers.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            self._waiters[key] = 0
+
+            def forget(done: asyncio.Task[Any]) -> None:
+                if self._calls.get(key) is done:
+                    del self._calls[key]
+                    del self._waiters[key]
+                if not done.cancelled():
+                    done.exception()
+
+            task.add_done_callback(forget)
+
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._calls.get(key) is task and self._waiters[key] == 1:
+                del self._calls[key]
+                del self._waiters[key]
+                task.cancel()
+            raise
+        finally:
+            if self._calls.get(key) is task:
+                self._waiters[key] -= 1
+
+
+class CircuitOpenError(httpx.RequestError):
+    """Request rejected without sending because host circuit breaker is open."""
+
+
+class RetryPolicy:
+    """Retry schedule with exponential backoff, full jitter and Retry-After support."""
+
+    def __init__(
+        self,
+        retries: int = 2,
+        base_delay_seconds: float = 1.0,
+        max_delay_seconds: float = 30.0,
+        retryable_status_codes: frozenset[int] = _RETRYABLE_STATUS_CODES,
+        jitter: bool = True,
+    ) -> None:
+        """Initialize retry policy.
+
+        Args:
+            retries: Number of retry attempts after the first request.
+            base_delay_seconds: Backoff before first retry, doubled for each next retry.
+            max_delay_seconds: Upper bound for one backoff and for honored Retry-After.
+            retryable_status_codes: HTTP statuses worth retrying.
+            jitter: Sleep a uniformly random time up to backoff (full jitter).
+
+        Returns:
+            None.
+        """
+        if retries < 0:
+            raise ValueError("retries must be >= 0")
+        self.retries = retries
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.retryable_status_codes = retryable_status_codes
+        self.jitter = jitter
+
+    def is_retryable(self, error: httpx.HTTPError) -> bool:
+        """Classify request failure as transient.
+
+        Args:
+            error: Failure of one request attempt.
+
+        Returns:
+            True for transport errors and retryable HTTP statuses.
+        """
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in self.retryable_status_codes
+        return isinstance(error, httpx.TransportError)
+
+    def retry_delay(self, attempt: int, error: httpx.HTTPError) -> float | None:
+        """Compute sleep before next attempt.
+
+        Args:
+            attempt: Zero-based number of the failed attempt.
+            error: Failure of that attempt.
+
+        Returns:
+            Delay in seconds, or None when request must not be retried.
+        """
+        if attempt >= self.retries or not self.is_retryable(error):
+            return None
+
+        backoff = min(self.max_delay_seconds, self.base_delay_seconds * 2**attempt)
+        delay = random.uniform(0.0, backoff) if self.jitter else backoff
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = _parse_retry_after(error.response.headers.get("retry-after"))
+            if retry_after is not None:
+                if retry_after > self.max_delay_seconds:
+                    return None
+                delay = max(delay, retry_after)
+        return delay
+
+
+class _HostCircuit:
+    """Circuit breaker state of one host."""
+
+    def __init__(self) -> None:
+        """Initialize closed circuit.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probing = False
+
+
+class _CircuitBreaker:
+    """Per-host circuit breaker failing fast while a host is down."""
+
+    def __init__(self, failure_threshold: int, recovery_seconds: float) -> None:
+        """Initialize breaker settings.
+
+        Args:
+            failure_threshold: Consecutive failures that open host circuit.
+            recovery_seconds: Time before open circuit lets one probe request through.
+
+        Returns:
+            None.
+        """
+        if failure_threshold < 1:
+            raise ValueError("circuit_breaker_failure_threshold must be >= 1")
+        self._failure_threshold = failure_threshold
+        self._recovery_seconds = recovery_seconds
+        self._circuits: dict[str, _HostCircuit] = {}
+
+    def before_request(self, url: str) -> bool:
+        """Reject request while host circuit is open; admit one half-open probe.
+
+        Args:
+            url: Absolute request URL.
+
+        Returns:
+            True if request is the half-open probe, False for a closed circuit.
+        """
+        circuit = self._circuit(url)
+        if circuit.opened_at is None:
+            return False
+        if not circuit.probing and time.monotonic() - circuit.opened_at >= self._recovery_seconds:
+            circuit.probing = True
+            return True
+        raise CircuitOpenError(
+            f"Circuit breaker is open for host {httpx.URL(url).host}",
+            request=httpx.Request("GET", url),
+        )
+
+    def record_success(self, url: str) -> None:
+        """Close host circuit after a response showing the host is available.
+
+        Args:
+            url: Absolute request URL.
+
+        Returns:
+            None.
+        """
+        circuit = self._circuit(url)
+        circuit.failures = 0
+        circuit.opened_at = None
+        circuit.probing = False
+
+    def record_failure(self, url: str) -> None:
+        """Count host failure and open circuit at threshold or after failed probe.
+
+        Args:
+            url: Absolute request URL.
+
+        Returns:
+            None.
+        """
+        circuit = self._circuit(url)
+        circuit.failures += 1
+        if circuit.probing or circuit.failures >= self._failure_threshold:
+            circuit.opened_at = time.monotonic()
+        circuit.probing = False
+
+    def release_probe(self, url: str) -> None:
+        """Let another probe through after the probe ended without a host verdict.
+
+        Args:
+            url: Absolute request URL.
+
+        Returns:
+            None.
+        """
+        self._circuit(url).probing = False
+
+    def _circuit(self, url: str) -> _HostCircuit:
+        host = httpx.URL(url).host
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = _HostCircuit()
+            self._circuits[host] = circuit
+        return circuit
+
+
+class _HostLimiter:
+    """Concurrency slots and token bucket for one host."""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_second: float | None,
+        adaptive: bool = False,
+    ) -> None:
+        """Initialize limiter with empty queue.
+
+        Args:
+            max_concurrency: Maximum number of in-flight requests.
+            requests_per_second: Token refill rate, or None for no rate limit.
+            adaptive: Start from one slot and adjust limit with AIMD up to max_concurrency.
+
+        Returns:
+            None.
+        """
+        self.limit = 1 if adaptive else max_concurrency
+        self.in_flight = 0
+        self.queued = 0
+        self.requests = 0
+        self.throttled = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._adaptive = adaptive
+        self._max_limit = max_concurrency
+        self._successes_since_change = 0
+        self._baseline_latency: float | None = None
+        self._smoothed_latency: float | None = None
+        self._decreased_at = 0.0
+        self._paused_until = 0.0
+        self._condition = asyncio.Condition()
+        self._rate = requests_per_second
+        self._burst = max(1.0, requests_per_second or 1.0)
+        self._tokens = self._burst
+        self._refilled_at = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Wait for free concurrency slot and rate token.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        started_at = time.monotonic()
+        self.queued += 1
+        try:
+            async with self._condition:
+                await self._condition.wait_for(lambda: self.in_flight < self.limit)
+                self.in_flight += 1
+            try:
+                delay = max(self._reserve_token(), self._paused_until - time.monotonic())
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            except BaseException:
+                await self.release()
+                raise
+        finally:
+            self.queued -= 1
+
+        waited = time.monotonic() - started_at
+        self.requests += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    async def release(self) -> None:
+        """Free concurrency slot and wake next queued request.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    async def observe(
+        self,
+        latency_seconds: float,
+        throttled: bool,
+        retry_after_seconds: float | None = None,
+    ) -> None:
+        """Adjust adaptive limit after a finished request.
+
+        Args:
+            latency_seconds: Time from sending request to receiving response or timeout.
+            throttled: Request ended with 429/503/504 or timeout.
+            retry_after_seconds: Server-requested pause before next request.
+
+        Returns:
+            None.
+        """
+        if throttled:
+            self.throttled += 1
+        if not self._adaptive:
+            return
+
+        now = time.monotonic()
+        if throttled:
+            if retry_after_seconds is not None:
+                self._paused_until = max(self._paused_until, now + retry_after_seconds)
+            if now - self._decreased_at >= (self._smoothed_latency or 0.0):
+                self.limit = max(1, math.floor(self.limit / 2))
+                self._decreased_at = now
+            self._successes_since_change = 0
+            return
+
+        if self._baseline_latency is None or latency_seconds < self._baseline_latency:
+            self._baseline_latency = latency_seconds
+        if self._smoothed_latency is None:
+            self._smoothed_latency = latency_seconds
+        else:
+            self._smoothed_latency += _LATENCY_SMOOTHING * (latency_seconds - self._smoothed_latency)
+
+        self._successes_since_change += 1
+        if self._successes_since_change < self.limit or self.limit >= self._max_limit:
+            return
+        self._successes_since_change = 0
+        if self._smoothed_latency <= self._baseline_latency * _LATENCY_TOLERANCE:
+            self.limit += 1
+            async with self._condition:
+                self._condition.notify()
+
+    def _reserve_token(self) -> float:
+        if self._rate is None:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._refilled_at) * self._rate)
+        self._refilled_at = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self._rate
+
+
+class _RequestScheduler:
+    """Per-host request scheduler shared by every HTTP call of the client."""
+
+    def __init__(
+        self,
+        max_concurrency_per_host: int,
+        requests_per_second_per_host: float | None,
+        adaptive_concurrency: bool = False,
+    ) -> None:
+        """Initialize scheduler settings.
+
+        Args:
+            max_concurrency_per_host: Maximum in-flight requests to one host.
+            requests_per_second_per_host: Request rate per host, or None for no rate limit.
+            adaptive_concurrency: Adjust per-host limit by latency and throttling responses.
+
+        Returns:
+            None.
+        """
+        if max_concurrency_per_host < 1:
+            raise ValueError("max_concurrency_per_host must be >= 1")
+        if requests_per_second_per_host is not None and requests_per_second_per_host <= 0:
+            raise ValueError("max_requests_per_second_per_host must be > 0")
+        self._max_concurrency_per_host = max_concurrency_per_host
+        self._requests_per_second_per_host = requests_per_second_per_host
+        self._adaptive_concurrency = adaptive_concurrency
+        self._limiters: dict[str, _HostLimiter] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[_HostLimiter]:
+        """Hold one request slot for URL host.
+
+        Args:
+            url: Absolute request URL.
+
+        Returns:
+            Async context manager yielding host limiter and releasing slot on exit.
+        """
+        limiter = self._limiter(httpx.URL(url).host)
+        await limiter.acquire()
+        try:
+            yield limiter
+        finally:
+            await limiter.release()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Build queue depth and wait-time statistics per host.
+
+        Args:
+            None.
+
+        Returns:
+            Mapping of host to its scheduler counters.
+        """
+        return {
+            host: {
+                "limit": limiter.limit,
+                "in_flight": limiter.in_flight,
+                "queued": limiter.queued,
+                "requests": limiter.requests,
+                "throttled": limiter.throttled,
+                "wait_seconds_total": limiter.wait_seconds_total,
+                "wait_seconds_max": limiter.wait_seconds_max,
+                "wait_seconds_avg": (
+                    limiter.wait_seconds_total / limiter.requests if limiter.requests else 0.0
+                ),
+            }
+            for host, limiter in self._limiters.items()
+        }
+
+    def _limiter(self, host: str) -> _HostLimiter:
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = _HostLimiter(
+                self._max_concurrency_per_host,
+                self._requests_per_second_per_host,
+                self._adaptive_concurrency,
+            )
+            self._limiters[host] = limiter
+        return limiter
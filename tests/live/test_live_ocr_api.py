@@ -1,7 +1,6 @@
 import pytest
 
-import sdamgia.images as images_module
-from sdamgia import SdamGIA
+from sdamgia import OcrEngine, SdamGIA
 
 pytestmark = [pytest.mark.live]
 
@@ -12,11 +11,10 @@ async def test_search_by_img_returns_problem_ids_with_mocked_ocr(
     known_subject: str,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    monkeypatch.setattr(
-        images_module,
-        "img_to_str",
-        lambda *_args, **_kwargs: "На экзамен вынесено 60 вопросов Андрей не выучил 3 из них",
-    )
+    async def fake_recognize(*_args: object) -> str:
+        return "На экзамен вынесено 60 вопросов Андрей не выучил 3 из них"
+
+    monkeypatch.setattr(OcrEngine, "recognize", fake_recognize)
     result = await api.search_by_img(known_subject, "unused-path.png")
 
     assert isinstance(result, list)
@@ -0,0 +1,128 @@
+import asyncio
+import io
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+
+import httpx
+import pytest
+import pytest_asyncio
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+from sdamgia import SdamGIA
+
+FIXTURES_DIR = Path(__file__).resolve().parents[1] / "fixtures" / "html"
+
+
+class FakePage:
+    def __init__(self, browser: "FakeBrowser") -> None:
+        self.browser = browser
+        self.closed = False
+        self.healthy = True
+        self.contents: list[str] = []
+
+    def isClosed(self) -> bool:
+        return self.closed
+
+    async def evaluate(self, _script: str) -> int:
+        if not self.healthy or not self.browser.alive:
+            raise RuntimeError("page crashed")
+        return 1
+
+    async def setContent(self, html: str) -> None:
+        self.contents.append(html)
+
+    async def screenshot(self, _options: dict[str, object]) -> bytes:
+        self.browser.active += 1
+        self.browser.max_active = max(self.browser.max_active, self.browser.active)
+        if self.browser.screenshot_barrier is not None:
+            await asyncio.wait_for(self.browser.screenshot_barrier.wait(), timeout=1.0)
+        await asyncio.sleep(0.01)
+        self.browser.active -= 1
+        metadata = PngInfo()
+        metadata.add_text("content", self.contents[-1])
+        output = io.BytesIO()
+        Image.new("RGB", (40, 10 + len(self.browser.screenshots)), "gray").save(
+            output,
+            format="PNG",
+            pnginfo=metadata,
+        )
+        image = output.getvalue()
+        self.browser.screenshots.append(image)
+        return image
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, screenshot_barrier: asyncio.Barrier | None = None) -> None:
+        self.screenshot_barrier = screenshot_barrier
+        self.alive = True
+        self.closed = False
+        self.pages: list[FakePage] = []
+        self.screenshots: list[object] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def newPage(self) -> FakePage:
+        if not self.alive:
+            raise RuntimeError("browser disconnected")
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeLauncher:
+    def __init__(self) -> None:
+        self.browsers: list[FakeBrowser] = []
+        self.screenshot_barrier: asyncio.Barrier | None = None
+
+    async def __call__(self, **_options: object) -> FakeBrowser:
+        browser = FakeBrowser(self.screenshot_barrier)
+        self.browsers.append(browser)
+        return browser
+
+
+@pytest.fixture(scope="session")
+def fixture_html() -> Callable[[str], bytes]:
+    def read(name: str) -> bytes:
+        return (FIXTURES_DIR / name).read_bytes()
+
+    return read
+
+
+@pytest_asyncio.fixture
+async def api() -> AsyncIterator[SdamGIA]:
+    client = SdamGIA()
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+def fake_browser_launcher() -> FakeLauncher:
+    return FakeLauncher()
+
+
+@pytest_asyncio.fixture
+async def make_offline_api() -> AsyncIterator[Callable[..., SdamGIA]]:
+    clients: list[SdamGIA] = []
+
+    def factory(handler: Callable[[httpx.Request], httpx.Response], **kwargs: object) -> SdamGIA:
+        client = SdamGIA(
+            **{
+                "retries": 0,
+                "retry_base_delay_seconds": 0.0,
+                "transport": httpx.MockTransport(handler),
+                **kwargs,
+            }
+        )
+        clients.append(client)
+        return client
+
+    yield factory
+    for client in clients:
+        await client.aclose()
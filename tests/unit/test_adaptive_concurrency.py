@@ -0,0 +1,110 @@
+import asyncio
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from sdamgia import SdamGIA
+from sdamgia.transport import _parse_retry_after
+
+
+class ThrottlingStandInServer:
+    def __init__(self, capacity: int, latency_seconds: float = 0.002) -> None:
+        self.capacity = capacity
+        self.latency_seconds = latency_seconds
+        self.active = 0
+        self.served = 0
+        self.throttled = 0
+
+    async def __call__(self, _request: httpx.Request) -> httpx.Response:
+        self.active += 1
+        try:
+            if self.active > self.capacity:
+                self.throttled += 1
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            await asyncio.sleep(self.latency_seconds)
+            self.served += 1
+            return httpx.Response(200, text="<html></html>")
+        finally:
+            self.active -= 1
+
+
+async def _run_searches(api: SdamGIA, count: int) -> None:
+    await asyncio.gather(*(api.search("math", str(index)) for index in range(count)))
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_grows_while_latency_is_flat(
+    make_offline_api: Callable[..., SdamGIA],
+) -> None:
+    server = ThrottlingStandInServer(capacity=100, latency_seconds=0.01)
+    api = make_offline_api(server, adaptive_concurrency=True, max_concurrency_per_host=8)
+
+    await _run_searches(api, 200)
+
+    assert api.get_scheduler_stats()["math-ege.sdamgia.ru"]["limit"] == 8
+    assert server.throttled == 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_backs_off_on_throttling(
+    make_offline_api: Callable[..., SdamGIA],
+) -> None:
+    server = ThrottlingStandInServer(capacity=4)
+    api = make_offline_api(
+        server,
+        adaptive_concurrency=True,
+        max_concurrency_per_host=32,
+        retries=20,
+    )
+
+    await _run_searches(api, 400)
+
+    stats = api.get_scheduler_stats()["math-ege.sdamgia.ru"]
+    assert server.served == 400
+    assert stats["throttled"] == server.throttled
+    assert stats["limit"] <= 8
+    assert server.throttled < 100
+
+
+@pytest.mark.asyncio
+async def test_static_concurrency_keeps_configured_limit(
+    make_offline_api: Callable[..., SdamGIA],
+) -> None:
+    server = ThrottlingStandInServer(capacity=4)
+    api = make_offline_api(server, max_concurrency_per_host=32)
+
+    await asyncio.gather(*(api.search("math", str(index)) for index in range(100)), return_exceptions=True)
+
+    assert api.get_scheduler_stats()["math-ege.sdamgia.ru"]["limit"] == 32
+    assert server.throttled > 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_honors_retry_after(
+    make_offline_api: Callable[..., SdamGIA],
+) -> None:
+    request_times: list[float] = []
+    loop = asyncio.get_running_loop()
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        request_times.append(loop.time())
+        if len(request_times) == 1:
+            return httpx.Response(503, headers={"Retry-After": "1"})
+        return httpx.Response(200, text="<html></html>")
+
+    api = make_offline_api(handler, adaptive_concurrency=True)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await api.search("math", "first")
+    await api.search("math", "second")
+
+    assert request_times[1] - request_times[0] >= 0.9
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(None, None), ("3", 3.0), ("soon", None), ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0)],
+)
+def test_parse_retry_after(value: str | None, expected: float | None) -> None:
+    assert _parse_retry_after(value) == expected
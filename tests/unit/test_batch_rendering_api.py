@@ -0,0 +1,109 @@
+import asyncio
+import io
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+import pytest
+from PIL import Image
+
+from sdamgia import SdamGIA
+from sdamgia.cache import _RenderCache
+from sdamgia.rendering import _BrowserPool, _ProblemImageRenderer
+
+
+def _batch_api(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    launcher: Any,
+    requests: list[str],
+) -> SdamGIA:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        problem_id = request.url.params["id"]
+        requests.append(problem_id)
+        await asyncio.sleep(0.01)
+        if problem_id == "500":
+            return httpx.Response(500)
+        if problem_id == "404":
+            return httpx.Response(200, content=fixture_html("problem_missing.html"))
+        return httpx.Response(200, content=fixture_html(f"problem_{problem_id}.html"))
+
+    api = make_offline_api(handler)
+    api._renderer = _ProblemImageRenderer(_BrowserPool(pages=2, launcher=launcher), _RenderCache(0))
+    return api
+
+
+@pytest.mark.asyncio
+async def test_render_problems_uses_one_browser_and_keeps_input_order(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    fake_browser_launcher: Any,
+) -> None:
+    requests: list[str] = []
+    api = _batch_api(make_offline_api, fixture_html, fake_browser_launcher, requests)
+    fake_browser_launcher.screenshot_barrier = asyncio.Barrier(2)
+
+    result = await api.render_problems("math", ["2002", "1001", "2002", "1001"])
+
+    items = result["items"]
+    assert [item["id"] for item in items] == ["2002", "1001", "2002", "1001"]
+    assert all(item["error"] is None and item["image"] for item in items)
+    assert items[0]["problem"]["id"] == "2002"
+    assert all(item["fetch_seconds"] > 0 and item["render_seconds"] > 0 for item in items)
+    assert result["sheet"] is None
+    assert result["total_seconds"] > 0
+    assert len(fake_browser_launcher.browsers) == 1
+    assert fake_browser_launcher.browsers[0].max_active == 2
+
+
+@pytest.mark.asyncio
+async def test_render_problems_reports_failures_per_item(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    fake_browser_launcher: Any,
+) -> None:
+    api = _batch_api(make_offline_api, fixture_html, fake_browser_launcher, [])
+
+    result = await api.render_problems("math", ["1001", "500", "404"])
+
+    ok, failed, missing = result["items"]
+    assert ok["image"] is not None
+    assert isinstance(failed["error"], httpx.HTTPStatusError)
+    assert failed["image"] is None
+    assert missing["error"] is None
+    assert missing["problem"] is None
+    assert missing["image"] is None
+
+
+@pytest.mark.asyncio
+async def test_render_problems_stitches_sheet_grid(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    fake_browser_launcher: Any,
+) -> None:
+    api = _batch_api(make_offline_api, fixture_html, fake_browser_launcher, [])
+
+    result = await api.render_problems("math", ["1001", "2002", "1001"], sheet=True, sheet_columns=2)
+
+    heights = [Image.open(io.BytesIO(item["image"])).height for item in result["items"]]
+    sheet = Image.open(io.BytesIO(result["sheet"]))
+    assert sheet.width == 40 * 2 + 16 * 3
+    assert sheet.height == max(heights[:2]) + heights[2] + 16 * 3
+
+
+@pytest.mark.asyncio
+async def test_render_problems_validates_arguments(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    fake_browser_launcher: Any,
+) -> None:
+    requests: list[str] = []
+    api = _batch_api(make_offline_api, fixture_html, fake_browser_launcher, requests)
+
+    with pytest.raises(ValueError):
+        await api.render_problems("math", ["1001"], concurrency=0)
+    with pytest.raises(ValueError):
+        await api.render_problems("math", ["1001"], sheet_columns=0)
+    with pytest.raises(ValueError):
+        await api.render_problems("math", ["1001"], img="unknown")
+    assert requests == []
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from benchmarks.run import compare, run_suite
+
+
+@pytest.mark.asyncio
+async def test_benchmark_suite_reports_parse_and_method_metrics() -> None:
+    results = await run_suite(
+        requests=6,
+        concurrency=3,
+        parse_seconds=0.01,
+        methods=["get_problem_by_id", "get_catalog"],
+    )
+
+    assert json.loads(json.dumps(results)) == results
+    assert results["parse"]["html.parser"]["problem"]["pages_per_second"] > 0
+    problem_run = results["methods"]["get_problem_by_id"]
+    assert problem_run["errors"] == 0
+    assert problem_run["server_requests"] == 12
+    assert problem_run["requests_per_second"] > 0
+    assert problem_run["p50_ms"] <= problem_run["p99_ms"]
+    assert problem_run["peak_memory_bytes"] > 0
+    assert any(line.startswith("get_catalog.requests_per_second") for line in compare(results, results))
+
+
+@pytest.mark.asyncio
+async def test_benchmark_server_injects_errors() -> None:
+    results = await run_suite(
+        requests=4,
+        concurrency=2,
+        error_rate=1.0,
+        parse_seconds=0,
+        methods=["search"],
+        trace_memory=False,
+    )
+
+    search_run = results["methods"]["search"]
+    assert search_run["errors"] == search_run["injected_errors"] == 4
+    assert results["parse"] == {}
@@ -0,0 +1,115 @@
+import asyncio
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from sdamgia import SdamGIA
+from sdamgia.rendering import _BrowserPool, _ProblemImageRenderer
+
+
+@pytest.mark.asyncio
+async def test_renders_reuse_one_browser_and_pages(fake_browser_launcher: Any) -> None:
+    launcher = fake_browser_launcher
+    pool = _BrowserPool(pages=2, launcher=launcher)
+
+    for _ in range(5):
+        async with pool.page() as page:
+            await page.setContent("<p>task</p>")
+
+    assert len(launcher.browsers) == 1
+    assert len(launcher.browsers[0].pages) == 2
+    assert sum(len(page.contents) for page in launcher.browsers[0].pages) == 5
+
+
+@pytest.mark.asyncio
+async def test_concurrent_renders_are_bounded_by_page_count(fake_browser_launcher: Any) -> None:
+    launcher = fake_browser_launcher
+    pool = _BrowserPool(pages=3, launcher=launcher)
+
+    async def render(index: int) -> None:
+        async with pool.page() as page:
+            await page.setContent(f"<p>{index}</p>")
+            await page.screenshot({"fullPage": True})
+
+    await asyncio.gather(*(render(index) for index in range(10)))
+
+    browser = launcher.browsers[0]
+    assert len(browser.screenshots) == 10
+    assert browser.max_active == 3
+    assert len(browser.pages) == 3
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_page_is_replaced(fake_browser_launcher: Any) -> None:
+    launcher = fake_browser_launcher
+    pool = _BrowserPool(pages=1, launcher=launcher)
+    async with pool.page() as page:
+        first_page = page
+    first_page.healthy = False
+
+    async with pool.page() as page:
+        second_page = page
+
+    assert second_page is not first_page
+    assert first_page.closed
+    assert len(launcher.browsers) == 1
+
+
+@pytest.mark.asyncio
+async def test_crashed_browser_is_restarted(fake_browser_launcher: Any) -> None:
+    launcher = fake_browser_launcher
+    pool = _BrowserPool(pages=1, launcher=launcher)
+    async with pool.page():
+        pass
+    launcher.browsers[0].alive = False
+
+    async with pool.page() as page:
+        assert page.browser is launcher.browsers[1]
+
+    assert len(launcher.browsers) == 2
+    assert launcher.browsers[0].closed
+
+
+@pytest.mark.asyncio
+async def test_page_failing_during_render_is_discarded(fake_browser_launcher: Any) -> None:
+    launcher = fake_browser_launcher
+    pool = _BrowserPool(pages=1, launcher=launcher)
+
+    with pytest.raises(RuntimeError):
+        async with pool.page() as page:
+            failed_page = page
+            raise RuntimeError("render failed")
+    async with pool.page() as page:
+        assert page is not failed_page
+
+    assert failed_page.closed
+
+
+@pytest.mark.asyncio
+async def test_client_renders_problem_with_content_and_closes_browser(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    fake_browser_launcher: Any,
+    tmp_path: Path,
+) -> None:
+    launcher = fake_browser_launcher
+    api = make_offline_api(lambda _request: httpx.Response(200, content=fixture_html("problem_1001.html")))
+    api._renderer = _ProblemImageRenderer(_BrowserPool(pages=2, launcher=launcher))
+    image_path = tmp_path / "task.png"
+
+    problem = await api.get_problem_by_id("math", "1001", img="pyppeteer", path_to_img=str(image_path))
+    await api.aclose()
+
+    browser = launcher.browsers[0]
+    assert problem is not None
+    assert browser.pages[0].contents[0].startswith("<div")
+    assert image_path.read_bytes() == browser.screenshots[0]
+    assert browser.closed
+
+
+def test_page_count_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        SdamGIA(browser_pages=0)
@@ -0,0 +1,146 @@
+import asyncio
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from sdamgia import ProblemParseError, SdamGIA
+from sdamgia.parsers import _ProblemParser
+
+
+def _problem_handler(
+    fixture_html: Callable[[str], bytes],
+    requested_ids: list[str],
+) -> Callable[[httpx.Request], httpx.Response]:
+    template = fixture_html("problem_1001.html").decode("utf-8")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        problem_id = request.url.params["id"]
+        requested_ids.append(problem_id)
+        if problem_id == "500":
+            return httpx.Response(500)
+        if problem_id == "404":
+            return httpx.Response(200, text="<html><body>Задание не найдено</body></html>")
+        return httpx.Response(200, text=template.replace("1001", problem_id))
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_get_problems_by_ids_streams_all_problems(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    api = make_offline_api(_problem_handler(fixture_html, []))
+    ids = [str(problem_id) for problem_id in range(2000, 2050)]
+
+    results = [result async for result in api.get_problems_by_ids("math", ids, concurrency=8)]
+
+    assert sorted(result["id"] for result in results) == ids
+    assert all(result["error"] is None for result in results)
+    assert all(result["problem"]["id"] == result["id"] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_get_problems_by_ids_ordered_keeps_input_order(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    api = make_offline_api(_problem_handler(fixture_html, []))
+    ids = ["2003", "2001", "2002", "2005", "2004"]
+
+    results = [
+        result async for result in api.get_problems_by_ids("math", ids, concurrency=3, ordered=True)
+    ]
+
+    assert [result["id"] for result in results] == ids
+
+
+@pytest.mark.asyncio
+async def test_get_problems_by_ids_reports_failures_per_id(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    api = make_offline_api(_problem_handler(fixture_html, []))
+
+    results = {
+        result["id"]: result
+        async for result in api.get_problems_by_ids("math", ["2001", "500", "404"], ordered=True)
+    }
+
+    assert results["2001"]["problem"] is not None
+    assert isinstance(results["500"]["error"], httpx.HTTPStatusError)
+    assert results["500"]["problem"] is None
+    assert results["404"]["problem"] is None
+    assert results["404"]["error"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_problems_by_ids_reports_parser_failures_per_id(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    problem_handler = _problem_handler(fixture_html, [])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params["id"] == "2003":
+            return httpx.Response(200, text='<div class="prob_maindiv"><div class="pbody">?</div></div>')
+        return problem_handler(request)
+
+    problem_payload = _ProblemParser._problem_payload
+
+    def failing_problem_payload(prob_block: object, problem_id: str, problem_url: str) -> dict[str, object]:
+        if problem_id == "2002":
+            raise KeyError("src")
+        return problem_payload(prob_block, problem_id, problem_url)
+
+    monkeypatch.setattr(_ProblemParser, "_problem_payload", staticmethod(failing_problem_payload))
+    api = make_offline_api(handler)
+
+    results = {
+        result["id"]: result
+        async for result in api.get_problems_by_ids("math", ["2001", "2002", "2003", "2004"], concurrency=4)
+    }
+
+    assert results["2001"]["error"] is None and results["2004"]["error"] is None
+    assert isinstance(results["2002"]["error"], ProblemParseError)
+    assert isinstance(results["2002"]["error"].__cause__, KeyError)
+    assert isinstance(results["2003"]["error"], ProblemParseError)
+    assert results["2003"]["problem"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_problems_by_ids_limits_concurrency(
+    api: SdamGIA,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    active = 0
+    peak = 0
+
+    async def fake_get_problem_by_id(_subject: str, id: str) -> dict[str, object]:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.001)
+        active -= 1
+        return {"id": id}
+
+    monkeypatch.setattr(api, "get_problem_by_id", fake_get_problem_by_id)
+
+    results = [
+        result
+        async for result in api.get_problems_by_ids(
+            "math", (str(problem_id) for problem_id in range(100)), concurrency=4
+        )
+    ]
+
+    assert len(results) == 100
+    assert peak == 4
+
+
+@pytest.mark.asyncio
+async def test_get_problems_by_ids_invalid_concurrency_raises_value_error(api: SdamGIA) -> None:
+    with pytest.raises(ValueError, match="concurrency must be >= 1"):
+        async for _ in api.get_problems_by_ids("math", ["1001"], concurrency=0):
+            pass
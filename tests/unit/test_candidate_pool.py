@@ -0,0 +1,137 @@
+import asyncio
+from collections.abc import Callable
+from pathlib import Path
+
+import httpx
+import pytest
+
+from sdamgia import SdamGIA
+from sdamgia.cache import _CandidatePool
+
+
+class FakeTopicSite:
+    def __init__(self, pages: dict[int, list[str]]) -> None:
+        self.pages = pages
+        self.page_requests: list[int] = []
+
+    async def get_catalog(self, _subject: str) -> list[dict[str, object]]:
+        return [
+            {
+                "topic_id": "1",
+                "topic_name": "Task 1",
+                "categories": [{"category_id": "cat-1", "category_name": "Category"}],
+            }
+        ]
+
+    async def get_category_by_id(self, _subject: str, _categoryid: str, page: int = 1) -> list[str]:
+        self.page_requests.append(page)
+        return self.pages.get(page, [])
+
+    async def get_problem_by_id(self, _subject: str, id: str) -> dict[str, object]:
+        return {"id": id}
+
+
+def _pooled_api(
+    make_offline_api: Callable[..., SdamGIA],
+    monkeypatch: pytest.MonkeyPatch,
+    site: FakeTopicSite,
+    **kwargs: object,
+) -> SdamGIA:
+    api = make_offline_api(lambda _request: httpx.Response(500), **kwargs)
+    monkeypatch.setattr(api, "get_catalog", site.get_catalog)
+    monkeypatch.setattr(api, "get_category_by_id", site.get_category_by_id)
+    monkeypatch.setattr(api, "get_problem_by_id", site.get_problem_by_id)
+    return api
+
+
+@pytest.mark.asyncio
+async def test_pooled_random_problems_skip_category_pages(
+    make_offline_api: Callable[..., SdamGIA],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    site = FakeTopicSite({1: ["1001", "1002"], 2: ["1003"], 3: ["1004"]})
+    api = _pooled_api(make_offline_api, monkeypatch, site)
+
+    first = await api.get_random_problem("math", "1", seed=5)
+    site.page_requests.clear()
+    results = [await api.get_random_problem("math", "1", seed=5) for _ in range(20)]
+
+    assert site.page_requests == []
+    assert all(result == first for result in results)
+
+
+@pytest.mark.asyncio
+async def test_stale_pool_is_served_and_refreshed_in_background(
+    make_offline_api: Callable[..., SdamGIA],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    site = FakeTopicSite({1: ["1001"], 2: ["1002"], 3: ["1003"]})
+    api = _pooled_api(make_offline_api, monkeypatch, site, candidate_pool_ttl_seconds=0.05)
+    await api.get_random_problem("math", "1", seed=1)
+    await asyncio.sleep(0.06)
+    site.page_requests.clear()
+
+    await api.get_random_problem("math", "1", seed=1)
+    await asyncio.sleep(0.01)
+
+    assert site.page_requests == [1]
+
+    site.pages[1] = ["1005", "1001"]
+    await asyncio.sleep(0.06)
+    site.page_requests.clear()
+    stale_ids = await api._topic_candidate_ids("math", "1", 3)
+    await asyncio.sleep(0.01)
+
+    assert "1005" not in stale_ids
+    assert sorted(site.page_requests) == [1, 1, 2, 3]
+    assert "1005" in await api._topic_candidate_ids("math", "1", 3)
+
+
+@pytest.mark.asyncio
+async def test_disk_pool_is_reused_by_new_client(
+    make_offline_api: Callable[..., SdamGIA],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    pool_path = str(tmp_path / "pools.sqlite3")
+    site = FakeTopicSite({1: ["1001", "1002"], 2: ["1003"]})
+    first_api = _pooled_api(make_offline_api, monkeypatch, site, candidate_pool_path=pool_path)
+    first = await first_api.get_random_problem("math", "1", seed=9)
+    await first_api.aclose()
+    site.page_requests.clear()
+
+    second_api = _pooled_api(make_offline_api, monkeypatch, site, candidate_pool_path=pool_path)
+
+    assert await second_api.get_random_problem("math", "1", seed=9) == first
+    assert site.page_requests == []
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_collects_candidates_on_every_call(
+    make_offline_api: Callable[..., SdamGIA],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    site = FakeTopicSite({1: ["1001"]})
+    api = _pooled_api(make_offline_api, monkeypatch, site, candidate_pool_ttl_seconds=0)
+
+    await api.get_random_problem("math", "1", seed=1)
+    await api.get_random_problem("math", "1", seed=1)
+
+    assert site.page_requests.count(1) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_calls_collect_pool_once() -> None:
+    pool = _CandidatePool(ttl_seconds=60.0)
+    loads: list[int] = []
+
+    async def load(pages: int) -> list[str]:
+        loads.append(pages)
+        await asyncio.sleep(0.01)
+        return ["1", "2"]
+
+    results = await asyncio.gather(*(pool.get(("math", "1", 3), load) for _ in range(5)))
+    pool.close()
+
+    assert loads == [3]
+    assert all(result == ["1", "2"] for result in results)
@@ -0,0 +1,100 @@
+import asyncio
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from sdamgia import SdamGIA
+
+
+def _catalog_handler(
+    fixture_html: Callable[[str], bytes],
+    requested_urls: list[str],
+) -> Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested_urls.append(str(request.url))
+        assert request.url.path == "/prob_catalog"
+        return httpx.Response(200, content=fixture_html("catalog.html"))
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_get_catalog_reuses_cached_catalog(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    requested_urls: list[str] = []
+    api = make_offline_api(_catalog_handler(fixture_html, requested_urls))
+
+    first = await api.get_catalog("math")
+    second = await api.get_catalog("math")
+
+    assert first == second
+    assert [topic["topic_id"] for topic in first] == ["1", "2", "3"]
+    assert requested_urls == ["https://math-ege.sdamgia.ru/prob_catalog"]
+
+
+@pytest.mark.asyncio
+async def test_get_catalog_concurrent_calls_share_one_download(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    requested_urls: list[str] = []
+    api = make_offline_api(_catalog_handler(fixture_html, requested_urls))
+
+    results = await asyncio.gather(*(api.get_catalog("math") for _ in range(5)))
+
+    assert all(result == results[0] for result in results)
+    assert len(requested_urls) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_catalog_returns_independent_copies(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    api = make_offline_api(_catalog_handler(fixture_html, []))
+
+    first = await api.get_catalog("math")
+    first.clear()
+
+    assert len(await api.get_catalog("math")) == 3
+
+
+@pytest.mark.asyncio
+async def test_invalidate_catalog_forces_new_download(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    requested_urls: list[str] = []
+    api = make_offline_api(_catalog_handler(fixture_html, requested_urls))
+
+    await api.get_catalog("math")
+    await api.get_catalog("phys")
+    api.invalidate_catalog("math")
+    await api.get_catalog("math")
+    await api.get_catalog("phys")
+    api.invalidate_catalog()
+    await api.get_catalog("phys")
+
+    assert requested_urls == [
+        "https://math-ege.sdamgia.ru/prob_catalog",
+        "https://phys-ege.sdamgia.ru/prob_catalog",
+        "https://math-ege.sdamgia.ru/prob_catalog",
+        "https://phys-ege.sdamgia.ru/prob_catalog",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_catalog_zero_ttl_disables_cache(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    requested_urls: list[str] = []
+    api = make_offline_api(_catalog_handler(fixture_html, requested_urls), catalog_ttl_seconds=0)
+
+    await api.get_catalog("math")
+    await api.get_catalog("math")
+
+    assert len(requested_urls) == 2
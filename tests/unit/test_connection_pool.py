@@ -0,0 +1,60 @@
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from sdamgia import SdamGIA
+
+
+@pytest.mark.asyncio
+async def test_shared_http_client_serves_many_clients_and_stays_open(
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    user_agents: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        user_agents.append(request.headers["user-agent"])
+        return httpx.Response(200, content=fixture_html("problem_1001.html"))
+
+    shared = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    first = SdamGIA(http_client=shared, user_agent="worker-1")
+    second = SdamGIA(http_client=shared, user_agent="worker-2")
+
+    await first.get_problem_by_id("math", "1001")
+    await first.aclose()
+    await second.get_problem_by_id("math", "1001")
+    await second.aclose()
+
+    assert user_agents == ["worker-1", "worker-2"]
+    assert not shared.is_closed
+    await shared.aclose()
+
+
+@pytest.mark.asyncio
+async def test_injected_transport_and_phase_timeouts_configure_own_client(
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    transport = httpx.MockTransport(lambda _request: httpx.Response(200, content=fixture_html("catalog.html")))
+    api = SdamGIA(
+        timeout_seconds=20.0,
+        connect_timeout_seconds=2.0,
+        pool_timeout_seconds=1.0,
+        transport=transport,
+    )
+
+    catalog = await api.get_catalog("math")
+    timeout = api._http_client.timeout
+    await api.aclose()
+
+    assert catalog
+    assert (timeout.connect, timeout.read, timeout.write, timeout.pool) == (2.0, 20.0, 20.0, 1.0)
+    assert api._http_client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_pool_options_conflicting_with_shared_client_raise() -> None:
+    async with httpx.AsyncClient() as shared:
+        with pytest.raises(ValueError):
+            SdamGIA(http_client=shared, transport=httpx.MockTransport(lambda _request: httpx.Response(200)))
+        with pytest.raises(ValueError):
+            SdamGIA(http_client=shared, cassette_path="responses.cassette")
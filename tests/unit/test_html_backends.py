@@ -0,0 +1,127 @@
+from collections.abc import Callable
+
+import pytest
+from bs4 import BeautifulSoup
+
+from sdamgia import SdamGIA
+from sdamgia.parsers import (
+    _PROBLEM_IDS_STRAINER,
+    _Bs4HtmlBackend,
+    _CatalogParser,
+    _create_html_backend,
+    _extract_problem_ids,
+)
+
+SUBJECT_BASE_URL = "https://math-ege.sdamgia.ru"
+PROBLEM_FIXTURES = ["problem_1001.html", "problem_2002.html", "problem_missing.html"]
+PROBLEM_ID_FIXTURES = ["search.html", "test.html", "category.html"]
+
+
+@pytest.fixture(params=["lxml", "selectolax"])
+def fast_backend_name(request: pytest.FixtureRequest) -> str:
+    pytest.importorskip(request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("fixture_name", PROBLEM_FIXTURES)
+def test_fast_backend_problem_payload_matches_default(
+    fast_backend_name: str,
+    fixture_name: str,
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    markup = fixture_html(fixture_name)
+    args = (markup, "2002", f"{SUBJECT_BASE_URL}/problem?id=2002", SUBJECT_BASE_URL)
+
+    expected = _create_html_backend("html.parser").parse_problem_page(*args)
+    actual = _create_html_backend(fast_backend_name).parse_problem_page(*args)
+
+    assert actual == expected
+
+
+def test_fast_backend_catalog_payload_matches_default(
+    fast_backend_name: str,
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    markup = fixture_html("catalog.html")
+
+    expected = _create_html_backend("html.parser").parse_catalog_page(markup)
+    actual = _create_html_backend(fast_backend_name).parse_catalog_page(markup)
+
+    assert expected
+    assert actual == expected
+
+
+@pytest.mark.parametrize("fixture_name", PROBLEM_ID_FIXTURES)
+def test_fast_backend_problem_ids_match_default(
+    fast_backend_name: str,
+    fixture_name: str,
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    markup = fixture_html(fixture_name)
+
+    expected = _create_html_backend("html.parser").extract_problem_ids(markup)
+    actual = _create_html_backend(fast_backend_name).extract_problem_ids(markup)
+
+    assert expected
+    assert actual == expected
+
+
+def test_default_backend_parses_problem_fixture(fixture_html: Callable[[str], bytes]) -> None:
+    payload = _create_html_backend("html.parser").parse_problem_page(
+        fixture_html("problem_2002.html"),
+        "2002",
+        f"{SUBJECT_BASE_URL}/problem?id=2002",
+        SUBJECT_BASE_URL,
+    )
+
+    assert payload is not None
+    assert payload["topic"] == "12"
+    assert payload["answer"] == "6"
+    assert payload["analogs"] == ["2003", "2004"]
+    assert payload["condition"]["images"] == [
+        f"{SUBJECT_BASE_URL}/formula/ab/ab12.png",
+        "https://ege.sdamgia.ru/formula/cd/cd34.png",
+    ]
+    assert "MathJax" not in payload["condition"]["text"]
+
+
+def test_unknown_html_parser_raises_value_error() -> None:
+    with pytest.raises(ValueError, match="Unsupported html_parser"):
+        SdamGIA(html_parser="regex")
+
+
+@pytest.mark.parametrize("features", ["html.parser", "lxml"])
+@pytest.mark.parametrize(
+    ("fixture_name", "parse"),
+    [
+        ("problem_2002.html", "problem"),
+        ("catalog.html", "catalog"),
+        ("search.html", "problem_ids"),
+    ],
+)
+def test_partial_parsing_matches_full_document_parsing(
+    features: str,
+    fixture_name: str,
+    parse: str,
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    if features == "lxml":
+        pytest.importorskip("lxml")
+    backend = _Bs4HtmlBackend(features)
+    markup = fixture_html(fixture_name)
+    full_soup = BeautifulSoup(markup, features)
+
+    if parse == "problem":
+        full_block = full_soup.find("div", {"class": "prob_maindiv"})
+        assert str(backend.problem_block(markup)) == str(full_block)
+    elif parse == "catalog":
+        assert backend.parse_catalog_page(markup) == _CatalogParser.parse(full_soup)
+    else:
+        assert backend.extract_problem_ids(markup) == _extract_problem_ids(full_soup)
+
+
+def test_partial_parsing_drops_page_chrome(fixture_html: Callable[[str], bytes]) -> None:
+    soup = _Bs4HtmlBackend().soup(fixture_html("search.html"), _PROBLEM_IDS_STRAINER)
+
+    assert soup.find("div", {"class": "header"}) is None
+    assert len(soup.find_all("span", {"class": "prob_nums"})) == 5
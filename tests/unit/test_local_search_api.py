@@ -0,0 +1,93 @@
+import contextlib
+import sqlite3
+from collections.abc import Callable
+from pathlib import Path
+
+import httpx
+import pytest
+
+from sdamgia import SdamGIA
+from sdamgia.search import _LocalSearchIndex
+
+
+def _problem_handler(
+    fixture_html: Callable[[str], bytes],
+    requests: list[httpx.Request],
+) -> Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        problem_id = request.url.params["id"]
+        if problem_id == "500":
+            return httpx.Response(500)
+        return httpx.Response(200, content=fixture_html(f"problem_{problem_id}.html"))
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_local_search_matches_stemmed_word_forms_offline(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    pytest.importorskip("snowballstemmer")
+    requests: list[httpx.Request] = []
+    api = make_offline_api(_problem_handler(fixture_html, requests))
+
+    indexed = await api.index_problems("math", ["1001", "2002", "500"])
+    requests.clear()
+
+    assert indexed == 2
+    assert await api.search("math", "площади треугольников", backend="local") == ["1001"]
+    assert await api.search("math", "Наибольшего значения", backend="local") == ["2002"]
+    assert set(await api.search("math", "найдите", backend="local")) == {"1001", "2002"}
+    assert await api.search("math", "производную", backend="local") == ["2002"]
+    assert await api.search("math", "треугольник функция", backend="local") == []
+    assert await api.search("phys", "треугольник", backend="local") == []
+    assert requests == []
+
+
+@pytest.mark.asyncio
+async def test_local_search_ranks_more_relevant_problem_first() -> None:
+    pytest.importorskip("snowballstemmer")
+    index = _LocalSearchIndex()
+    index.add(
+        "math",
+        [
+            {"id": "1", "condition": {"text": "Куб и шар."}, "solution": {"text": ""}},
+            {"id": "2", "condition": {"text": "Куб, куб и ещё раз кубы."}, "solution": {"text": ""}},
+        ],
+    )
+
+    assert index.search("math", "кубом", limit=10) == ["2", "1"]
+    assert index.search("math", "кубом", limit=1, offset=1) == ["1"]
+
+
+def test_reindexing_replaces_problem_and_index_persists(tmp_path: Path) -> None:
+    pytest.importorskip("snowballstemmer")
+    index_path = str(tmp_path / "index.sqlite3")
+    index = _LocalSearchIndex(index_path)
+    index.add("math", [{"id": "1", "condition": {"text": "Старое условие"}, "solution": {}}])
+    index.add("math", [{"id": "1", "condition": {"text": "Новое условие"}, "solution": {}}])
+    index.close()
+
+    reopened = _LocalSearchIndex(index_path)
+    old_results = reopened.search("math", "старого", limit=10)
+    new_results = reopened.search("math", "новые условия", limit=10)
+    reopened.close()
+    with contextlib.closing(sqlite3.connect(index_path)) as connection:
+        rows = connection.execute("SELECT COUNT(*) FROM problem_index WHERE subject = 'math'").fetchone()
+
+    assert rows == (1,)
+    assert old_results == []
+    assert new_results == ["1"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_search_backend_raises_value_error(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    api = make_offline_api(_problem_handler(fixture_html, []))
+
+    with pytest.raises(ValueError):
+        await api.search("math", "треугольник", backend="elastic")
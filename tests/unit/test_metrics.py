@@ -0,0 +1,84 @@
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from sdamgia import PrometheusMetrics, RetryPolicy, SdamGIA
+
+
+def test_prometheus_render_formats_counters_and_histograms() -> None:
+    metrics = PrometheusMetrics()
+    metrics.observe_request("/problem", 200, 0.2, 2048)
+    metrics.observe_request("/problem", 200, 3.0, 100)
+    metrics.observe_retry('/odd"path', "ConnectError")
+
+    text = metrics.render()
+
+    assert "# TYPE sdamgia_requests_total counter" in text
+    assert 'sdamgia_requests_total{endpoint="/problem",status="200"} 2' in text
+    assert 'sdamgia_retries_total{endpoint="/odd\\"path",error="ConnectError"} 1' in text
+    assert "# TYPE sdamgia_request_duration_seconds histogram" in text
+    assert 'sdamgia_request_duration_seconds_bucket{endpoint="/problem",le="0.25"} 1' in text
+    assert 'sdamgia_request_duration_seconds_bucket{endpoint="/problem",le="+Inf"} 2' in text
+    assert 'sdamgia_request_duration_seconds_sum{endpoint="/problem"} 3.2' in text
+    assert 'sdamgia_request_duration_seconds_count{endpoint="/problem"} 2' in text
+    assert 'sdamgia_response_size_bytes_sum{endpoint="/problem"} 2148' in text
+    assert text.endswith("\n")
+
+
+@pytest.mark.asyncio
+async def test_client_reports_requests_retries_and_parsing(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    attempts = 0
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, content=fixture_html("problem_1001.html"))
+
+    metrics = PrometheusMetrics()
+    api = make_offline_api(
+        handler,
+        retry_policy=RetryPolicy(retries=2, base_delay_seconds=0.0),
+        metrics=metrics,
+    )
+
+    await api.get_problem_by_id("math", "1001")
+    text = metrics.render()
+
+    assert 'sdamgia_requests_total{endpoint="/problem",status="503"} 1' in text
+    assert 'sdamgia_requests_total{endpoint="/problem",status="200"} 1' in text
+    assert 'sdamgia_retries_total{endpoint="/problem",error="HTTPStatusError"} 1' in text
+    assert 'sdamgia_wait_seconds_count{endpoint="/problem",reason="scheduler"} 2' in text
+    assert 'sdamgia_wait_seconds_count{endpoint="/problem",reason="retry_backoff"} 1' in text
+    assert 'sdamgia_parse_duration_seconds_count{kind="problem"} 1' in text
+    assert "sdamgia_errors_total{" not in text
+
+
+@pytest.mark.asyncio
+async def test_client_reports_final_errors_and_cache_hit_ratio(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/prob_catalog":
+            return httpx.Response(200, content=fixture_html("catalog.html"))
+        return httpx.Response(404)
+
+    metrics = PrometheusMetrics()
+    api = make_offline_api(handler, metrics=metrics)
+
+    await api.get_catalog("math")
+    await api.get_catalog("math")
+    await api.get_catalog("math")
+    with pytest.raises(httpx.HTTPStatusError):
+        await api.get_problem_by_id("math", "1001")
+
+    assert 'sdamgia_errors_total{endpoint="/problem",error="HTTPStatusError"} 1' in metrics.render()
+    assert 'sdamgia_cache_lookups_total{cache="catalog",result="hit"} 2' in metrics.render()
+    assert metrics.cache_hit_ratio("catalog") == pytest.approx(2 / 3)
+    assert metrics.cache_hit_ratio("render") == 0.0
@@ -0,0 +1,196 @@
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+import pytesseract
+from PIL import Image
+
+import sdamgia.images as images_module
+from sdamgia import OcrEngine
+
+
+def _save_png(path: Path, size: tuple[int, int] = (40, 20), color: str = "white") -> str:
+    Image.new("RGB", size, color).save(path)
+    return str(path)
+
+
+def _count_ocr_calls(monkeypatch: pytest.MonkeyPatch) -> list[Image.Image]:
+    recognized: list[Image.Image] = []
+
+    def fake_image_to_string(image: Image.Image, lang: str) -> str:
+        recognized.append(image)
+        return f"text-{len(recognized)}"
+
+    monkeypatch.setattr(images_module.pytesseract, "image_to_string", fake_image_to_string)
+    return recognized
+
+
+@pytest.mark.asyncio
+async def test_identical_image_content_is_recognized_once(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    recognized = _count_ocr_calls(monkeypatch)
+    engine = OcrEngine(workers=0)
+    first_path = _save_png(tmp_path / "first.png")
+    copy_path = _save_png(tmp_path / "copy.png")
+    other_path = _save_png(tmp_path / "other.png", color="black")
+
+    first = await engine.recognize(first_path, "tesseract")
+    copy = await engine.recognize(copy_path, "tesseract")
+    other = await engine.recognize(other_path, "tesseract")
+
+    assert first == copy == "text-1"
+    assert other == "text-2"
+    assert len(recognized) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_recognition_of_same_image_runs_ocr_once(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    recognized: list[Image.Image] = []
+    release = threading.Event()
+
+    def blocking_image_to_string(image: Image.Image, lang: str) -> str:
+        recognized.append(image)
+        release.wait(timeout=5.0)
+        return f"text-{len(recognized)}"
+
+    monkeypatch.setattr(images_module.pytesseract, "image_to_string", blocking_image_to_string)
+    engine = OcrEngine(workers=0, cache_size=0)
+    path = _save_png(tmp_path / "image.png")
+    single_flight_run = engine._single_flight.run
+    callers = 0
+
+    async def counting_run(key: str, call: Callable[[], Awaitable[str]]) -> str:
+        nonlocal callers
+        callers += 1
+        return await single_flight_run(key, call)
+
+    monkeypatch.setattr(engine._single_flight, "run", counting_run)
+
+    calls = asyncio.gather(*(engine.recognize(path, "tesseract") for _ in range(5)))
+    for _ in range(500):
+        if callers == 5:
+            break
+        await asyncio.sleep(0.01)
+    release.set()
+    results = await calls
+
+    assert results == ["text-1"] * 5
+    assert len(recognized) == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_keeps_most_recently_used_images(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    recognized = _count_ocr_calls(monkeypatch)
+    engine = OcrEngine(workers=0, cache_size=1)
+    white_path = _save_png(tmp_path / "white.png")
+    black_path = _save_png(tmp_path / "black.png", color="black")
+
+    await engine.recognize(white_path, "tesseract")
+    await engine.recognize(black_path, "tesseract")
+    await engine.recognize(white_path, "tesseract")
+
+    assert len(recognized) == 3
+
+
+@pytest.mark.asyncio
+async def test_preprocessing_downscales_and_binarizes_image(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    recognized = _count_ocr_calls(monkeypatch)
+    engine = OcrEngine(workers=0, binarize_threshold=128, max_side=50)
+    path = _save_png(tmp_path / "gray.png", size=(200, 100), color="#a0a0a0")
+
+    await engine.recognize(path, "tesseract")
+
+    image = recognized[0]
+    assert image.mode == "L"
+    assert max(image.size) == 50
+    assert image.getextrema() == (255, 255)
+
+
+def test_default_engine_does_not_rerun_unguarded_script(tmp_path: Path) -> None:
+    image_path = _save_png(tmp_path / "image.png")
+    script = tmp_path / "bot.py"
+    script.write_text(
+        textwrap.dedent(
+            f"""
+            import asyncio
+
+            import sdamgia.images
+            from sdamgia import OcrEngine
+
+            sdamgia.images.pytesseract.image_to_string = lambda image, lang: "text"
+
+
+            async def main():
+                print("started", flush=True)
+                print(await OcrEngine().recognize({image_path!r}, "tesseract"), flush=True)
+
+
+            asyncio.run(main())
+            """
+        )
+    )
+
+    completed = subprocess.run(
+        [sys.executable, str(script)],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        env={**os.environ, "PYTHONPATH": str(Path(images_module.__file__).resolve().parents[1])},
+    )
+
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.split() == ["started", "text"]
+
+
+def test_negative_worker_count_raises_value_error() -> None:
+    with pytest.raises(ValueError):
+        OcrEngine(workers=-1)
+
+
+@pytest.mark.asyncio
+async def test_worker_process_raises_missing_tesseract_error(tmp_path: Path) -> None:
+    engine = OcrEngine(workers=1)
+    path = _save_png(tmp_path / "image.png")
+
+    try:
+        for _ in range(2):
+            with pytest.raises(pytesseract.TesseractNotFoundError):
+                await engine.recognize(path, str(tmp_path / "missing-tesseract"))
+    finally:
+        engine.close()
+
+
+@pytest.mark.asyncio
+async def test_broken_worker_pool_is_replaced(tmp_path: Path) -> None:
+    engine = OcrEngine(workers=1)
+    engine._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    engine._executor.submit(os._exit, 1)
+    path = _save_png(tmp_path / "image.png")
+
+    try:
+        with pytest.raises(BrokenProcessPool):
+            await engine.recognize(path, str(tmp_path / "missing-tesseract"))
+        with pytest.raises(pytesseract.TesseractNotFoundError):
+            await engine.recognize(path, str(tmp_path / "missing-tesseract"))
+    finally:
+        engine.close()
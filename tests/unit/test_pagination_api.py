@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from sdamgia import SdamGIA
+
+
+def _pages(count: int, page_size: int = 3) -> dict[int, list[str]]:
+    return {
+        page: [str(1000 * page + index) for index in range(page_size)] for page in range(1, count + 1)
+    }
+
+
+@pytest.mark.asyncio
+async def test_iter_category_stops_at_first_empty_page(
+    api: SdamGIA,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pages = _pages(4)
+    requested_pages: list[int] = []
+
+    async def fake_get_category_by_id(subject: str, categoryid: str, page: int = 1) -> list[str]:
+        assert (subject, categoryid) == ("math", "7")
+        requested_pages.append(page)
+        return pages.get(page, [])
+
+    monkeypatch.setattr(api, "get_category_by_id", fake_get_category_by_id)
+
+    result = [problem_id async for problem_id in api.iter_category("math", "7", prefetch=2)]
+
+    assert result == [problem_id for page in sorted(pages) for problem_id in pages[page]]
+    assert sorted(requested_pages) == [1, 2, 3, 4, 5, 6]
+
+
+@pytest.mark.asyncio
+async def test_iter_search_stops_at_repeated_page(
+    api: SdamGIA,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pages = _pages(3)
+
+    async def fake_search(subject: str, request: str, page: int = 1) -> list[str]:
+        assert (subject, request) == ("math", "треугольник")
+        return pages[min(page, 3)]
+
+    monkeypatch.setattr(api, "search", fake_search)
+
+    result = [problem_id async for problem_id in api.iter_search("math", "треугольник")]
+
+    assert result == [problem_id for page in sorted(pages) for problem_id in pages[page]]
+
+
+@pytest.mark.asyncio
+async def test_iter_category_skips_ids_repeated_across_pages(
+    api: SdamGIA,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pages = {1: ["1", "2", "3"], 2: ["3", "4", "4"], 3: []}
+
+    async def fake_get_category_by_id(_subject: str, _categoryid: str, page: int = 1) -> list[str]:
+        return pages[page]
+
+    monkeypatch.setattr(api, "get_category_by_id", fake_get_category_by_id)
+
+    result = [problem_id async for problem_id in api.iter_category("math", "7", prefetch=1)]
+
+    assert result == ["1", "2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_iter_category_respects_max_pages_and_prefetch_window(
+    api: SdamGIA,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    active = 0
+    peak = 0
+    requested_pages: list[int] = []
+
+    async def fake_get_category_by_id(_subject: str, _categoryid: str, page: int = 1) -> list[str]:
+        nonlocal active, peak
+        requested_pages.append(page)
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.001)
+        active -= 1
+        return [f"{page}-a", f"{page}-b"]
+
+    monkeypatch.setattr(api, "get_category_by_id", fake_get_category_by_id)
+
+    result = [
+        problem_id async for problem_id in api.iter_category("math", "7", prefetch=4, max_pages=10)
+    ]
+
+    assert len(result) == 20
+    assert sorted(requested_pages) == list(range(1, 11))
+    assert peak <= 4
+
+
+@pytest.mark.asyncio
+async def test_iter_category_early_exit_cancels_prefetched_pages(
+    api: SdamGIA,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    finished_pages: list[int] = []
+
+    async def fake_get_category_by_id(_subject: str, _categoryid: str, page: int = 1) -> list[str]:
+        await asyncio.sleep(0.01 * page)
+        finished_pages.append(page)
+        return [str(page)]
+
+    monkeypatch.setattr(api, "get_category_by_id", fake_get_category_by_id)
+
+    iterator = api.iter_category("math", "7", prefetch=5)
+    assert await anext(iterator) == "1"
+    await iterator.aclose()
+    await asyncio.sleep(0.1)
+
+    assert finished_pages == [1]
+
+
+@pytest.mark.asyncio
+async def test_iter_category_invalid_prefetch_raises_value_error(api: SdamGIA) -> None:
+    with pytest.raises(ValueError, match="prefetch must be >= 1"):
+        async for _ in api.iter_category("math", "7", prefetch=0):
+            pass
@@ -1,3 +1,6 @@
+import asyncio
+
+import httpx
 import pytest
 
 from sdamgia import SdamGIA
@@ -189,3 +192,111 @@ async def test_get_random_problem_fallback_to_year_when_initial_pool_empty(
 async def test_get_random_problem_invalid_subject_keeps_key_error(api: SdamGIA) -> None:
     with pytest.raises(KeyError):
         await api.get_random_problem("invalid-subject", topic_id="1", period_days=30)
+
+
+def _single_category_catalog() -> list[dict[str, object]]:
+    return [
+        {
+            "topic_id": "1",
+            "topic_name": "Task 1",
+            "categories": [{"category_id": "cat-1", "category_name": "Category"}],
+        }
+    ]
+
+
+class SlowProblemPages:
+    def __init__(self, valid_ids: set[str], failing_ids: set[str] | None = None) -> None:
+        self.valid_ids = valid_ids
+        self.failing_ids = failing_ids or set()
+        self.active = 0
+        self.max_active = 0
+        self.started: list[str] = []
+        self.cancelled: list[str] = []
+
+    async def get_problem_by_id(self, _subject: str, id: str) -> dict[str, object] | None:
+        self.started.append(id)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.05 - int(id) % 10 * 0.004)
+        except asyncio.CancelledError:
+            self.cancelled.append(id)
+            raise
+        finally:
+            self.active -= 1
+        if id in self.failing_ids:
+            request = httpx.Request("GET", f"https://math-ege.sdamgia.ru/problem?id={id}")
+            raise httpx.HTTPStatusError("server error", request=request, response=httpx.Response(500))
+        return {"id": id} if id in self.valid_ids else None
+
+
+def _patch_topic(api: SdamGIA, monkeypatch: pytest.MonkeyPatch, pages: SlowProblemPages) -> None:
+    async def fake_get_catalog(_subject: str) -> list[dict[str, object]]:
+        return _single_category_catalog()
+
+    async def fake_get_category_by_id(_subject: str, _categoryid: str, page: int = 1) -> list[str]:
+        return [str(1000 + index) for index in range(10)] if page == 1 else []
+
+    monkeypatch.setattr(api, "get_catalog", fake_get_catalog)
+    monkeypatch.setattr(api, "get_category_by_id", fake_get_category_by_id)
+    monkeypatch.setattr(api, "get_problem_by_id", pages.get_problem_by_id)
+
+
+@pytest.mark.asyncio
+async def test_get_random_problem_hedged_fetch_keeps_seed_order(
+    api: SdamGIA,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    sequential_pages = SlowProblemPages(valid_ids={"1002", "1005", "1007", "1009"})
+    _patch_topic(api, monkeypatch, sequential_pages)
+    expected = await api.get_random_problem("math", "1", seed=11, hedge=1)
+    hedged_pages = SlowProblemPages(valid_ids={"1002", "1005", "1007", "1009"})
+    _patch_topic(api, monkeypatch, hedged_pages)
+
+    result = await api.get_random_problem("math", "1", seed=11, hedge=4)
+
+    assert result == expected
+    assert sequential_pages.max_active == 1
+    assert hedged_pages.max_active == 4
+    assert hedged_pages.started[: len(sequential_pages.started)] == sequential_pages.started
+
+
+@pytest.mark.asyncio
+async def test_get_random_problem_cancels_remaining_hedged_fetches(
+    api: SdamGIA,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pages = SlowProblemPages(valid_ids={str(1000 + index) for index in range(10)})
+    _patch_topic(api, monkeypatch, pages)
+
+    result = await api.get_random_problem("math", "1", seed=3, hedge=5)
+    await asyncio.sleep(0)
+
+    assert result == {"id": pages.started[0]}
+    assert len(pages.started) == 5
+    assert pages.cancelled
+    assert pages.active == 0
+
+
+@pytest.mark.asyncio
+async def test_get_random_problem_propagates_candidate_http_error(
+    api: SdamGIA,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    probe = SlowProblemPages(valid_ids=set())
+    _patch_topic(api, monkeypatch, probe)
+    await api.get_random_problem("math", "1", seed=4, hedge=1)
+    pages = SlowProblemPages(
+        valid_ids={str(1000 + index) for index in range(10)},
+        failing_ids={probe.started[0]},
+    )
+    _patch_topic(api, monkeypatch, pages)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await api.get_random_problem("math", "1", seed=4, hedge=3)
+
+
+@pytest.mark.asyncio
+async def test_get_random_problem_invalid_hedge_raises_value_error(api: SdamGIA) -> None:
+    with pytest.raises(ValueError, match="hedge must be >= 1"):
+        await api.get_random_problem("math", topic_id="1", hedge=0)
@@ -0,0 +1,101 @@
+import asyncio
+import gzip
+import time
+import zipfile
+from collections.abc import Callable
+from pathlib import Path
+
+import httpx
+import pytest
+
+from sdamgia import CassetteMissError, RecordingTransport, ReplayTransport, SdamGIA
+
+
+async def _record(path: Path, handler: Callable[[httpx.Request], httpx.Response], urls: list[str]) -> None:
+    transport = RecordingTransport(str(path), transport=httpx.MockTransport(handler))
+    async with httpx.AsyncClient(transport=transport) as client:
+        for url in urls:
+            await client.get(url)
+
+
+@pytest.mark.asyncio
+async def test_recorded_pages_replay_through_client_without_network(
+    fixture_html: Callable[[str], bytes],
+    tmp_path: Path,
+) -> None:
+    cassette = tmp_path / "math.cassette"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/prob_catalog":
+            return httpx.Response(200, content=fixture_html("catalog.html"))
+        return httpx.Response(
+            200,
+            content=gzip.compress(fixture_html("problem_1001.html")),
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    await _record(
+        cassette,
+        handler,
+        [
+            "https://math-ege.sdamgia.ru/problem?id=1001",
+            "https://math-ege.sdamgia.ru/problem?id=1001",
+            "https://math-ege.sdamgia.ru/prob_catalog",
+        ],
+    )
+    with zipfile.ZipFile(cassette) as archive:
+        assert len([name for name in archive.namelist() if name.startswith("bodies/")]) == 2
+
+    async with SdamGIA(cassette_path=str(cassette)) as api:
+        problem = await api.get_problem_by_id("math", "1001")
+        catalog = await api.get_catalog("math")
+        with pytest.raises(CassetteMissError):
+            await api.get_problem_by_id("math", "2002")
+        results = [result async for result in api.get_problems_by_ids("math", ["1001", "2002"])]
+
+    assert problem is not None and problem["id"] == "1001"
+    assert catalog
+    assert {result["id"]: isinstance(result["error"], CassetteMissError) for result in results} == {
+        "1001": False,
+        "2002": True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_replay_serves_repeated_recordings_in_order(tmp_path: Path) -> None:
+    cassette = tmp_path / "pages.cassette"
+    versions = iter(["v1", "v2"])
+    await _record(
+        cassette,
+        lambda _request: httpx.Response(200, text=next(versions)),
+        ["https://math-ege.sdamgia.ru/page", "https://math-ege.sdamgia.ru/page"],
+    )
+
+    async with httpx.AsyncClient(transport=ReplayTransport(str(cassette))) as client:
+        bodies = [(await client.get("https://math-ege.sdamgia.ru/page")).text for _ in range(3)]
+
+    assert bodies == ["v1", "v2", "v2"]
+
+
+@pytest.mark.asyncio
+async def test_replay_adds_synthetic_latency(tmp_path: Path) -> None:
+    cassette = tmp_path / "page.cassette"
+    await _record(cassette, lambda _request: httpx.Response(200, text="ok"), ["https://math-ege.sdamgia.ru/"])
+
+    async with httpx.AsyncClient(transport=ReplayTransport(str(cassette), latency_seconds=0.05)) as client:
+        started_at = time.monotonic()
+        await asyncio.gather(*(client.get("https://math-ege.sdamgia.ru/") for _ in range(20)))
+        elapsed = time.monotonic() - started_at
+
+    assert 0.05 <= elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_record_mode_client_writes_cassette_on_close(tmp_path: Path) -> None:
+    cassette = tmp_path / "empty.cassette"
+
+    await SdamGIA(cassette_path=str(cassette), cassette_mode="record").aclose()
+
+    ReplayTransport(str(cassette))
+    with pytest.raises(ValueError):
+        SdamGIA(cassette_path=str(cassette), cassette_mode="rewind")
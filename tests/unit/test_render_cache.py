@@ -0,0 +1,122 @@
+import io
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from sdamgia import SdamGIA
+from sdamgia.cache import _RenderCache
+from sdamgia.rendering import _BrowserPool, _ProblemImageRenderer
+
+
+def _problem_api(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    launcher: Any,
+    cache: _RenderCache,
+) -> SdamGIA:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=fixture_html(f"problem_{request.url.params['id']}.html"))
+
+    api = make_offline_api(handler)
+    api._renderer = _ProblemImageRenderer(_BrowserPool(pages=2, launcher=launcher), cache)
+    return api
+
+
+def test_memory_tier_evicts_least_recently_used_images() -> None:
+    cache = _RenderCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    cache.get("a")
+    cache.put("c", b"cccc")
+
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("b") is None
+    assert cache.get("c") == b"cccc"
+
+
+def test_disk_tier_survives_new_cache_and_stays_bounded(tmp_path: Path) -> None:
+    cache = _RenderCache(max_bytes=0, directory=str(tmp_path), directory_max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    cache.put("c", b"cccc")
+
+    reopened = _RenderCache(max_bytes=0, directory=str(tmp_path), directory_max_bytes=10)
+
+    assert reopened.get("a") is None
+    assert reopened.get("b") == b"bbbb"
+    assert reopened.get("c") == b"cccc"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["b.png", "c.png"]
+
+
+@pytest.mark.asyncio
+async def test_repeated_render_is_served_from_cache(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    fake_browser_launcher: Any,
+) -> None:
+    api = _problem_api(make_offline_api, fixture_html, fake_browser_launcher, _RenderCache(1024 * 1024))
+
+    first = await api.render_problem_image("math", "1001")
+    second = await api.render_problem_image("math", "1001")
+    other = await api.render_problem_image("math", "2002")
+
+    assert first is not None
+    assert first == second
+    assert other != first
+    assert len(fake_browser_launcher.browsers[0].screenshots) == 2
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_skips_browser_for_new_client(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    fake_browser_launcher: Any,
+    tmp_path: Path,
+) -> None:
+    first_api = _problem_api(
+        make_offline_api,
+        fixture_html,
+        fake_browser_launcher,
+        _RenderCache(0, str(tmp_path)),
+    )
+    image = await first_api.render_problem_image("math", "1001")
+    second_api = _problem_api(
+        make_offline_api,
+        fixture_html,
+        fake_browser_launcher,
+        _RenderCache(0, str(tmp_path)),
+    )
+
+    assert await second_api.render_problem_image("math", "1001") == image
+    assert len(fake_browser_launcher.browsers) == 1
+
+
+@pytest.mark.asyncio
+async def test_problem_image_is_written_to_file_object(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    fake_browser_launcher: Any,
+) -> None:
+    api = _problem_api(make_offline_api, fixture_html, fake_browser_launcher, _RenderCache(0))
+    output = io.BytesIO()
+
+    problem = await api.get_problem_by_id("math", "1001", img="pyppeteer", path_to_img=output)
+
+    assert problem is not None
+    assert problem["id"] == "1001"
+    assert output.getvalue() == fake_browser_launcher.browsers[0].screenshots[0]
+
+
+@pytest.mark.asyncio
+async def test_unsupported_backend_raises_value_error(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    fake_browser_launcher: Any,
+) -> None:
+    api = _problem_api(make_offline_api, fixture_html, fake_browser_launcher, _RenderCache(0))
+
+    with pytest.raises(ValueError):
+        await api.render_problem_image("math", "1001", img="unknown")
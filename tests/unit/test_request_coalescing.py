@@ -0,0 +1,150 @@
+import asyncio
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from sdamgia import SdamGIA
+from sdamgia.transport import _SingleFlight
+
+
+def _slow_handler(
+    body: bytes,
+    requests: list[httpx.Request],
+    status_code: int = 200,
+) -> Callable[[httpx.Request], httpx.Response]:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(status_code, content=body)
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_problem_requests_share_one_fetch(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    requests: list[httpx.Request] = []
+    api = make_offline_api(_slow_handler(fixture_html("problem_1001.html"), requests))
+
+    results = await asyncio.gather(*(api.get_problem_by_id("math", "1001") for _ in range(10)))
+
+    assert len(requests) == 1
+    assert all(result == results[0] for result in results)
+    results[0]["analogs"].append("mutated")
+    assert "mutated" not in results[1]["analogs"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_searches_share_one_fetch(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    requests: list[httpx.Request] = []
+    api = make_offline_api(_slow_handler(fixture_html("search.html"), requests))
+
+    results = await asyncio.gather(
+        *(api.search("math", "Найдите количество") for _ in range(5)),
+        api.search("math", "другой запрос"),
+    )
+
+    assert len(requests) == 2
+    assert results[0] == ["26649", "77347", "27457", "509221", "26650"]
+
+
+@pytest.mark.asyncio
+async def test_sequential_requests_are_not_coalesced(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    requests: list[httpx.Request] = []
+    api = make_offline_api(_slow_handler(fixture_html("search.html"), requests))
+
+    await api.search("math", "query")
+    await api.search("math", "query")
+
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_fetch(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    requests: list[httpx.Request] = []
+    api = make_offline_api(_slow_handler(fixture_html("search.html"), requests))
+
+    cancelled = asyncio.create_task(api.search("math", "query"))
+    waiting = asyncio.create_task(api.search("math", "query"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert len(await waiting) == 5
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_fetch_error_reaches_every_caller(
+    make_offline_api: Callable[..., SdamGIA],
+) -> None:
+    requests: list[httpx.Request] = []
+    api = make_offline_api(_slow_handler(b"", requests, status_code=404))
+
+    results = await asyncio.gather(
+        *(api.get_problem_by_id("math", "1") for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert len(requests) == 1
+    assert all(isinstance(result, httpx.HTTPStatusError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelling_last_caller_cancels_shared_fetch(
+    make_offline_api: Callable[..., SdamGIA],
+) -> None:
+    started = asyncio.Event()
+    finished: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        started.set()
+        await asyncio.sleep(0.05)
+        finished.append(str(request.url))
+        return httpx.Response(200, text="<html></html>")
+
+    api = make_offline_api(handler)
+
+    task = asyncio.create_task(api.search("math", "query"))
+    await started.wait()
+    task.cancel()
+    await asyncio.sleep(0.1)
+
+    assert finished == []
+
+
+@pytest.mark.asyncio
+async def test_caller_arriving_while_abandoned_call_cleans_up_starts_fresh_call() -> None:
+    single_flight = _SingleFlight()
+    started = asyncio.Event()
+
+    async def slow_call() -> str:
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.01)
+            raise
+        return "slow"
+
+    async def fast_call() -> str:
+        return "fresh"
+
+    abandoned = asyncio.create_task(single_flight.run("key", slow_call))
+    await started.wait()
+    abandoned.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await abandoned
+
+    assert await single_flight.run("key", fast_call) == "fresh"
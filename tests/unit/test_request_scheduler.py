@@ -0,0 +1,84 @@
+import asyncio
+import time
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from sdamgia import SdamGIA
+
+
+@pytest.mark.asyncio
+async def test_scheduler_limits_concurrency_per_host(
+    make_offline_api: Callable[..., SdamGIA],
+) -> None:
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(0.005)
+        active[host] -= 1
+        return httpx.Response(200, text="<html></html>")
+
+    api = make_offline_api(handler, max_concurrency_per_host=3)
+
+    await asyncio.gather(
+        *(api.search(subject, f"query {index}") for subject in ("math", "phys") for index in range(12))
+    )
+
+    assert peak == {"math-ege.sdamgia.ru": 3, "phys-ege.sdamgia.ru": 3}
+    stats = api.get_scheduler_stats()
+    assert stats["math-ege.sdamgia.ru"]["requests"] == 12
+    assert stats["math-ege.sdamgia.ru"]["in_flight"] == 0
+    assert stats["math-ege.sdamgia.ru"]["queued"] == 0
+    assert stats["math-ege.sdamgia.ru"]["wait_seconds_max"] > 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_applies_requests_per_second_limit(
+    make_offline_api: Callable[..., SdamGIA],
+) -> None:
+    api = make_offline_api(
+        lambda _request: httpx.Response(200, text="<html></html>"),
+        max_requests_per_second_per_host=50.0,
+    )
+
+    started_at = time.monotonic()
+    await asyncio.gather(*(api.search("math", str(index)) for index in range(60)))
+    elapsed = time.monotonic() - started_at
+
+    assert elapsed >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_scheduler_stats_report_queue_depth(
+    make_offline_api: Callable[..., SdamGIA],
+) -> None:
+    release = asyncio.Event()
+
+    async def handler(_request: httpx.Request) -> httpx.Response:
+        await release.wait()
+        return httpx.Response(200, text="<html></html>")
+
+    api = make_offline_api(handler, max_concurrency_per_host=2)
+    tasks = [asyncio.create_task(api.search("math", str(index))) for index in range(5)]
+    await asyncio.sleep(0.01)
+
+    stats = api.get_scheduler_stats()["math-ege.sdamgia.ru"]
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert stats["in_flight"] == 2
+    assert stats["queued"] == 3
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"max_concurrency_per_host": 0}, {"max_requests_per_second_per_host": 0.0}],
+)
+def test_scheduler_invalid_limits_raise_value_error(kwargs: dict[str, float]) -> None:
+    with pytest.raises(ValueError):
+        SdamGIA(**kwargs)
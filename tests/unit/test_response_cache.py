@@ -0,0 +1,112 @@
+import asyncio
+from collections.abc import Callable
+from pathlib import Path
+
+import httpx
+import pytest
+
+from sdamgia import SdamGIA
+
+
+def _problem_handler(
+    fixture_html: Callable[[str], bytes],
+    requests: list[httpx.Request],
+    etag: str | None = None,
+) -> Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if etag is not None and request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        headers = {} if etag is None else {"ETag": etag}
+        return httpx.Response(200, content=fixture_html("problem_1001.html"), headers=headers)
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_fresh_cached_page_skips_network(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    tmp_path: Path,
+) -> None:
+    requests: list[httpx.Request] = []
+    cache_path = str(tmp_path / "responses.sqlite3")
+    api = make_offline_api(_problem_handler(fixture_html, requests), response_cache_path=cache_path)
+
+    first = await api.get_problem_by_id("math", "1001")
+    second = await api.get_problem_by_id("math", "1001")
+    await api.aclose()
+
+    restarted_api = make_offline_api(
+        _problem_handler(fixture_html, requests),
+        response_cache_path=cache_path,
+    )
+    third = await restarted_api.get_problem_by_id("math", "1001")
+
+    assert first == second == third
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_page_is_revalidated_with_etag(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    tmp_path: Path,
+) -> None:
+    requests: list[httpx.Request] = []
+    api = make_offline_api(
+        _problem_handler(fixture_html, requests, etag='"v1"'),
+        response_cache_path=str(tmp_path / "responses.sqlite3"),
+        response_cache_ttl_seconds={"/problem": 0.01},
+    )
+
+    first = await api.get_problem_by_id("math", "1001")
+    await asyncio.sleep(0.02)
+    second = await api.get_problem_by_id("math", "1001")
+
+    assert first == second
+    assert len(requests) == 2
+    assert "if-none-match" not in requests[0].headers
+    assert requests[1].headers["if-none-match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_paths_without_ttl_are_not_cached(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    tmp_path: Path,
+) -> None:
+    requests: list[httpx.Request] = []
+    api = make_offline_api(
+        _problem_handler(fixture_html, requests),
+        response_cache_path=str(tmp_path / "responses.sqlite3"),
+        response_cache_ttl_seconds={"/problem": 3600.0},
+    )
+
+    await api.search("math", "треугольник")
+    await api.search("math", "треугольник")
+
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used_pages(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    tmp_path: Path,
+) -> None:
+    requests: list[httpx.Request] = []
+    api = make_offline_api(
+        _problem_handler(fixture_html, requests),
+        response_cache_path=str(tmp_path / "responses.sqlite3"),
+        response_cache_max_bytes=2500,
+    )
+
+    await api.get_problem_by_id("math", "1")
+    await api.get_problem_by_id("math", "2")
+    await api.get_problem_by_id("math", "1")
+    await api.get_problem_by_id("math", "3")
+    await api.get_problem_by_id("math", "1")
+    await api.get_problem_by_id("math", "2")
+
+    assert [request.url.params["id"] for request in requests] == ["1", "2", "3", "2"]
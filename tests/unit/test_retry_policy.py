@@ -0,0 +1,179 @@
+import asyncio
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from sdamgia import CircuitOpenError, RetryPolicy, SdamGIA
+
+
+def _status_error(status_code: int, headers: dict[str, str] | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://math-ege.sdamgia.ru/problem?id=1")
+    response = httpx.Response(status_code, headers=headers, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+def test_retry_policy_uses_exponential_backoff_with_cap() -> None:
+    policy = RetryPolicy(retries=5, base_delay_seconds=1.0, max_delay_seconds=5.0, jitter=False)
+    error = _status_error(503)
+
+    delays = [policy.retry_delay(attempt, error) for attempt in range(6)]
+
+    assert delays == [1.0, 2.0, 4.0, 5.0, 5.0, None]
+
+
+def test_retry_policy_full_jitter_stays_within_backoff() -> None:
+    policy = RetryPolicy(retries=10, base_delay_seconds=1.0, max_delay_seconds=60.0)
+
+    delays = [policy.retry_delay(3, _status_error(500)) for _ in range(200)]
+
+    assert all(0.0 <= delay <= 8.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+@pytest.mark.parametrize(
+    ("error", "retryable"),
+    [
+        (_status_error(404), False),
+        (_status_error(400), False),
+        (_status_error(429), True),
+        (_status_error(502), True),
+        (httpx.ConnectError("refused"), True),
+        (httpx.ReadTimeout("timeout"), True),
+        (CircuitOpenError("open"), False),
+    ],
+)
+def test_retry_policy_classifies_errors(error: httpx.HTTPError, retryable: bool) -> None:
+    assert RetryPolicy().is_retryable(error) is retryable
+
+
+def test_retry_policy_honors_retry_after() -> None:
+    policy = RetryPolicy(retries=3, base_delay_seconds=0.1, max_delay_seconds=10.0, jitter=False)
+
+    assert policy.retry_delay(0, _status_error(429, {"Retry-After": "7"})) == 7.0
+    assert policy.retry_delay(0, _status_error(429, {"Retry-After": "60"})) is None
+
+
+@pytest.mark.asyncio
+async def test_not_found_is_not_retried(make_offline_api: Callable[..., SdamGIA]) -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(404)
+
+    api = make_offline_api(handler, retries=3)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await api.search("math", "query")
+
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_server_error_is_retried_until_success(make_offline_api: Callable[..., SdamGIA]) -> None:
+    statuses = iter([503, 502, 200])
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(next(statuses), text="<html></html>")
+
+    api = make_offline_api(handler, retry_policy=RetryPolicy(retries=2, base_delay_seconds=0.0))
+
+    assert await api.search("math", "query") == []
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast_and_recovers_with_probe(
+    make_offline_api: Callable[..., SdamGIA],
+) -> None:
+    requests: list[httpx.Request] = []
+    host_is_down = True
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if host_is_down:
+            return httpx.Response(503)
+        return httpx.Response(200, text="<html></html>")
+
+    api = make_offline_api(
+        handler,
+        circuit_breaker_failure_threshold=2,
+        circuit_breaker_recovery_seconds=0.05,
+    )
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await api.search("math", "query")
+    with pytest.raises(CircuitOpenError):
+        await api.search("math", "query")
+    assert len(requests) == 2
+    with pytest.raises(httpx.HTTPStatusError):
+        await api.search("phys", "other host keeps its own circuit")
+
+    await asyncio.sleep(0.06)
+    with pytest.raises(httpx.HTTPStatusError):
+        await api.search("math", "probe")
+    with pytest.raises(CircuitOpenError):
+        await api.search("math", "query")
+
+    host_is_down = False
+    await asyncio.sleep(0.06)
+    assert await api.search("math", "probe") == []
+    assert await api.search("math", "query") == []
+
+
+@pytest.mark.asyncio
+async def test_server_errors_of_one_page_do_not_open_host_circuit(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params["id"] == "500":
+            return httpx.Response(500)
+        return httpx.Response(200, content=fixture_html("problem_1001.html"))
+
+    api = make_offline_api(handler, circuit_breaker_failure_threshold=2)
+
+    for _ in range(5):
+        with pytest.raises(httpx.HTTPStatusError):
+            await api.get_problem_by_id("math", "500")
+
+    assert (await api.get_problem_by_id("math", "1001"))["id"] == "1001"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_circuit_probe_lets_next_probe_through(
+    make_offline_api: Callable[..., SdamGIA],
+) -> None:
+    host_is_down = True
+    probe_started = asyncio.Event()
+
+    async def handler(_request: httpx.Request) -> httpx.Response:
+        if host_is_down:
+            return httpx.Response(503)
+        probe_started.set()
+        await asyncio.sleep(10)
+        return httpx.Response(200, text="<html></html>")
+
+    api = make_offline_api(
+        handler,
+        circuit_breaker_failure_threshold=1,
+        circuit_breaker_recovery_seconds=0.01,
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        await api.search("math", "query")
+
+    host_is_down = False
+    await asyncio.sleep(0.02)
+    probe = asyncio.create_task(api.search("math", "probe"))
+    await probe_started.wait()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    probe_started.clear()
+    next_probe = asyncio.create_task(api.search("math", "next probe"))
+    await asyncio.wait_for(probe_started.wait(), timeout=1.0)
+    next_probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await next_probe
@@ -0,0 +1,138 @@
+import asyncio
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from sdamgia import OcrEngine, SdamGIA
+from sdamgia.search import _SearchQueryPlanner
+
+OCR_TEXT = " ".join(f"слово{index}" for index in range(300))
+
+
+def _mock_ocr(monkeypatch: pytest.MonkeyPatch, text: str) -> None:
+    async def fake_recognize(_engine: OcrEngine, _path: str, _path_to_tesseract: str) -> str:
+        return text
+
+    monkeypatch.setattr(OcrEngine, "recognize", fake_recognize)
+
+
+def test_planner_uses_strided_windows_covering_tail() -> None:
+    planner = _SearchQueryPlanner(window_size=4, stride=3)
+
+    phrases = planner.plan("a1 b2 c3 d4 e5 f6 g7 h8 i9 j10")
+
+    assert phrases == ["a1 b2 c3 d4", "d4 e5 f6 g7", "g7 h8 i9 j10"]
+
+
+def test_planner_drops_ocr_noise_and_duplicate_phrases() -> None:
+    planner = _SearchQueryPlanner(window_size=3, stride=3)
+
+    phrases = planner.plan("Найдите | — значение ~~ « выражения » 3 а ; НАЙДИТЕ значение выражения")
+
+    assert phrases == ["Найдите значение выражения", "3 НАЙДИТЕ значение"]
+
+
+def test_planner_short_text_gives_single_phrase() -> None:
+    assert _SearchQueryPlanner(window_size=10).plan("Решите уравнение") == ["Решите уравнение"]
+    assert _SearchQueryPlanner().plan(" | ~ ") == []
+
+
+@pytest.mark.parametrize("kwargs", [{"window_size": 0}, {"stride": 0}])
+def test_planner_invalid_settings_raise_value_error(kwargs: dict[str, int]) -> None:
+    with pytest.raises(ValueError):
+        _SearchQueryPlanner(**kwargs)
+
+
+def _search_handler(
+    searched_phrases: list[str],
+    matches: Callable[[str], list[str]],
+) -> Callable[[httpx.Request], httpx.Response]:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        phrase = request.url.params["search"]
+        searched_phrases.append(phrase)
+        await asyncio.sleep(0.005)
+        spans = "".join(
+            f'<span class="prob_nums">Тип 1 № {problem_id}</span>' for problem_id in matches(phrase)
+        )
+        return httpx.Response(200, text=f"<html><body>{spans}</body></html>")
+
+    return handler
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("min_confirmations", [0, -1])
+async def test_search_by_img_invalid_min_confirmations_raises_value_error(
+    make_offline_api: Callable[..., SdamGIA],
+    monkeypatch: pytest.MonkeyPatch,
+    min_confirmations: int,
+) -> None:
+    _mock_ocr(monkeypatch, OCR_TEXT)
+    searched_phrases: list[str] = []
+    api = make_offline_api(_search_handler(searched_phrases, lambda _phrase: ["1"]))
+
+    with pytest.raises(ValueError, match="min_confirmations must be >= 1"):
+        await api.search_by_img("math", "image.png", min_confirmations=min_confirmations)
+
+    assert searched_phrases == []
+
+
+@pytest.mark.asyncio
+async def test_search_by_img_ranks_ids_by_hit_count(
+    make_offline_api: Callable[..., SdamGIA],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _mock_ocr(monkeypatch, OCR_TEXT)
+    searched_phrases: list[str] = []
+
+    def matches(phrase: str) -> list[str]:
+        first_word = phrase.split()[0]
+        if first_word == "слово0":
+            return ["3", "1"]
+        if first_word in {"слово5", "слово10"}:
+            return ["2", "1"]
+        if first_word == "слово15":
+            return ["1"]
+        return []
+
+    api = make_offline_api(_search_handler(searched_phrases, matches))
+
+    result = await api.search_by_img("math", "screenshot.png", min_confirmations=None)
+
+    assert result == ["1", "2", "3"]
+    assert len(searched_phrases) == 59
+
+
+@pytest.mark.asyncio
+async def test_search_by_img_stops_once_problem_is_confirmed(
+    make_offline_api: Callable[..., SdamGIA],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _mock_ocr(monkeypatch, OCR_TEXT)
+    searched_phrases: list[str] = []
+    api = make_offline_api(
+        _search_handler(searched_phrases, lambda _phrase: ["26649"]),
+        max_concurrency_per_host=2,
+    )
+
+    result = await api.search_by_img("math", "screenshot.png", min_confirmations=3)
+
+    assert result == ["26649"]
+    assert len(searched_phrases) < 10
+
+
+@pytest.mark.asyncio
+async def test_search_by_img_skips_failed_phrases(
+    make_offline_api: Callable[..., SdamGIA],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _mock_ocr(monkeypatch, OCR_TEXT[:200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "слово0 " in request.url.params["search"]:
+            return httpx.Response(404)
+        return httpx.Response(200, text='<span class="prob_nums">Тип 1 № 42</span>')
+
+    api = make_offline_api(handler)
+
+    assert await api.search_by_img("math", "screenshot.png") == ["42"]
@@ -0,0 +1,293 @@
+import asyncio
+import sqlite3
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+
+import httpx
+import pytest
+
+from sdamgia import SdamGIA
+from sdamgia.crawler import _CrawlStore
+
+CATEGORY_PROBLEMS = {
+    "1": ["101", "102", "103", "104", "105"],
+    "2": ["201", "202", "103"],
+    "7": ["701"],
+    "11": [],
+    "12": ["1201", "1202", "1203", "1204"],
+    "13": ["1301", "1302"],
+}
+PAGE_SIZE = 2
+
+
+class SubjectStandInServer:
+    def __init__(
+        self,
+        fixture_html: Callable[[str], bytes],
+        failing_ids: set[str] | None = None,
+        failing_categories: set[str] | None = None,
+        missing_ids: set[str] | None = None,
+    ) -> None:
+        self.categories = {category_id: list(problem_ids) for category_id, problem_ids in CATEGORY_PROBLEMS.items()}
+        self.catalog = fixture_html("catalog.html")
+        self.problem_template = fixture_html("problem_1001.html").decode()
+        self.failing_ids = set(failing_ids or ())
+        self.failing_categories = set(failing_categories or ())
+        self.missing_ids = set(missing_ids or ())
+        self.missing_page = fixture_html("problem_missing.html")
+        self.page_requests: list[tuple[str, int]] = []
+        self.problem_requests: Counter[str] = Counter()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.001)
+        if request.url.path == "/prob_catalog":
+            return httpx.Response(200, content=self.catalog)
+        if request.url.path == "/test":
+            return self._category_page(request.url.params["theme"], int(request.url.params["page"]))
+        problem_id = request.url.params["id"]
+        self.problem_requests[problem_id] += 1
+        if problem_id in self.failing_ids:
+            return httpx.Response(500)
+        if problem_id in self.missing_ids:
+            return httpx.Response(200, content=self.missing_page)
+        return httpx.Response(200, text=self.problem_template.replace("1001", problem_id))
+
+    def _category_page(self, category_id: str, page: int) -> httpx.Response:
+        self.page_requests.append((category_id, page))
+        if category_id in self.failing_categories:
+            return httpx.Response(500)
+        problem_ids = self.categories[category_id][(page - 1) * PAGE_SIZE : page * PAGE_SIZE]
+        items = "".join(
+            f'<div class="prob_maindiv"><span class="prob_nums">Тип 1 № <a>{problem_id}</a></span></div>'
+            for problem_id in problem_ids
+        )
+        return httpx.Response(200, text=f"<html><body>{items}</body></html>")
+
+
+class CrawlKilled(Exception):
+    pass
+
+
+def _all_problem_ids() -> set[str]:
+    return {problem_id for problem_ids in CATEGORY_PROBLEMS.values() for problem_id in problem_ids}
+
+
+@pytest.mark.asyncio
+async def test_crawl_subject_mirrors_catalog_categories_and_problems(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    tmp_path: Path,
+) -> None:
+    server = SubjectStandInServer(fixture_html)
+    api = make_offline_api(server)
+    store_path = str(tmp_path / "math.sqlite3")
+    progress: list[dict[str, float]] = []
+
+    stats = await api.crawl_subject("math", store_path, concurrency=4, on_progress=progress.append)
+
+    store = _CrawlStore(store_path)
+    problems = store.problems("math")
+    store.close()
+    assert set(problems) == _all_problem_ids()
+    assert problems["1202"]["id"] == "1202"
+    assert max(server.problem_requests.values()) == 1
+    assert stats["categories"] == len(CATEGORY_PROBLEMS)
+    assert stats["pages"] == 9
+    assert stats["problems"] == len(_all_problem_ids())
+    assert stats["missing"] == 0
+    assert stats["failed"] == 0
+    assert stats["pages_per_second"] > 0
+    assert stats["problems_per_second"] > 0
+    assert [snapshot["pages"] for snapshot in progress] == list(range(1, 10))
+
+
+@pytest.mark.asyncio
+async def test_killed_crawl_resumes_from_checkpoint(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    tmp_path: Path,
+) -> None:
+    server = SubjectStandInServer(fixture_html)
+    api = make_offline_api(server)
+    store_path = str(tmp_path / "math.sqlite3")
+
+    def kill_after_three_pages(snapshot: dict[str, float]) -> None:
+        if snapshot["pages"] == 3:
+            raise CrawlKilled
+
+    with pytest.raises(CrawlKilled):
+        await api.crawl_subject("math", store_path, category_concurrency=1, on_progress=kill_after_three_pages)
+    first_run_pages = list(server.page_requests)
+    server.page_requests.clear()
+
+    stats = await api.crawl_subject("math", store_path, category_concurrency=1)
+
+    store = _CrawlStore(store_path)
+    assert set(store.problems("math")) == _all_problem_ids()
+    store.close()
+    assert first_run_pages == [("1", 1), ("1", 2), ("1", 3)]
+    assert ("1", 1) not in server.page_requests
+    assert ("1", 4) in server.page_requests
+    assert max(server.problem_requests.values()) == 1
+    assert stats["pages"] == 6
+
+
+@pytest.mark.asyncio
+async def test_missing_problem_blocks_are_not_counted_as_fetched_problems(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    tmp_path: Path,
+) -> None:
+    server = SubjectStandInServer(fixture_html, missing_ids={"102", "1203"})
+    api = make_offline_api(server)
+    store_path = str(tmp_path / "math.sqlite3")
+
+    stats = await api.crawl_subject("math", store_path)
+    api.invalidate_catalog()
+    second_stats = await api.crawl_subject("math", store_path)
+
+    assert stats["problems"] == len(_all_problem_ids()) - 2
+    assert stats["missing"] == 2
+    assert stats["failed"] == 0
+    assert second_stats["missing"] == 0
+    assert server.problem_requests["102"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_problems_are_retried_on_next_run(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    tmp_path: Path,
+) -> None:
+    server = SubjectStandInServer(fixture_html, failing_ids={"202"})
+    api = make_offline_api(server)
+    store_path = str(tmp_path / "math.sqlite3")
+
+    first_stats = await api.crawl_subject("math", store_path)
+    with sqlite3.connect(store_path) as connection:
+        (error,) = connection.execute("SELECT error FROM problems WHERE problem_id = '202'").fetchone()
+    server.failing_ids.clear()
+    api.invalidate_catalog()
+    second_stats = await api.crawl_subject("math", store_path)
+
+    assert first_stats["failed"] == 1
+    assert "HTTPStatusError" in error
+    assert second_stats["pages"] == 0
+    assert second_stats["problems"] == 1
+    assert server.problem_requests["202"] == 2
+    store = _CrawlStore(store_path)
+    assert set(store.problems("math")) == _all_problem_ids()
+    assert store.failed_problem_ids("math") == []
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_sync_fetches_only_problems_added_since_crawl(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    tmp_path: Path,
+) -> None:
+    server = SubjectStandInServer(fixture_html)
+    api = make_offline_api(server)
+    store_path = str(tmp_path / "math.sqlite3")
+    await api.crawl_subject("math", store_path)
+    server.categories["1"][:0] = ["107", "106"]
+    server.categories["12"][:0] = ["1205"]
+    server.page_requests.clear()
+    server.problem_requests.clear()
+
+    stats = await api.sync_subject("math", store_path)
+
+    store = _CrawlStore(store_path)
+    assert set(store.problems("math")) == _all_problem_ids() | {"106", "107", "1205"}
+    assert store.category_problem_ids("math", "1") >= {"106", "107"}
+    store.close()
+    assert set(server.problem_requests) == {"106", "107", "1205"}
+    assert sorted(server.page_requests) == [
+        ("1", 1),
+        ("1", 2),
+        ("11", 1),
+        ("12", 1),
+        ("13", 1),
+        ("2", 1),
+        ("7", 1),
+    ]
+    assert stats["problems"] == 3
+    assert stats["categories"] == len(CATEGORY_PROBLEMS)
+
+
+@pytest.mark.asyncio
+async def test_sync_stops_at_ids_older_than_highest_known(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    tmp_path: Path,
+) -> None:
+    server = SubjectStandInServer(fixture_html)
+    api = make_offline_api(server)
+    store_path = str(tmp_path / "math.sqlite3")
+    await api.crawl_subject("math", store_path)
+    server.categories["12"] = ["1206", "1100", "1000"]
+    server.problem_requests.clear()
+
+    await api.sync_subject("math", store_path)
+
+    assert set(server.problem_requests) == {"1206"}
+
+
+@pytest.mark.asyncio
+async def test_second_sync_without_changes_fetches_no_problems(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    tmp_path: Path,
+) -> None:
+    server = SubjectStandInServer(fixture_html)
+    api = make_offline_api(server)
+    store_path = str(tmp_path / "math.sqlite3")
+    await api.crawl_subject("math", store_path)
+    server.categories["7"][:0] = ["702"]
+    await api.sync_subject("math", store_path)
+    server.problem_requests.clear()
+
+    stats = await api.sync_subject("math", store_path)
+
+    assert server.problem_requests == Counter()
+    assert stats["pages"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failing_category_stops_sibling_walks_before_store_closes(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    tmp_path: Path,
+) -> None:
+    server = SubjectStandInServer(fixture_html, failing_categories={"2"})
+    api = make_offline_api(server)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await api.crawl_subject("math", str(tmp_path / "math.sqlite3"), category_concurrency=3)
+    requests_at_failure = (len(server.page_requests), server.problem_requests.total())
+    await asyncio.sleep(0.05)
+
+    assert (len(server.page_requests), server.problem_requests.total()) == requests_at_failure
+
+
+@pytest.mark.asyncio
+async def test_failing_category_stops_sibling_syncs_before_store_closes(
+    make_offline_api: Callable[..., SdamGIA],
+    fixture_html: Callable[[str], bytes],
+    tmp_path: Path,
+) -> None:
+    server = SubjectStandInServer(fixture_html)
+    api = make_offline_api(server)
+    store_path = str(tmp_path / "math.sqlite3")
+    await api.crawl_subject("math", store_path)
+    server.categories["1"][:0] = ["112", "111", "110", "109", "108", "107", "106"]
+    server.failing_categories = {"2"}
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await api.sync_subject("math", store_path, category_concurrency=len(CATEGORY_PROBLEMS))
+    requests_at_failure = (len(server.page_requests), server.problem_requests.total())
+    await asyncio.sleep(0.05)
+
+    assert (len(server.page_requests), server.problem_requests.total()) == requests_at_failure
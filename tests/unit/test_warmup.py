@@ -0,0 +1,65 @@
+import asyncio
+from collections import Counter
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from sdamgia import SdamGIA
+
+
+class WarmupStandInServer:
+    def __init__(self, down_hosts: set[str] | None = None) -> None:
+        self.down_hosts = set(down_hosts or ())
+        self.probes: Counter[str] = Counter()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert request.method == "HEAD"
+        if request.url.host in self.down_hosts:
+            raise httpx.ConnectError("connection refused", request=request)
+        self.probes[request.url.host] += 1
+        return httpx.Response(405)
+
+
+@pytest.mark.asyncio
+async def test_warmup_probes_selected_hosts_concurrently(make_offline_api: Callable[..., SdamGIA]) -> None:
+    server = WarmupStandInServer(down_hosts={"phys-ege.sdamgia.ru"})
+    api = make_offline_api(server)
+
+    results = await api.warmup(["math", "phys"], connections_per_host=3)
+
+    assert server.probes == Counter({"math-ege.sdamgia.ru": 3})
+    assert results["math"]["error"] is None
+    assert isinstance(results["phys"]["error"], httpx.ConnectError)
+    assert results["math"]["seconds"] >= 0
+    with pytest.raises(ValueError):
+        await api.warmup(["math", "astro"])
+
+
+@pytest.mark.asyncio
+async def test_warmup_on_enter_covers_all_subject_hosts(make_offline_api: Callable[..., SdamGIA]) -> None:
+    server = WarmupStandInServer()
+    api = make_offline_api(server, warmup_on_enter=True)
+
+    async with api:
+        pass
+
+    assert len(server.probes) == 15
+    assert set(server.probes.values()) == {1}
+
+
+@pytest.mark.asyncio
+async def test_keepalive_probes_repeat_until_close(make_offline_api: Callable[..., SdamGIA]) -> None:
+    server = WarmupStandInServer()
+    api = make_offline_api(server, keepalive_probe_interval_seconds=0.01)
+
+    await api.warmup(["math"])
+    await asyncio.sleep(0.05)
+    await api.aclose()
+    probes_after_close = server.probes["math-ege.sdamgia.ru"]
+    await asyncio.sleep(0.03)
+
+    assert probes_after_close >= 3
+    assert server.probes["math-ege.sdamgia.ru"] == probes_after_close
+    with pytest.raises(ValueError):
+        SdamGIA(keepalive_probe_interval_seconds=0)